@@ -0,0 +1,26 @@
+# core/checks.py
+from django.conf import settings
+from django.core.checks import Warning, register
+
+# Backends whose entries are private to one process.
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@register(deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """
+    Tenant cache namespaces (core.utils.cache_keys) are invalidated by bumping a
+    version key; with a per-process cache the other workers never see the bump
+    and keep serving stale feeds, facets and email templates.
+    """
+    backend = settings.CACHES.get('default', {}).get('BACKEND', '')
+    if backend in PROCESS_LOCAL_CACHES:
+        return [Warning(
+            f"The default cache ({backend}) is not shared between processes.",
+            hint="Set CACHE_URL to a shared cache such as Redis or Memcached when running more than one worker.",
+            id='core.W001',
+        )]
+    return []
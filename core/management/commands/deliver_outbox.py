@@ -0,0 +1,39 @@
+# core/management/commands/deliver_outbox.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.utils.email_config import smtp_connections
+from core.utils.outbox import deliver_outbox, purge_sent_emails
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued transactional emails from the outbox'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help='Keep polling instead of running a single pass')
+        parser.add_argument('--interval', type=float, default=5, help='Seconds to sleep when the outbox is empty (with --loop)')
+        parser.add_argument('--batch-size', type=int, help='Messages claimed per pass (default: OUTBOX_BATCH_SIZE)')
+        parser.add_argument('--workers', type=int, help='Tenants delivered concurrently (default: OUTBOX_DELIVERY_WORKERS)')
+        parser.add_argument('--purge', action='store_true', help='Also delete sent messages past OUTBOX_RETENTION_DAYS')
+        parser.add_argument('--stats', action='store_true', help='Print per-tenant SMTP connection reuse stats when done')
+
+    def handle(self, *args, **options):
+        if options['purge']:
+            self.stdout.write(f"Purged {purge_sent_emails()} sent email(s).")
+        try:
+            # With --loop, SMTP sessions are kept alive across passes (up to EMAIL_CONNECTION_TTL).
+            while True:
+                outcomes = deliver_outbox(batch_size=options.get('batch_size'), workers=options.get('workers'))
+                if outcomes:
+                    self.stdout.write(', '.join(f"{count} {outcome}" for outcome, count in sorted(outcomes.items())))
+                if not options['loop']:
+                    break
+                if not outcomes:
+                    time.sleep(options['interval'])
+        finally:
+            smtp_connections.close_all()
+            if options['stats']:
+                for schema_name, counters in sorted(smtp_connections.stats().items()):
+                    self.stdout.write(f"{schema_name}: " + ', '.join(f"{name}={value}" for name, value in sorted(counters.items())))
+        self.stdout.write(self.style.SUCCESS("Outbox delivery finished."))
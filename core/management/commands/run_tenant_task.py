@@ -0,0 +1,41 @@
+# core/management/commands/run_tenant_task.py
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.module_loading import import_string
+
+from core.utils.tenant_tasks import (
+    add_tenant_task_arguments, command_progress, run_for_tenants, tenant_task_options,
+)
+
+
+class Command(BaseCommand):
+    help = 'Run a callable taking a tenant, e.g. myapp.tasks.do_something, in every (or selected) tenant schema'
+
+    def add_arguments(self, parser):
+        parser.add_argument('task', type=str, help='Dotted path to a callable accepting the tenant')
+        add_tenant_task_arguments(parser)
+        parser.add_argument('--checkpoint', type=str, help='Checkpoint name (default: the dotted task path)')
+        parser.add_argument('--json', action='store_true', help='Print the per-tenant results as JSON')
+
+    def handle(self, *args, **options):
+        try:
+            task = import_string(options['task'])
+        except ImportError as e:
+            raise CommandError(f"Cannot import task '{options['task']}': {str(e)}")
+
+        results = run_for_tenants(
+            task,
+            name=options.get('checkpoint') or options['task'].replace('.', '_'),
+            # Keep stdout clean for --json.
+            progress=command_progress(self, self.stderr if options['json'] else self.stdout),
+            **tenant_task_options(options),
+        )
+
+        if options['json']:
+            self.stdout.write(json.dumps([result.as_dict() for result in results], default=str, indent=2))
+        failed = [result.schema_name for result in results if not result.ok]
+        if failed:
+            raise CommandError(f"{options['task']} failed for {len(failed)} tenant(s): {', '.join(failed)}")
+        self.stdout.write(self.style.SUCCESS(f"{options['task']} completed for {len(results)} tenant(s)."))
+
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.23 on 2026-10-19 08:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_outboundemail'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tenantconfig',
+            name='template_version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django_tenants.models import TenantMixin, DomainMixin
 from django.db import models
+from django.utils import timezone
 import logging
 
 logger = logging.getLogger('core')
@@ -79,4 +80,55 @@ class TenantConfig(models.Model):
     tenant = models.OneToOneField('Tenant', on_delete=models.CASCADE)
     logo = models.URLField(null=True, blank=True)  # Store Supabase public URL
     custom_fields = models.JSONField(default=dict)
-    email_templates = models.JSONField(default=dict)
\ No newline at end of file
+    email_templates = models.JSONField(default=dict)
+    template_version = models.PositiveIntegerField(default=1)  # Bumped whenever email_templates is saved
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        bump = self.pk and (update_fields is None or 'email_templates' in update_fields)
+        if bump:
+            # Incremented in SQL so concurrent saves never end up sharing a version.
+            self.template_version = models.F('template_version') + 1
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'template_version'}
+        super().save(*args, **kwargs)
+        if bump:
+            self.refresh_from_db(fields=['template_version'])
+
+class OutboundEmail(models.Model):
+    """
+    Transactional email queued in the same transaction as the change that triggers
+    it and delivered later by the deliver_outbox worker (core.utils.outbox).
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sending', 'Sending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+
+    tenant = models.ForeignKey('Tenant', on_delete=models.CASCADE, related_name='outbound_emails')
+    category = models.CharField(max_length=50, blank=True)  # e.g. interview_invitation, rejection, password_reset
+    reference = models.CharField(max_length=100, blank=True)  # Id of the record the email is about
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    content_subtype = models.CharField(max_length=10, default='plain')
+    from_email = models.CharField(max_length=255)
+    to = models.JSONField(default=list)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['next_attempt_at'], condition=models.Q(status__in=['pending', 'sending']), name='outbox_due_idx'),
+            models.Index(fields=['tenant', '-created_at'], name='outbox_tenant_created_idx'),
+            models.Index(fields=['tenant', 'reference'], name='outbox_tenant_reference_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.category or 'email'} to {', '.join(self.to)} ({self.status})"
@@ -1,6 +1,7 @@
 # apps/core/serializers.py
 from rest_framework import serializers
-from .models import Tenant, Domain, Module, TenantConfig, Branch
+from .models import Tenant, Domain, Module, TenantConfig, Branch, OutboundEmail
+from .utils.email_templates import TEMPLATE_PLACEHOLDERS, unknown_placeholders
 from django.utils import timezone
 import re
 import logging
@@ -67,6 +68,17 @@ class BranchSerializer(serializers.ModelSerializer):
 
 
 
+class OutboundEmailSerializer(serializers.ModelSerializer):
+    # The body is left out: it can hold password reset links.
+    class Meta:
+        model = OutboundEmail
+        fields = [
+            'id', 'category', 'reference', 'subject', 'to', 'status', 'attempts', 'next_attempt_at',
+            'last_error', 'sent_at', 'created_at', 'updated_at'
+        ]
+        read_only_fields = fields
+
+
 class DomainSerializer(serializers.ModelSerializer):
     class Meta:
         model = Domain
@@ -112,6 +124,33 @@ class TenantConfigSerializer(serializers.ModelSerializer):
         model = TenantConfig
         fields = ['logo', 'custom_fields', 'email_templates']
 
+    def validate_email_templates(self, value):
+        if not isinstance(value, dict):
+            raise serializers.ValidationError("Expected a dictionary of templates keyed by name.")
+        # Only templates whose content changed, so an old template doesn't block unrelated edits.
+        current = (self.instance.email_templates or {}) if self.instance else {}
+        if not isinstance(current, dict):
+            current = {}
+        errors = {}
+        for name, template in value.items():
+            if not isinstance(template, dict):
+                errors[name] = "Expected a dictionary with the template content."
+                continue
+            content = template.get('content', '')
+            previous = current.get(name)
+            if isinstance(previous, dict) and content == previous.get('content'):
+                continue
+            unknown = unknown_placeholders(name, content)
+            if unknown:
+                allowed = ', '.join(f'[{placeholder}]' for placeholder in sorted(TEMPLATE_PLACEHOLDERS[name]))
+                errors[name] = (
+                    f"Unknown placeholder(s): {', '.join(f'[{placeholder}]' for placeholder in unknown)}. "
+                    f"Allowed: {allowed}."
+                )
+        if errors:
+            raise serializers.ValidationError(errors)
+        return value
+
 
 
 class TenantSerializer(serializers.ModelSerializer):
@@ -3,6 +3,8 @@ from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.core.mail import send_mail
 from care_coordination.models import Shift  # Corrected import
+from core.models import Tenant, TenantConfig
+from core.utils.cache_keys import EMAIL_TEMPLATES, PUBLIC_JOB_FEED, bump_tenant_cache
 
 @receiver(post_save, sender=Shift)
 def notify_shift_change(sender, instance, **kwargs):
@@ -12,4 +14,15 @@ def notify_shift_change(sender, instance, **kwargs):
             f'Shift reassigned to {instance.carer.username}.',
             'from@lumina-care.com',
             [instance.carer.email],
-        )
\ No newline at end of file
+        )
+
+
+@receiver(post_save, sender=Tenant)
+def invalidate_public_job_feed(sender, instance, **kwargs):
+    # The public job feed embeds the tenant's logo, title and about text.
+    bump_tenant_cache(PUBLIC_JOB_FEED, instance.schema_name)
+
+
+@receiver(post_save, sender=TenantConfig)
+def invalidate_email_templates(sender, instance, **kwargs):
+    bump_tenant_cache(EMAIL_TEMPLATES, instance.tenant.schema_name)
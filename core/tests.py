@@ -1,3 +1,298 @@
-from django.test import TestCase
+import smtplib
+import tempfile
+import time
 
-# Create your tests here.
+from django.core.mail import EmailMessage
+from django.db import connection, transaction
+from django.test import SimpleTestCase, override_settings
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from users.models import CustomUser
+from .models import OutboundEmail, Tenant, TenantConfig
+from .serializers import TenantConfigSerializer
+from .utils.cache_keys import PUBLIC_JOB_FEED, bump_tenant_cache, tenant_cache_version
+from .utils.email_config import SMTPConnectionManager
+from .utils.email_templates import CompiledTemplate, get_email_template
+from .utils.outbox import claim_due_emails, deliver_outbox, enqueue_email
+from .utils.tenant_tasks import (
+    POOL_SERIAL, STATUS_FAILED, STATUS_OK, STATUS_SKIPPED, STATUS_TIMEOUT, load_checkpoint, run_for_tenants,
+    save_checkpoint,
+)
+from .utils.testing import TenantTestCase
+from .views import TenantConfigView
+
+
+def current_schema(tenant):
+    return connection.schema_name
+
+
+def fail(tenant):
+    raise RuntimeError('boom')
+
+
+def sleep(tenant):
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute("SELECT pg_sleep(5)")
+
+
+class TenantTaskRunnerTests(TenantTestCase):
+    """
+    run_for_tenants runs a task per schema and reports a structured result for each.
+    """
+
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.name = 'Runner Test'
+
+    def setUp(self):
+        super().setUp()
+        self.enterContext(override_settings(LOG_DIR=self.enterContext(tempfile.TemporaryDirectory())))
+        self.schema = self.tenant.schema_name
+
+    def run_task(self, task, **kwargs):
+        return run_for_tenants(task, schemas=[self.schema], pool=POOL_SERIAL, progress=None, **kwargs)
+
+    def test_runs_task_in_tenant_schema(self):
+        [result] = self.run_task(current_schema)
+        self.assertEqual(result.status, STATUS_OK)
+        self.assertEqual(result.result, self.schema)
+
+    def test_reports_failures_and_unknown_schemas(self):
+        [result] = self.run_task(fail)
+        self.assertEqual((result.status, result.error), (STATUS_FAILED, 'boom'))
+        [missing] = run_for_tenants(current_schema, schemas=['no_such_schema'], pool=POOL_SERIAL, progress=None)
+        self.assertEqual(missing.status, STATUS_FAILED)
+
+    def test_checkpoint_skips_completed_tenants(self):
+        # Leave the checkpoint of an interrupted run behind.
+        save_checkpoint('runner_test', 'run-1', {self.schema})
+        [result] = self.run_task(current_schema, name='runner_test', run_key='run-1')
+        self.assertEqual(result.status, STATUS_SKIPPED)
+        self.assertEqual(load_checkpoint('runner_test', 'run-1'), set())
+        [result] = self.run_task(current_schema, name='runner_test', run_key='run-2')
+        self.assertEqual(result.status, STATUS_OK)
+
+    def test_timeout_cancels_running_query(self):
+        [result] = self.run_task(sleep, timeout=0.2)
+        self.assertEqual(result.status, STATUS_TIMEOUT)
+        self.assertLess(result.elapsed_ms, 5000)
+
+
+@override_settings(OUTBOX_HOST_RATE_LIMIT=0)
+class OutboxTests(TenantTestCase):
+    """
+    Queued emails commit with the surrounding transaction and failed sends back off.
+    """
+
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.name = 'Outbox Test'
+        # Nothing listens on port 1, so every send fails fast.
+        tenant.email_host = '127.0.0.1'
+        tenant.email_port = 1
+        tenant.email_use_ssl = False
+
+    def test_email_is_rolled_back_with_the_transaction(self):
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            enqueue_email(self.tenant, 'Subject', 'Body', 'someone@example.com', category='test')
+            raise RuntimeError('rollback')
+        self.assertFalse(OutboundEmail.objects.filter(tenant=self.tenant).exists())
+
+    def test_failed_send_is_retried_with_backoff(self):
+        email = enqueue_email(self.tenant, 'Subject', 'Body', 'someone@example.com', category='test', reference=7)
+        self.assertEqual((email.status, email.to, email.reference), ('pending', ['someone@example.com'], '7'))
+
+        self.assertEqual(deliver_outbox(workers=1), {'retrying': 1})
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts), ('pending', 1))
+        self.assertGreater(email.next_attempt_at, timezone.now())
+        self.assertTrue(email.last_error)
+        # Not due again until the backoff has passed.
+        self.assertEqual(claim_due_emails(10), [])
+
+    @override_settings(OUTBOX_MAX_ATTEMPTS=1)
+    def test_gives_up_after_max_attempts(self):
+        email = enqueue_email(self.tenant, 'Subject', 'Body', ['someone@example.com'])
+        self.assertEqual(deliver_outbox(workers=1), {'failed': 1})
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts), ('failed', 1))
+
+
+class TenantCacheTests(TenantTestCase):
+    """
+    Namespace bumps wait for the surrounding transaction to commit.
+    """
+
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.name = 'Cache Test'
+
+    def version(self):
+        return tenant_cache_version(PUBLIC_JOB_FEED, self.tenant.schema_name)
+
+    def test_bump_runs_on_commit(self):
+        before = self.version()
+        with self.captureOnCommitCallbacks(execute=True):
+            bump_tenant_cache(PUBLIC_JOB_FEED, self.tenant.schema_name)
+            self.assertEqual(self.version(), before)
+        self.assertEqual(self.version(), before + 1)
+
+    def test_bump_is_dropped_on_rollback(self):
+        before = self.version()
+        with self.captureOnCommitCallbacks(execute=True), self.assertRaises(RuntimeError), transaction.atomic():
+            bump_tenant_cache(PUBLIC_JOB_FEED, self.tenant.schema_name)
+            raise RuntimeError('rollback')
+        self.assertEqual(self.version(), before)
+
+
+class RecordingBackend:
+    """
+    Stands in for the SMTP backend; `drop` makes the next send fail like a server
+    that closed an idle session.
+    """
+    opened = 0
+
+    def __init__(self):
+        self.sent = []
+        self.drop = False
+
+    def open(self):
+        RecordingBackend.opened += 1
+
+    def close(self):
+        pass
+
+    def send_messages(self, messages):
+        if self.drop:
+            raise smtplib.SMTPServerDisconnected('Connection unexpectedly closed')
+        self.sent.extend(messages)
+        return len(messages)
+
+
+class SMTPConnectionManagerTests(SimpleTestCase):
+    """
+    One session per tenant is reused across batches and reopened when stale.
+    """
+
+    def setUp(self):
+        RecordingBackend.opened = 0
+        self.backends = []
+        self.manager = SMTPConnectionManager(factory=self.make_backend, ttl=300, idle_timeout=60)
+        self.tenant = Tenant(schema_name='pool_test', email_host='smtp.example.com', email_port=465)
+
+    def make_backend(self, tenant):
+        self.backends.append(RecordingBackend())
+        return self.backends[-1]
+
+    def messages(self, count):
+        return [EmailMessage('Subject', 'Body', 'from@example.com', [f'to{i}@example.com']) for i in range(count)]
+
+    def test_batches_share_one_session(self):
+        self.assertEqual(self.manager.send_messages(self.tenant, self.messages(3)), [None] * 3)
+        self.assertEqual(self.manager.send_messages(self.tenant, self.messages(2)), [None] * 2)
+        self.assertEqual(RecordingBackend.opened, 1)
+        stats = self.manager.stats('pool_test')
+        self.assertEqual((stats['opened'], stats['reused'], stats['sent']), (1, 1, 5))
+        self.assertEqual(stats['reuse_ratio'], 0.8)
+
+    def test_dropped_session_reconnects(self):
+        self.manager.send_messages(self.tenant, self.messages(1))
+        self.backends[-1].drop = True
+        self.assertEqual(self.manager.send_messages(self.tenant, self.messages(1)), [None])
+        self.assertEqual(RecordingBackend.opened, 2)
+        self.assertEqual(self.manager.stats('pool_test')['reconnects'], 1)
+
+    def test_expired_session_is_replaced(self):
+        self.manager.ttl = 0.01
+        self.manager.send_messages(self.tenant, self.messages(1))
+        time.sleep(0.02)
+        self.manager.send_messages(self.tenant, self.messages(1))
+        self.assertEqual(RecordingBackend.opened, 2)
+        self.assertEqual(self.manager.stats('pool_test')['expired'], 1)
+
+    def test_changed_credentials_open_a_new_session(self):
+        self.manager.send_messages(self.tenant, self.messages(1))
+        self.tenant.email_host_password = 'rotated'
+        self.manager.send_messages(self.tenant, self.messages(1))
+        self.assertEqual(RecordingBackend.opened, 2)
+
+
+class CompiledTemplateTests(SimpleTestCase):
+    """
+    Templates render in one pass and leave unknown placeholders alone.
+    """
+
+    def test_render(self):
+        template = CompiledTemplate('Hello [Candidate Name], the [Position] role at [Company]. [Unknown]')
+        self.assertEqual(template.placeholders, ['Candidate Name', 'Position', 'Company', 'Unknown'])
+        self.assertEqual(
+            template.render({'Candidate Name': 'Ada', 'Position': 'Carer', 'Company': 'Acme'}),
+            'Hello Ada, the Carer role at Acme. [Unknown]',
+        )
+
+    def test_values_are_not_substituted_again(self):
+        # Chained str.replace would expand a placeholder inside an earlier value.
+        template = CompiledTemplate('[Candidate Name] / [Position]')
+        self.assertEqual(template.render({'Candidate Name': '[Position]', 'Position': 'Carer'}), '[Position] / Carer')
+
+
+class EmailTemplateTests(TenantTestCase):
+    """
+    Saved templates are validated, versioned and compiled once per version.
+    """
+
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.name = 'Template Test'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.config = TenantConfig.objects.create(tenant=cls.tenant, email_templates={
+            'interviewRejection': {'content': 'Hello [Candidate Name], about [Job Title].', 'is_auto_sent': True},
+        })
+
+    def test_unknown_placeholders_are_rejected_on_save(self):
+        serializer = TenantConfigSerializer(self.config, data={'email_templates': {
+            'interviewRejection': {'content': 'Hello [Candidate Name], [Typo Name].', 'is_auto_sent': True},
+        }}, partial=True)
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('[Typo Name]', str(serializer.errors['email_templates']['interviewRejection']))
+
+    def test_malformed_templates_are_rejected(self):
+        serializer = TenantConfigSerializer(self.config)
+        with self.assertRaises(serializers.ValidationError):
+            serializer.validate_email_templates(['interviewRejection'])
+        with self.assertRaises(serializers.ValidationError) as raised:
+            serializer.validate_email_templates({'interviewRejection': 'Hello [Candidate Name].'})
+        self.assertIn('interviewRejection', raised.exception.detail)
+
+        # A malformed stored template is replaced rather than compared against.
+        self.config.email_templates = {'interviewRejection': 'Hello.'}
+        serializer = TenantConfigSerializer(self.config, data={'email_templates': {
+            'interviewRejection': {'content': 'Hello [Candidate Name].', 'is_auto_sent': True},
+        }}, partial=True)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+
+    def test_patch_with_malformed_templates_is_a_bad_request(self):
+        user = CustomUser.objects.create(email='admin@template-test.example.com', role='admin', tenant=self.tenant)
+        request = APIRequestFactory().patch('/api/tenant/config/', {'email_templates': ['interviewRejection']}, format='json')
+        force_authenticate(request, user=user)
+        response = TenantConfigView.as_view()(request)
+        self.assertEqual(response.status_code, 400)
+
+    def test_compiled_template_follows_version(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.config.save()
+        first = get_email_template(self.tenant, 'interviewRejection')
+        self.assertIs(get_email_template(self.tenant, 'interviewRejection'), first)
+        self.assertEqual(first.render({'Candidate Name': 'Ada', 'Job Title': 'Carer'}), 'Hello Ada, about Carer.')
+
+        self.config.email_templates['interviewRejection']['content'] = 'Sorry [Candidate Name].'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.config.save(update_fields=['email_templates'])
+        second = get_email_template(self.tenant, 'interviewRejection')
+        self.assertEqual(second.version, (self.config.pk, first.version[1] + 1))
+        self.assertEqual(second.render({'Candidate Name': 'Ada'}), 'Sorry Ada.')
+        self.assertIsNone(get_email_template(self.tenant, 'jobAcceptance'))
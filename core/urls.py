@@ -1,6 +1,7 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import TenantViewSet, ModuleListView, TenantConfigView, BranchListCreateView, BranchDetailView
+from .views import (TenantViewSet, ModuleListView, TenantConfigView, BranchListCreateView, BranchDetailView,
+                    OutboundEmailListView, OutboundEmailDetailView)
 
 router = DefaultRouter()
 router.register(r'tenants', TenantViewSet)
@@ -11,6 +12,8 @@ urlpatterns = [
     path('config/', TenantConfigView.as_view(), name='tenant_config'),
     path('branches/', BranchListCreateView.as_view(), name='branch-list-create'),
     path('branches/<int:id>/', BranchDetailView.as_view(), name='branch-detail'),
+    path('outbox/', OutboundEmailListView.as_view(), name='outbox-list'),
+    path('outbox/<int:id>/', OutboundEmailDetailView.as_view(), name='outbox-detail'),
 ]
 
 
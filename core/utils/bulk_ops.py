@@ -0,0 +1,69 @@
+# core/utils/bulk_ops.py
+import logging
+
+from auditlog.models import LogEntry
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.utils import timezone
+
+logger = logging.getLogger('core')
+
+
+def bulk_set_deleted(queryset, ids, is_deleted, returning=()):
+    """
+    Flip `is_deleted` for the rows of `queryset` whose id is in `ids` with a single
+    UPDATE ... WHERE id = ANY(...) RETURNING statement. Rows already in the target
+    state are left untouched. Returns a list of dicts holding `id` plus the
+    attnames of the `returning` fields for every row that changed.
+    """
+    model = queryset.model
+    table = connection.ops.quote_name(model._meta.db_table)
+    pk_column = model._meta.pk.column
+    extra_fields = [model._meta.get_field(name) for name in returning]
+    columns = [pk_column] + [field.column for field in extra_fields]
+    scope_sql, scope_params = queryset.values('pk').query.sql_with_params()
+
+    sql = (
+        f"UPDATE {table} SET is_deleted = %s, updated_at = %s "
+        f"WHERE {pk_column} = ANY(%s) AND is_deleted = %s AND {pk_column} IN ({scope_sql}) "
+        f"RETURNING {', '.join(columns)}"
+    )
+    params = [is_deleted, timezone.now(), [str(pk) for pk in ids], not is_deleted, *scope_params]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+
+    keys = ['id'] + [field.attname for field in extra_fields]
+    return [dict(zip(keys, row)) for row in rows]
+
+
+def bulk_log_entries(model, object_ids, action, changes=None, request=None):
+    """
+    Write one auditlog LogEntry per object id with a single INSERT.
+    """
+    if not object_ids:
+        return []
+    content_type = ContentType.objects.get_for_model(model)
+    actor = getattr(request, 'user', None) if request else None
+    if actor is not None and not actor.is_authenticated:
+        actor = None
+    remote_addr = request.META.get('REMOTE_ADDR') if request else None
+    timestamp = timezone.now()
+    entries = [
+        LogEntry(
+            content_type=content_type,
+            object_pk=str(object_id),
+            object_repr=str(object_id),
+            action=action,
+            changes=changes,
+            changes_text='',
+            actor=actor,
+            actor_email=getattr(actor, 'email', None),
+            remote_addr=remote_addr,
+            timestamp=timestamp,
+        )
+        for object_id in object_ids
+    ]
+    created = LogEntry.objects.bulk_create(entries)
+    logger.debug(f"Logged {len(created)} audit entries for {model._meta.label} (action={action})")
+    return created
@@ -0,0 +1,60 @@
+# core/utils/cache_keys.py
+import hashlib
+import logging
+
+from django.core.cache import cache
+from django.db import transaction
+
+logger = logging.getLogger('core')
+
+# Namespaces invalidated as a whole per tenant.
+PUBLIC_JOB_FEED = 'public-job-feed'
+APPLICATION_FACETS = 'application-facets'
+EMAIL_TEMPLATES = 'email-templates'
+
+
+def _version_key(namespace, schema_name):
+    return f"{namespace}:{schema_name}:version"
+
+
+def tenant_cache_version(namespace, schema_name):
+    """
+    Current generation of a tenant's cache namespace. Keys built from it go stale
+    as soon as the namespace is bumped, so nothing has to be deleted explicitly.
+    """
+    version = cache.get(_version_key(namespace, schema_name))
+    if version is None:
+        version = 1
+        cache.add(_version_key(namespace, schema_name), version, timeout=None)
+    return version
+
+
+def tenant_cache_key(namespace, schema_name, *parts):
+    """
+    Build a versioned cache key for `namespace` in the given tenant schema.
+    Free-form parts (query parameters, branch names) are hashed to keep keys short and safe.
+    """
+    digest = hashlib.sha1('|'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+    version = tenant_cache_version(namespace, schema_name)
+    return f"{namespace}:{schema_name}:v{version}:{digest}"
+
+
+def bump_tenant_cache(namespace, schema_name):
+    """
+    Invalidate every key in a tenant's namespace by moving it to a new version.
+    Inside a transaction the bump waits for the commit, so a concurrent request
+    can't cache the rows being replaced under the new version; it is dropped if
+    the transaction rolls back.
+    """
+    if not schema_name:
+        return
+    transaction.on_commit(lambda: _bump(namespace, schema_name))
+
+
+def _bump(namespace, schema_name):
+    key = _version_key(namespace, schema_name)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 2, timeout=None)
+    logger.debug(f"Bumped cache namespace {namespace} for tenant {schema_name}")
@@ -1,4 +1,12 @@
 # core/utils/email_config.py
+import hashlib
+import logging
+import smtplib
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
 from django.conf import settings
 from django.core.mail import get_connection
 from django_tenants.utils import get_tenant
@@ -56,4 +64,190 @@ def configure_email_backend(tenant):
         username=email_settings['EMAIL_HOST_USER'],
         password=email_settings['EMAIL_HOST_PASSWORD'],
         use_ssl=email_settings['EMAIL_USE_SSL'],
-    )
\ No newline at end of file
+    )
+
+
+logger = logging.getLogger('core')
+
+# Errors that mean a kept-alive session went away rather than that the message was refused.
+STALE_SESSION_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError)
+
+
+def _connection_key(tenant):
+    """
+    Pool key for the tenant's SMTP settings; changing any of them (including the
+    password) starts a new session instead of reusing the old one.
+    """
+    secret = hashlib.sha1((tenant.email_host_password or '').encode('utf-8')).hexdigest()
+    return (tenant.schema_name, tenant.email_host, tenant.email_port, tenant.email_host_user, tenant.email_use_ssl, secret)
+
+
+class PooledSMTPConnection:
+    """
+    One tenant's kept-alive SMTP session. Use it through SMTPConnectionManager.session().
+    """
+
+    def __init__(self, tenant, factory, stats):
+        self.tenant = tenant
+        self.factory = factory
+        self.stats = stats
+        self.backend = None
+        self.opened_at = None
+        self.last_used = None
+        self.lock = threading.Lock()
+
+    def is_fresh(self, ttl, idle_timeout):
+        now = time.monotonic()
+        return (
+            self.backend is not None
+            and now - self.opened_at < ttl
+            and now - self.last_used < idle_timeout
+        )
+
+    def open(self):
+        self.close()
+        backend = self.factory(self.tenant)
+        backend.open()
+        self.backend = backend
+        self.opened_at = self.last_used = time.monotonic()
+        self.stats['opened'] += 1
+
+    def close(self):
+        if self.backend is None:
+            return
+        try:
+            self.backend.close()
+        except Exception as e:
+            logger.debug(f"Error closing SMTP connection for tenant {self.tenant.schema_name}: {str(e)}")
+        self.backend = None
+
+    def send(self, message):
+        """
+        Send one EmailMessage over the session, reconnecting once if a reused
+        session turns out to have been dropped by the server.
+        """
+        reused = self.backend is not None
+        if not reused:
+            self.open()
+        try:
+            self._send(message)
+        except STALE_SESSION_ERRORS as e:
+            if not reused:
+                raise
+            logger.info(f"SMTP session for tenant {self.tenant.schema_name} was dropped, reconnecting: {str(e)}")
+            self.stats['reconnects'] += 1
+            self.open()
+            reused = False
+            self._send(message)
+        self.stats['sent'] += 1
+        if reused:
+            self.stats['sent_on_reused'] += 1
+
+    def _send(self, message):
+        try:
+            # send_messages leaves a session it didn't open itself open.
+            self.backend.send_messages([message])
+        except Exception:
+            self.stats['errors'] += 1
+            # A failed session can't be trusted for the next message.
+            self.close()
+            raise
+        finally:
+            self.last_used = time.monotonic()
+
+
+class SMTPConnectionManager:
+    """
+    Keeps one authenticated SMTP session per tenant alive between sends, so a
+    batch of emails costs one TLS handshake and login instead of one per
+    message. Sessions are replaced after EMAIL_CONNECTION_TTL seconds, or once
+    idle for EMAIL_CONNECTION_IDLE_TIMEOUT, before the server drops them; a
+    session dropped anyway is reopened transparently on the next send.
+    """
+
+    def __init__(self, factory=configure_email_backend, ttl=None, idle_timeout=None):
+        self.factory = factory
+        self.ttl = ttl
+        self.idle_timeout = idle_timeout
+        self._connections = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def _entry(self, tenant):
+        key = _connection_key(tenant)
+        stale = []
+        with self._lock:
+            entry = self._connections.get(key)
+            if entry is None:
+                # The tenant's settings changed; retire the session opened with the old ones.
+                stale = [self._connections.pop(other) for other in list(self._connections) if other[0] == key[0]]
+                stats = self._stats.setdefault(tenant.schema_name, Counter())
+                entry = self._connections[key] = PooledSMTPConnection(tenant, self.factory, stats)
+        for old in stale:
+            with old.lock:
+                old.close()
+        return entry
+
+    @contextmanager
+    def session(self, tenant):
+        """
+        Exclusive use of the tenant's session for a batch of sends:
+
+            with smtp_connections.session(tenant) as connection:
+                for message in messages:
+                    connection.send(message)
+        """
+        entry = self._entry(tenant)
+        ttl = self.ttl or getattr(settings, 'EMAIL_CONNECTION_TTL', 300)
+        idle_timeout = self.idle_timeout or getattr(settings, 'EMAIL_CONNECTION_IDLE_TIMEOUT', 60)
+        with entry.lock:
+            if entry.backend is not None:
+                if entry.is_fresh(ttl, idle_timeout):
+                    entry.stats['reused'] += 1
+                else:
+                    entry.stats['expired'] += 1
+                    entry.close()
+            yield entry
+
+    def send_messages(self, tenant, messages):
+        """
+        Send EmailMessages over the tenant's session. Returns one entry per
+        message: None if it was sent, otherwise the exception it failed with.
+        """
+        results = []
+        with self.session(tenant) as connection:
+            for message in messages:
+                try:
+                    connection.send(message)
+                    results.append(None)
+                except Exception as e:
+                    logger.warning(f"Failed to send email to {message.to} for tenant {tenant.schema_name}: {str(e)}")
+                    results.append(e)
+        return results
+
+    def close_all(self):
+        with self._lock:
+            entries = list(self._connections.values())
+            self._connections.clear()
+        for entry in entries:
+            with entry.lock:
+                entry.close()
+
+    def stats(self, schema_name=None):
+        """
+        Per-tenant counters: sessions opened, batches that reused an open session,
+        sessions expired by TTL/idle time, reconnects after a dropped session,
+        messages sent (and how many went over a reused session) and send errors.
+        reuse_ratio is the share of sent messages that needed no new handshake.
+        """
+        with self._lock:
+            snapshot = {schema: dict(counter) for schema, counter in self._stats.items()}
+        for counters in snapshot.values():
+            sent = counters.get('sent', 0)
+            counters['reuse_ratio'] = round(counters.get('sent_on_reused', 0) / sent, 3) if sent else 0.0
+        if schema_name is not None:
+            return snapshot.get(schema_name, {})
+        return snapshot
+
+
+smtp_connections = SMTPConnectionManager()
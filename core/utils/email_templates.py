@@ -0,0 +1,121 @@
+# core/utils/email_templates.py
+import logging
+import re
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+
+from core.models import TenantConfig
+from core.utils.cache_keys import EMAIL_TEMPLATES, tenant_cache_key
+
+logger = logging.getLogger('core')
+
+# [Candidate Name], [Old Date/Time], [your.email@proliance.com], ...
+PLACEHOLDER_RE = re.compile(r'\[([^\[\]\n]{1,80})\]')
+
+COMMON_PLACEHOLDERS = {'Candidate Name', 'Position', 'Company', 'Your Name', 'your.email@proliance.com'}
+
+# Placeholders each template may use; the code rendering it supplies all of them.
+TEMPLATE_PLACEHOLDERS = {
+    'interviewScheduling': COMMON_PLACEHOLDERS | {
+        'Insert Date', 'Insert Time', 'Meeting Mode', 'Zoom / Google Meet / On-site – Insert Address or Link',
+        'Name(s) & Position(s)', 'Dashboard Link', 'Timezone',
+    },
+    'interviewRescheduling': COMMON_PLACEHOLDERS | {'Old Date/Time'},
+    'interviewRejection': COMMON_PLACEHOLDERS | {'Job Title'},
+    'interviewAcceptance': COMMON_PLACEHOLDERS,
+    'jobRejection': COMMON_PLACEHOLDERS,
+    'jobAcceptance': COMMON_PLACEHOLDERS,
+    'passwordReset': {'User Name', 'Company', 'Reset Link', 'Your Name', 'your.email@proliance.com'},
+}
+
+
+class CompiledTemplate:
+    """
+    A template split once into literal text and placeholder names, so rendering
+    is a single join instead of one str.replace pass per placeholder. Values are
+    keyed by placeholder name without brackets; placeholders without a value are
+    left in the text as they were.
+    """
+    __slots__ = ('name', 'version', 'content', 'is_auto_sent', 'literals', 'placeholders')
+
+    def __init__(self, content, name='', version=None, is_auto_sent=False):
+        parts = PLACEHOLDER_RE.split(content)
+        self.name = name
+        self.version = version
+        self.content = content
+        self.is_auto_sent = is_auto_sent
+        self.literals = parts[0::2]
+        self.placeholders = parts[1::2]
+
+    def render(self, values):
+        out = [self.literals[0]]
+        for placeholder, literal in zip(self.placeholders, self.literals[1:]):
+            value = values.get(placeholder)
+            out.append(f'[{placeholder}]' if value is None else str(value))
+            out.append(literal)
+        return ''.join(out)
+
+    def render_many(self, rows):
+        return [self.render(values) for values in rows]
+
+
+def unknown_placeholders(name, content):
+    """
+    Placeholders in `content` that the `name` template is never rendered with.
+    Templates not listed in TEMPLATE_PLACEHOLDERS aren't checked.
+    """
+    allowed = TEMPLATE_PLACEHOLDERS.get(name)
+    if allowed is None:
+        return []
+    return sorted({placeholder for placeholder in PLACEHOLDER_RE.findall(content) if placeholder not in allowed})
+
+
+# (schema_name, template name) -> CompiledTemplate, per process.
+_compiled = {}
+_compiled_lock = threading.Lock()
+
+
+def _tenant_templates(tenant):
+    """
+    ((config id, template_version), email_templates) for the tenant, from the
+    cache when it has them; None if the tenant has no TenantConfig.
+    """
+    key = tenant_cache_key(EMAIL_TEMPLATES, tenant.schema_name)
+    cached = cache.get(key)
+    if cached is None:
+        row = TenantConfig.objects.filter(tenant=tenant).values_list('id', 'template_version', 'email_templates').first()
+        cached = {'version': (row[0], row[1]), 'templates': row[2] or {}} if row else {'version': None, 'templates': None}
+        cache.set(key, cached, timeout=settings.EMAIL_TEMPLATE_CACHE_TIMEOUT)
+    if cached['version'] is None:
+        return None
+    # The config id is part of the version: a recreated config starts again at template_version 1.
+    return tuple(cached['version']), cached['templates']
+
+
+def get_email_template(tenant, name):
+    """
+    The tenant's `name` template compiled for rendering, or None if the tenant
+    doesn't have one. Raises TenantConfig.DoesNotExist if the tenant has no config.
+    Compiled plans are kept per process and recompiled only when the config's
+    template_version moves on.
+    """
+    templates = _tenant_templates(tenant)
+    if templates is None:
+        raise TenantConfig.DoesNotExist(f"TenantConfig not found for tenant {tenant.schema_name}")
+    version, email_templates = templates
+    template = email_templates.get(name)
+    if not template:
+        return None
+
+    key = (tenant.schema_name, name)
+    compiled = _compiled.get(key)
+    if compiled is None or compiled.version != version:
+        compiled = CompiledTemplate(
+            template.get('content', ''), name=name, version=version, is_auto_sent=template.get('is_auto_sent'),
+        )
+        with _compiled_lock:
+            _compiled[key] = compiled
+        logger.debug(f"Compiled {name} email template v{version} for tenant {tenant.schema_name}")
+    return compiled
@@ -0,0 +1,228 @@
+# core/utils/outbox.py
+import logging
+import random
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.mail import EmailMessage
+from django.db import connections, transaction
+from django.utils import timezone
+
+from core.models import OutboundEmail
+from core.utils.email_config import smtp_connections
+
+logger = logging.getLogger('core')
+
+DUE_STATUSES = ['pending', 'sending']
+
+
+def _outbound_email(tenant, subject, body, to, from_email=None, category='', reference='', content_subtype='plain'):
+    return OutboundEmail(
+        tenant=tenant,
+        category=category,
+        reference=str(reference or ''),
+        subject=subject[:255],
+        body=body,
+        content_subtype=content_subtype,
+        from_email=from_email or tenant.default_from_email or settings.DEFAULT_FROM_EMAIL,
+        to=[to] if isinstance(to, str) else list(to),
+    )
+
+
+def enqueue_email(tenant, subject, body, to, from_email=None, category='', reference='', content_subtype='plain'):
+    """
+    Queue an email for the deliver_outbox worker. Call it inside the transaction
+    that makes the change the email is about, so the email exists if and only if
+    that change commits. Returns the OutboundEmail.
+    """
+    email = _outbound_email(tenant, subject, body, to, from_email, category, reference, content_subtype)
+    email.save()
+    logger.debug(f"Queued {category or 'email'} {email.id} to {email.to} for tenant {tenant.schema_name}")
+    return email
+
+
+def enqueue_emails(tenant, emails):
+    """
+    enqueue_email for many messages in one INSERT. `emails` are dicts of
+    enqueue_email keyword arguments. Returns the OutboundEmails, in order.
+    """
+    queued = OutboundEmail.objects.bulk_create([_outbound_email(tenant, **email) for email in emails])
+    logger.debug(f"Queued {len(queued)} emails for tenant {tenant.schema_name}")
+    return queued
+
+
+def smtp_host(tenant):
+    return tenant.email_host or getattr(settings, 'EMAIL_HOST', '')
+
+
+def retry_delay(attempts):
+    """
+    Exponential backoff with +/-20% jitter, capped at OUTBOX_RETRY_MAX_DELAY.
+    """
+    delay = min(settings.OUTBOX_RETRY_BASE_DELAY * 2 ** max(attempts - 1, 0), settings.OUTBOX_RETRY_MAX_DELAY)
+    return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+
+def take_host_slot(host):
+    """
+    Count one message against the SMTP host's OUTBOX_HOST_RATE_LIMIT per-minute
+    budget. The window lives in the cache, so workers share it when CACHE_URL
+    points at a shared cache. Returns False once the budget is spent.
+    """
+    limit = settings.OUTBOX_HOST_RATE_LIMIT
+    if not limit:
+        return True
+    key = f"outbox-rate:{host}:{int(time.time() // 60)}"
+    cache.add(key, 0, timeout=120)
+    try:
+        return cache.incr(key) <= limit
+    except ValueError:
+        # Evicted between add() and incr().
+        cache.set(key, 1, timeout=120)
+        return True
+
+
+def claim_due_emails(limit):
+    """
+    Lease up to `limit` due messages: pending ones whose next attempt has come,
+    plus 'sending' ones whose worker died and let the lease expire. Rows are
+    locked with SKIP LOCKED, so concurrent workers never claim the same message.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            OutboundEmail.objects.select_for_update(skip_locked=True)
+            .filter(status__in=DUE_STATUSES, next_attempt_at__lte=now)
+            .order_by('next_attempt_at')
+            .values_list('id', flat=True)[:limit]
+        )
+        if not ids:
+            return []
+        OutboundEmail.objects.filter(id__in=ids).update(
+            status='sending', next_attempt_at=now + timedelta(seconds=settings.OUTBOX_LEASE_SECONDS), updated_at=now
+        )
+    return list(OutboundEmail.objects.filter(id__in=ids).select_related('tenant').order_by('id'))
+
+
+def _record(message, **fields):
+    OutboundEmail.objects.filter(pk=message.pk).update(updated_at=timezone.now(), **fields)
+
+
+def _record_failure(message, error):
+    attempts = message.attempts + 1
+    if attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+        _record(message, status='failed', attempts=attempts, last_error=str(error))
+        logger.error(f"Giving up on email {message.id} to {message.to} after {attempts} attempts: {str(error)}")
+        return 'failed'
+    _record(
+        message, status='pending', attempts=attempts, last_error=str(error),
+        next_attempt_at=timezone.now() + retry_delay(attempts),
+    )
+    logger.warning(f"Email {message.id} to {message.to} failed (attempt {attempts}), will retry: {str(error)}")
+    return 'retrying'
+
+
+def deliver_tenant_batch(tenant, messages):
+    """
+    Send one tenant's claimed messages over its pooled SMTP session (see
+    core.utils.email_config.smtp_connections), recording each outcome as it
+    happens. Messages over the host's rate limit go back to pending for the
+    next window without using up an attempt. Returns a Counter of outcomes.
+    """
+    outcomes = Counter()
+    host = smtp_host(tenant)
+    with smtp_connections.session(tenant) as connection:
+        for message in messages:
+            if not take_host_slot(host):
+                _record(message, status='pending', next_attempt_at=timezone.now() + timedelta(seconds=60 - time.time() % 60))
+                outcomes['deferred'] += 1
+                continue
+            email = EmailMessage(
+                subject=message.subject,
+                body=message.body,
+                from_email=message.from_email,
+                to=message.to,
+            )
+            email.content_subtype = message.content_subtype
+            try:
+                connection.send(email)
+            except Exception as e:
+                outcomes[_record_failure(message, e)] += 1
+                continue
+            _record(message, status='sent', attempts=message.attempts + 1, sent_at=timezone.now(), last_error='')
+            outcomes['sent'] += 1
+    if outcomes['deferred']:
+        logger.info(f"Deferred {outcomes['deferred']} emails for tenant {tenant.schema_name}: {host} rate limit reached")
+    return outcomes
+
+
+def _deliver_in_worker(tenant, messages):
+    try:
+        return deliver_tenant_batch(tenant, messages)
+    finally:
+        # Each worker thread has its own connection; don't leave it open.
+        connections.close_all()
+
+
+def deliver_outbox(batch_size=None, workers=None):
+    """
+    One delivery pass: claim up to OUTBOX_BATCH_SIZE due messages, group them by
+    tenant and deliver each tenant's batch over its own SMTP connection, up to
+    OUTBOX_DELIVERY_WORKERS tenants at a time (inline when that is 1). Returns
+    the outcome counts.
+    """
+    messages = claim_due_emails(batch_size or settings.OUTBOX_BATCH_SIZE)
+    if not messages:
+        return {}
+    by_tenant = defaultdict(list)
+    for message in messages:
+        by_tenant[message.tenant_id].append(message)
+
+    started = time.monotonic()
+    outcomes = Counter()
+    workers = max(1, min(len(by_tenant), workers or settings.OUTBOX_DELIVERY_WORKERS))
+    if workers == 1:
+        # Inline, on the calling thread's connection.
+        for batch in by_tenant.values():
+            try:
+                outcomes.update(deliver_tenant_batch(batch[0].tenant, batch))
+            except Exception as e:
+                logger.error(f"Outbox delivery batch failed: {str(e)}", exc_info=True)
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='outbox') as executor:
+            futures = [
+                executor.submit(_deliver_in_worker, batch[0].tenant, batch)
+                for batch in by_tenant.values()
+            ]
+            for future in futures:
+                try:
+                    outcomes.update(future.result())
+                except Exception as e:
+                    # Leased messages are picked up again once the lease expires.
+                    logger.error(f"Outbox delivery batch failed: {str(e)}", exc_info=True)
+    logger.info(
+        f"Outbox pass processed {len(messages)} emails for {len(by_tenant)} tenants in "
+        f"{time.monotonic() - started:.1f}s: {dict(outcomes)}"
+    )
+    for batch in by_tenant.values():
+        schema_name = batch[0].tenant.schema_name
+        logger.debug(f"SMTP connection stats for tenant {schema_name}: {smtp_connections.stats(schema_name)}")
+    return dict(outcomes)
+
+
+def purge_sent_emails(days=None):
+    """
+    Delete sent messages older than OUTBOX_RETENTION_DAYS; their bodies can hold
+    reset links and other one-off secrets. Failed messages are kept for review.
+    """
+    days = settings.OUTBOX_RETENTION_DAYS if days is None else days
+    deleted, _ = OutboundEmail.objects.filter(
+        status='sent', sent_at__lt=timezone.now() - timedelta(days=days)
+    ).delete()
+    if deleted:
+        logger.info(f"Purged {deleted} sent emails older than {days} days from the outbox")
+    return deleted
@@ -0,0 +1,267 @@
+# core/utils/tenant_tasks.py
+import json
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils import timezone
+from django_tenants.utils import get_public_schema_name, tenant_context
+
+from core.models import Tenant
+
+logger = logging.getLogger('core')
+
+POOL_THREAD = 'thread'
+POOL_PROCESS = 'process'
+POOL_SERIAL = 'serial'
+POOL_CHOICES = (POOL_THREAD, POOL_PROCESS, POOL_SERIAL)
+
+STATUS_OK = 'ok'
+STATUS_FAILED = 'failed'
+STATUS_TIMEOUT = 'timeout'
+STATUS_SKIPPED = 'skipped'
+
+
+@dataclass
+class TenantTaskResult:
+    """
+    Outcome of running a task in one tenant schema.
+    """
+    schema_name: str
+    status: str
+    result: Any = None
+    error: str = ''
+    elapsed_ms: float = 0.0
+
+    @property
+    def ok(self):
+        return self.status in (STATUS_OK, STATUS_SKIPPED)
+
+    def as_dict(self):
+        return asdict(self)
+
+
+def _checkpoint_path(name):
+    return os.path.join(settings.LOG_DIR, f'{name}.checkpoint.json')
+
+
+def load_checkpoint(name, run_key):
+    """
+    Schemas already finished by an interrupted `name` run with the same `run_key`.
+    """
+    try:
+        with open(_checkpoint_path(name)) as f:
+            checkpoint = json.load(f)
+    except (OSError, ValueError):
+        return set()
+    if checkpoint.get('run_key') != run_key:
+        return set()
+    return set(checkpoint.get('completed', []))
+
+
+def save_checkpoint(name, run_key, completed):
+    path = _checkpoint_path(name)
+    with open(f"{path}.tmp", 'w') as f:
+        json.dump({'run_key': run_key, 'completed': sorted(completed)}, f)
+    os.replace(f"{path}.tmp", path)
+
+
+def clear_checkpoint(name):
+    if os.path.exists(_checkpoint_path(name)):
+        os.remove(_checkpoint_path(name))
+
+
+def _cancel_running_query(wrapper, timed_out):
+    timed_out.set()
+    try:
+        if wrapper.connection is not None:
+            wrapper.connection.cancel()
+    except Exception as e:
+        logger.warning(f"Could not cancel query after tenant task timeout: {str(e)}")
+
+
+def run_tenant_task(task, schema_name, timeout=None):
+    """
+    Run `task(tenant)` inside the tenant's schema in the calling thread and wrap
+    the outcome in a TenantTaskResult. With a `timeout` (seconds), a watchdog
+    cancels the statement the task is running once the budget is spent; the task
+    then fails with a query-cancelled error and is reported as timed out.
+    """
+    started = time.monotonic()
+    timed_out = threading.Event()
+    watchdog = None
+    try:
+        tenant = Tenant.objects.get(schema_name=schema_name)
+        with tenant_context(tenant):
+            if timeout:
+                watchdog = threading.Timer(
+                    timeout, _cancel_running_query, [connections[DEFAULT_DB_ALIAS], timed_out]
+                )
+                watchdog.daemon = True
+                watchdog.start()
+            value = task(tenant)
+        status, error = STATUS_OK, ''
+    except Tenant.DoesNotExist:
+        value, status, error = None, STATUS_FAILED, f"Tenant schema '{schema_name}' not found"
+    except Exception as e:
+        value = None
+        status = STATUS_TIMEOUT if timed_out.is_set() else STATUS_FAILED
+        error = str(e)
+        logger.error(f"Tenant task failed for {schema_name}: {error}", exc_info=status == STATUS_FAILED)
+    finally:
+        if watchdog:
+            watchdog.cancel()
+    return TenantTaskResult(schema_name, status, value, error, (time.monotonic() - started) * 1000)
+
+
+def _run_in_worker(task, schema_name, timeout):
+    try:
+        return run_tenant_task(task, schema_name, timeout)
+    finally:
+        # Each worker thread/process has its own connection; don't leave it open.
+        connections.close_all()
+
+
+def _log_progress(result, done, total):
+    message = f"[{done}/{total}] {result.schema_name}: {result.status} ({result.elapsed_ms:.0f}ms)"
+    if result.ok:
+        logger.info(message)
+    else:
+        logger.warning(f"{message}: {result.error}")
+
+
+def tenant_schemas(schemas=None):
+    """
+    Schema names to run a task in: `schemas` if given, otherwise every tenant
+    except the public schema, in name order.
+    """
+    if schemas:
+        return list(dict.fromkeys(schemas))
+    return list(
+        Tenant.objects.exclude(schema_name=get_public_schema_name())
+        .order_by('schema_name').values_list('schema_name', flat=True)
+    )
+
+
+def run_for_tenants(task, schemas=None, name=None, workers=None, pool=POOL_THREAD, timeout=None,
+                    resume=True, run_key=None, progress=_log_progress):
+    """
+    Run `task(tenant)` in every selected tenant schema (see tenant_schemas), up to
+    `workers` tenants at a time (CRON_TENANT_WORKERS by default).
+
+    `pool` is 'thread', 'process' (forked workers; the task must be picklable, i.e.
+    a module-level function or a functools.partial of one) or 'serial' (inline in
+    the calling thread). `timeout` caps each tenant's run in seconds, defaulting to
+    TENANT_TASK_TIMEOUT; 0 disables it. When `name` is given, finished schemas are
+    checkpointed under LOG_DIR keyed by `run_key` (today's date by default), so a
+    rerun with the same key skips them; the checkpoint is removed once a run ends
+    without failures. `progress(result, done, total)` is called as each tenant
+    finishes. Returns a TenantTaskResult per schema, in schema order.
+    """
+    if pool not in POOL_CHOICES:
+        raise ValueError(f"Unknown pool '{pool}'; expected one of {', '.join(POOL_CHOICES)}")
+    workers = workers or getattr(settings, 'CRON_TENANT_WORKERS', 4)
+    timeout = getattr(settings, 'TENANT_TASK_TIMEOUT', 0) if timeout is None else timeout
+    run_key = run_key or timezone.now().date().isoformat()
+
+    selected = tenant_schemas(schemas)
+    completed = load_checkpoint(name, run_key) if name and resume else set()
+    results = {
+        schema: TenantTaskResult(schema, STATUS_SKIPPED)
+        for schema in selected if schema in completed
+    }
+    pending = [schema for schema in selected if schema not in completed]
+    total = len(pending)
+    label = name or getattr(task, '__name__', repr(task))
+    logger.info(
+        f"Running {label} for {total} tenants ({len(results)} skipped from checkpoint) "
+        f"with {workers} {pool} workers."
+    )
+
+    def record(result, done):
+        results[result.schema_name] = result
+        if name and result.status == STATUS_OK:
+            completed.add(result.schema_name)
+            save_checkpoint(name, run_key, completed)
+        if progress:
+            progress(result, done, total)
+
+    started = time.monotonic()
+    if pool == POOL_SERIAL:
+        for done, schema in enumerate(pending, start=1):
+            record(run_tenant_task(task, schema, timeout), done)
+    else:
+        if pool == POOL_PROCESS:
+            # Forked children must not share the parent's database sockets.
+            connections.close_all()
+            executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('fork'))
+        else:
+            executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='tenant-task')
+        with executor:
+            futures = {executor.submit(_run_in_worker, task, schema, timeout): schema for schema in pending}
+            for done, future in enumerate(as_completed(futures), start=1):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # Only reachable if the worker itself died (e.g. a killed process).
+                    result = TenantTaskResult(futures[future], STATUS_FAILED, error=str(e))
+                    logger.error(f"Tenant task worker failed for {futures[future]}: {str(e)}")
+                record(result, done)
+
+    failed = [result for result in results.values() if not result.ok]
+    if name and not failed:
+        clear_checkpoint(name)
+    logger.info(
+        f"Completed {label}: {total - len(failed)} of {total} tenants succeeded "
+        f"in {time.monotonic() - started:.1f}s; {len(failed)} failed."
+    )
+    return [results[schema] for schema in selected]
+
+
+def add_tenant_task_arguments(parser):
+    """
+    Options shared by management commands built on run_for_tenants.
+    """
+    parser.add_argument('--schema', action='append', dest='schemas', metavar='SCHEMA',
+                        help='Tenant schema to run in (repeatable; default: every tenant)')
+    parser.add_argument('--workers', type=int, help='Tenants to process concurrently (default: CRON_TENANT_WORKERS)')
+    parser.add_argument('--pool', choices=POOL_CHOICES, default=POOL_THREAD, help='Worker pool type (default: thread)')
+    parser.add_argument('--timeout', type=int, help='Per-tenant time limit in seconds (default: TENANT_TASK_TIMEOUT)')
+    parser.add_argument('--no-resume', action='store_true', help="Ignore the checkpoint and process every tenant")
+
+
+def tenant_task_options(options):
+    """
+    run_for_tenants keyword arguments from add_tenant_task_arguments options.
+    """
+    return {
+        'schemas': options.get('schemas'),
+        'workers': options.get('workers'),
+        'pool': options.get('pool') or POOL_THREAD,
+        'timeout': options.get('timeout'),
+        'resume': not options.get('no_resume'),
+    }
+
+
+def command_progress(command, stream=None):
+    """
+    progress callback for run_for_tenants that reports each finished tenant on a
+    management command's output (stdout by default).
+    """
+    stream = stream or command.stdout
+
+    def report(result, done, total):
+        message = f"[{done}/{total}] {result.schema_name}: {result.status} ({result.elapsed_ms:.0f}ms)"
+        if result.ok:
+            stream.write(message)
+        else:
+            stream.write(command.style.ERROR(f"{message}: {result.error}"))
+
+    return report
@@ -0,0 +1,47 @@
+# core/utils/testing.py
+from django.db import connection
+from django_tenants.test.cases import TenantTestCase as BaseTenantTestCase
+
+
+class TenantTestCase(BaseTenantTestCase):
+    """
+    django-tenants' TenantTestCase with Django's TestCase class setup restored.
+
+    The upstream setUpClass creates the test schema but never calls
+    TestCase.setUpClass, so setUpTestData and class-level override_settings are
+    silently skipped. Here the schema is created first and TestCase.setUpClass
+    runs inside it: setUpTestData builds its fixtures in the tenant schema within
+    the class-wide transaction and is rolled back once the class is done.
+
+    The upstream tearDownClass deletes the tenant through the ORM cascade after
+    dropping its schema, which fails on the tenant-schema tables holding a
+    foreign key to the tenant (and on apps that have no migrations). Nothing
+    outlives the class transaction, so the row is deleted directly instead.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        try:
+            super(BaseTenantTestCase, cls).setUpClass()
+        except Exception:
+            cls._drop_tenant()
+            raise
+
+    @classmethod
+    def tearDownClass(cls):
+        try:
+            super(BaseTenantTestCase, cls).tearDownClass()
+        finally:
+            cls._drop_tenant()
+
+    @classmethod
+    def _drop_tenant(cls):
+        connection.set_schema_to_public()
+        cls.domain.delete()
+        cls.tenant._drop_schema(force_drop=True)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {connection.ops.quote_name(cls.tenant._meta.db_table)} WHERE id = %s", [cls.tenant.pk],
+            )
+        cls.remove_allowed_test_domain()
@@ -8,8 +8,9 @@ from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework import generics
-from .models import Tenant, Domain, Module, TenantConfig, Branch
-from .serializers import TenantSerializer, ModuleSerializer, TenantConfigSerializer, BranchSerializer
+from lumina_care.pagination import KeysetPagination
+from .models import Tenant, Domain, Module, TenantConfig, Branch, OutboundEmail
+from .serializers import TenantSerializer, ModuleSerializer, TenantConfigSerializer, BranchSerializer, OutboundEmailSerializer
 
 logger = logging.getLogger('core')
 
@@ -186,6 +187,33 @@ class ModuleListView(APIView):
             'message': serializer.errors
         }, status=status.HTTP_400_BAD_REQUEST)
 
+class OutboundEmailListView(generics.ListAPIView):
+    """
+    Delivery status of the tenant's queued emails, newest first. Filter with
+    ?status=, ?category= and ?reference= (e.g. a schedule or application id).
+    """
+    serializer_class = OutboundEmailSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+
+    def get_queryset(self):
+        queryset = OutboundEmail.objects.filter(tenant=self.request.user.tenant)
+        for field in ('status', 'category', 'reference'):
+            value = self.request.query_params.get(field)
+            if value:
+                queryset = queryset.filter(**{field: value})
+        return queryset
+
+
+class OutboundEmailDetailView(generics.RetrieveAPIView):
+    serializer_class = OutboundEmailSerializer
+    permission_classes = [IsAuthenticated]
+    lookup_field = 'id'
+
+    def get_queryset(self):
+        return OutboundEmail.objects.filter(tenant=self.request.user.tenant)
+
+
 class TenantConfigView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -275,7 +303,11 @@ class TenantConfigView(APIView):
                 config = TenantConfig.objects.get(tenant=tenant)
                 current_templates = config.email_templates or {}
                 incoming_templates = request.data.get('email_templates', {})
-                updated_templates = { **current_templates, **incoming_templates }
+                # Anything but a dict is passed through for the serializer to reject.
+                if isinstance(current_templates, dict) and isinstance(incoming_templates, dict):
+                    updated_templates = { **current_templates, **incoming_templates }
+                else:
+                    updated_templates = incoming_templates
                 updated_data = { **request.data, 'email_templates': updated_templates }
                 serializer = TenantConfigSerializer(config, data=updated_data, partial=True)
                 if serializer.is_valid():
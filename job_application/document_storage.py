@@ -0,0 +1,262 @@
+# job_application/document_storage.py
+import logging
+import mimetypes
+import os
+import tempfile
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from django.conf import settings
+from django.core import signing
+from django.core.files import File
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+
+from lumina_care.supabase_client import supabase
+
+logger = logging.getLogger('job_applications')
+
+MAX_DOCUMENT_SIZE = 50 * 1024 * 1024
+
+# Accepted document types and the leading bytes their files must start with.
+DOCUMENT_SIGNATURES = {
+    'application/pdf': b'%PDF-',
+    'application/msword': b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1',
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document': b'PK\x03\x04',
+}
+ALLOWED_DOCUMENT_TYPES = tuple(DOCUMENT_SIGNATURES)
+
+UPLOAD_INTENT_SALT = 'job_application.document_upload_intent'
+
+
+class SupabaseDocumentBackend:
+    """
+    Application documents in the SUPABASE_BUCKET storage bucket.
+    """
+
+    def __init__(self):
+        self.bucket = supabase.storage.from_(settings.SUPABASE_BUCKET)
+
+    def upload(self, path, content, content_type):
+        self.bucket.upload(path, content, {"content-type": content_type})
+
+    def signed_upload(self, path, token, request):
+        signed = self.bucket.create_signed_upload_url(path)
+        return {'upload_url': signed['signed_url'], 'method': 'PUT'}
+
+    def size(self, path):
+        try:
+            return int(self.bucket.info(path).get('size') or 0)
+        except Exception as e:
+            logger.warning(f"Could not stat uploaded document {path}: {str(e)}")
+            return None
+
+    def read_head(self, path, length):
+        signed = self.bucket.create_signed_url(path, 60)
+        response = requests.get(signed['signedURL'], headers={'Range': f'bytes=0-{length - 1}'}, timeout=10)
+        response.raise_for_status()
+        return response.content[:length]
+
+    def public_url(self, path):
+        return self.bucket.get_public_url(path)
+
+    def remove(self, paths):
+        self.bucket.remove(paths)
+
+
+class LocalDocumentBackend:
+    """
+    Stand-in for development and tests: documents live in default_storage and the
+    signed upload URL points at ApplicationDocumentLocalUploadView.
+    """
+
+    def upload(self, path, content, content_type):
+        default_storage.save(path, ContentFile(content))
+
+    def signed_upload(self, path, token, request):
+        url = reverse('job_applications:application-document-local-upload', args=[token])
+        return {'upload_url': request.build_absolute_uri(url), 'method': 'PUT'}
+
+    def size(self, path):
+        return default_storage.size(path) if default_storage.exists(path) else None
+
+    def read_head(self, path, length):
+        with default_storage.open(path, 'rb') as f:
+            return f.read(length)
+
+    def public_url(self, path):
+        return default_storage.url(path)
+
+    def remove(self, paths):
+        for path in paths:
+            default_storage.delete(path)
+
+
+DOCUMENT_BACKENDS = {
+    'supabase': SupabaseDocumentBackend,
+    'local': LocalDocumentBackend,
+}
+
+
+def get_document_backend():
+    return DOCUMENT_BACKENDS[getattr(settings, 'APPLICATION_DOCUMENT_BACKEND', 'supabase')]()
+
+
+def document_path(filename):
+    file_ext = os.path.splitext(filename)[1]
+    return f"application_documents/{timezone.now().strftime('%Y/%m/%d')}/{uuid.uuid4()}{file_ext}"
+
+
+def _upload_document(backend, document_type, file):
+    path = document_path(file.name)
+    content_type = mimetypes.guess_type(file.name)[0]
+    backend.upload(path, file.read(), content_type or 'application/octet-stream')
+    return {
+        'document_type': document_type,
+        'file_path': path,
+        'file_url': backend.public_url(path),
+        'uploaded_at': timezone.now().isoformat()
+    }
+
+
+def upload_application_documents(documents_data):
+    """
+    Upload validated application documents to storage in parallel
+    (DOCUMENT_UPLOAD_WORKERS threads) and return the stored document entries in
+    submission order. Entries already finalized from an upload intent are passed
+    through. Call it outside any transaction: no database work happens here. If
+    one upload fails, the files this call uploaded are removed again.
+    """
+    pending = [doc for doc in documents_data if 'file' in doc]
+    if not pending:
+        return list(documents_data)
+    backend = get_document_backend()
+    workers = max(1, min(len(pending), getattr(settings, 'DOCUMENT_UPLOAD_WORKERS', 4)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='document-upload') as executor:
+        futures = [
+            executor.submit(_upload_document, backend, doc['document_type'], doc['file'])
+            for doc in pending
+        ]
+    uploaded, errors = [], []
+    for future in futures:
+        try:
+            uploaded.append(future.result())
+        except Exception as e:
+            errors.append(e)
+    if errors:
+        remove_application_documents(uploaded)
+        raise errors[0]
+    logger.debug(f"Uploaded {len(uploaded)} application documents")
+    results = iter(uploaded)
+    return [next(results) if 'file' in doc else doc for doc in documents_data]
+
+
+def remove_application_documents(documents):
+    """
+    Best-effort removal of uploaded documents whose application was never saved.
+    """
+    paths = [doc['file_path'] for doc in documents if doc.get('file_path')]
+    if not paths:
+        return
+    try:
+        get_document_backend().remove(paths)
+        logger.info(f"Removed {len(paths)} orphaned application documents")
+    except Exception as e:
+        logger.error(f"Failed to remove orphaned application documents {paths}: {str(e)}")
+
+
+def create_upload_intent(request, job_requisition, document_type, filename, content_type, size):
+    """
+    Reserve an object key for a document the applicant will upload straight to
+    storage, and return the signed upload URL with an `upload_token` to quote in
+    the application submission. The token expires after DOCUMENT_UPLOAD_INTENT_TTL
+    seconds and is bound to the requisition, document type and declared file.
+    """
+    path = document_path(filename)
+    token = signing.dumps({
+        'path': path,
+        'schema': request.tenant.schema_name,
+        'job_requisition': job_requisition.id,
+        'document_type': document_type,
+        'content_type': content_type,
+        'size': size,
+    }, salt=UPLOAD_INTENT_SALT, compress=True)
+    intent = get_document_backend().signed_upload(path, token, request)
+    intent.update({
+        'headers': {'content-type': content_type},
+        'object_key': path,
+        'upload_token': token,
+        'expires_in': settings.DOCUMENT_UPLOAD_INTENT_TTL,
+    })
+    return intent
+
+
+def load_upload_intent(token):
+    """
+    Verified intent payload for `token`; raises ValueError if it is forged or expired.
+    """
+    try:
+        return signing.loads(token, salt=UPLOAD_INTENT_SALT, max_age=settings.DOCUMENT_UPLOAD_INTENT_TTL)
+    except signing.SignatureExpired:
+        raise ValueError("Upload token has expired; request a new upload URL.")
+    except signing.BadSignature:
+        raise ValueError("Invalid upload token.")
+
+
+def finalize_document_upload(token, job_requisition, document_type):
+    """
+    Check that the object behind an upload intent exists, is within the declared
+    size and the 50 MB limit, and really is the declared PDF/Word type, then return
+    its document entry. Raises ValueError describing the first failed check.
+    """
+    intent = load_upload_intent(token)
+    if (intent['schema'] != connection.schema_name or intent['job_requisition'] != job_requisition.id
+            or intent['document_type'] != document_type):
+        raise ValueError("Upload token does not belong to this document.")
+
+    backend = get_document_backend()
+    path = intent['path']
+    size = backend.size(path)
+    if not size:
+        raise ValueError("Uploaded file not found; upload it before submitting.")
+    if size > min(intent['size'], MAX_DOCUMENT_SIZE):
+        backend.remove([path])
+        raise ValueError("Uploaded file is larger than declared or exceeds the 50 MB limit.")
+    signature = DOCUMENT_SIGNATURES[intent['content_type']]
+    if backend.read_head(path, len(signature)) != signature:
+        backend.remove([path])
+        raise ValueError(f"Uploaded file is not a valid {intent['content_type']} document.")
+
+    return {
+        'document_type': document_type,
+        'file_path': path,
+        'file_url': backend.public_url(path),
+        'uploaded_at': timezone.now().isoformat()
+    }
+
+
+def store_local_upload(token, stream):
+    """
+    Write a direct upload for LocalDocumentBackend to the intent's object key,
+    refusing more bytes than the intent declared.
+    """
+    intent = load_upload_intent(token)
+    if stream is None:
+        raise ValueError("Empty upload.")
+    limit = min(intent['size'], MAX_DOCUMENT_SIZE)
+    received = 0
+    with tempfile.SpooledTemporaryFile(max_size=1024 * 1024) as buffer:
+        for chunk in iter(lambda: stream.read(64 * 1024), b''):
+            received += len(chunk)
+            if received > limit:
+                raise ValueError("Upload exceeds the declared file size.")
+            buffer.write(chunk)
+        buffer.seek(0)
+        if default_storage.exists(intent['path']):
+            default_storage.delete(intent['path'])
+        default_storage.save(intent['path'], File(buffer))
+    return intent['path']
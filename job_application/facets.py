@@ -0,0 +1,46 @@
+# job_application/facets.py
+import logging
+
+from django.db import connection
+
+logger = logging.getLogger('job_applications')
+
+# Application columns the facet breakdowns are computed from (attnames).
+FACET_FIELDS = ('status', 'screening_status', 'branch_id', 'source', 'is_deleted')
+
+
+def application_facets(queryset):
+    """
+    Counts of `queryset` by status, screening_status, branch and source, plus the
+    total, computed in a single GROUP BY GROUPING SETS query over the queryset's
+    own filters.
+    """
+    rows = queryset.order_by().values_list('status', 'screening_status', 'branch_id', 'branch__name', 'source')
+    inner_sql, params = rows.query.sql_with_params()
+    sql = f"""
+        SELECT status, screening_status, branch_id, branch_name, source,
+               GROUPING(status), GROUPING(screening_status), GROUPING(branch_id), GROUPING(source),
+               COUNT(*)
+        FROM ({inner_sql}) AS facet_rows (status, screening_status, branch_id, branch_name, source)
+        GROUP BY GROUPING SETS ((status), (screening_status), (branch_id, branch_name), (source), ())
+    """
+
+    facets = {'total': 0, 'status': [], 'screening_status': [], 'branch': [], 'source': []}
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        for (status, screening_status, branch_id, branch_name, source,
+             no_status, no_screening, no_branch, no_source, count) in cursor.fetchall():
+            if not no_status:
+                facets['status'].append({'value': status, 'count': count})
+            elif not no_screening:
+                facets['screening_status'].append({'value': screening_status, 'count': count})
+            elif not no_branch:
+                facets['branch'].append({'id': branch_id, 'name': branch_name, 'count': count})
+            elif not no_source:
+                facets['source'].append({'value': source, 'count': count})
+            else:
+                facets['total'] = count
+
+    for name in ('status', 'screening_status', 'branch', 'source'):
+        facets[name].sort(key=lambda item: -item['count'])
+    return facets
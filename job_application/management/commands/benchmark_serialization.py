@@ -0,0 +1,103 @@
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from core.models import Branch, Tenant
+from job_application.models import JobApplication
+from job_application.serializers import JobApplicationFastSerializer, JobApplicationSerializer
+from talent_engine.models import JobRequisition
+
+
+class Command(BaseCommand):
+    help = (
+        'Compares JobApplicationSerializer(many=True) with the values()-based fast path on '
+        'in-memory rows, checks both render identical JSON and reports the time per 10k rows'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000, help='Number of applications to serialize')
+        parser.add_argument('--repeat', type=int, default=3, help='Best-of-N timing runs')
+
+    def handle(self, *args, **options):
+        rows, repeat = options['rows'], max(1, options['repeat'])
+        instances = self.build_instances(rows)
+        fast_serializer = JobApplicationFastSerializer()
+        values_rows = [self.as_values_row(instance, fast_serializer.lookups) for instance in instances]
+
+        renderer = JSONRenderer()
+        expected = renderer.render(JobApplicationSerializer(instances, many=True).data)
+        actual = renderer.render(fast_serializer.serialize(values_rows))
+        if expected != actual:
+            raise CommandError('Fast serializer output differs from JobApplicationSerializer')
+
+        full = self.best_of(repeat, lambda: JobApplicationSerializer(instances, many=True).data)
+        fast = self.best_of(repeat, lambda: fast_serializer.serialize(values_rows))
+        scale = 10000 / rows
+        self.stdout.write(f"Rows: {rows} (output identical, {len(expected)} bytes)")
+        self.stdout.write(f"JobApplicationSerializer: {full * scale * 1000:.1f} ms per 10k rows")
+        self.stdout.write(f"JobApplicationFastSerializer: {fast * scale * 1000:.1f} ms per 10k rows")
+        self.stdout.write(self.style.SUCCESS(f"Speedup: {full / fast:.1f}x"))
+
+    @staticmethod
+    def best_of(repeat, func):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    @staticmethod
+    def build_instances(rows):
+        """
+        Unsaved applications with their related objects attached, so serialization
+        is measured without any database access.
+        """
+        tenant = Tenant(id=1, name='Benchmark', schema_name='benchmark')
+        branches = [Branch(id=index, tenant=tenant, name=f"Branch {index}") for index in range(1, 6)]
+        requisitions = [
+            JobRequisition(id=f"BEN-{index:04d}", tenant=tenant, title=f"Role {index}") for index in range(1, 51)
+        ]
+        now = timezone.now()
+        instances = []
+        for index in range(rows):
+            created_at = now - timedelta(minutes=index, microseconds=index)
+            instances.append(JobApplication(
+                id=f"BEN-{index:06d}", tenant=tenant, branch=branches[index % 5] if index % 4 else None,
+                job_requisition=requisitions[index % 50], full_name=f"Applicant {index}",
+                email=f"applicant{index}@example.com", phone='+440000000000', qualification='BSc',
+                experience='3 years', date_of_birth=date(1990, 1, 1) + timedelta(days=index % 3000),
+                screening_score=(index % 100) / 1.3 if index % 3 else None,
+                screening_status=[{'score': index % 100, 'screened_at': created_at.isoformat()}],
+                knowledge_skill='Care', cover_letter='Hello', status='shortlisted' if index % 5 == 0 else 'new',
+                source='Website', resume_status=bool(index % 2),
+                employment_gaps=[{'gap_start': '2020-01-01', 'gap_end': '2020-06-01', 'duration_months': 5}],
+                documents=[
+                    {'document_type': 'resume', 'file_url': f"https://files.example.com/{index}.pdf",
+                     'uploaded_at': created_at.isoformat()},
+                    {'document_type': 'cover_letter', 'uploaded_at': created_at.isoformat()},
+                ],
+                compliance_status=[
+                    {'id': f"item-{index}", 'name': 'DBS', 'required': True, 'status': 'pending',
+                     'checked_at': None, 'document': {'file_url': None, 'uploaded_at': None}},
+                    {'name': 'Right to work', 'notes': 'Awaiting upload'},
+                ],
+                interview_location='Head Office', is_deleted=False,
+                applied_at=created_at, created_at=created_at, updated_at=created_at,
+            ))
+        return instances
+
+    @staticmethod
+    def as_values_row(instance, lookups):
+        """
+        The row .values(*lookups) would return for `instance`.
+        """
+        row = {}
+        for lookup in lookups:
+            value = instance
+            for part in lookup.split('__'):
+                value = getattr(value, part) if value is not None else None
+            row[lookup] = value
+        return row
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+from django_tenants.utils import tenant_context
+from job_application.models import JobApplication
+from talent_engine.models import JobRequisition
+from core.models import Tenant
+from core.utils.cache_keys import PUBLIC_JOB_FEED, bump_tenant_cache
+import logging
+
+logger = logging.getLogger('job_applications')
+
+class Command(BaseCommand):
+    help = 'Recomputes JobRequisition.num_of_applications from active applications for every tenant'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--schema', help='Only reconcile the given tenant schema')
+
+    def handle(self, *args, **options):
+        tenants = Tenant.objects.exclude(schema_name='public')
+        if options.get('schema'):
+            tenants = tenants.filter(schema_name=options['schema'])
+
+        for tenant in tenants:
+            with tenant_context(tenant):
+                try:
+                    active_count = (
+                        JobApplication.active_objects
+                        .filter(job_requisition=OuterRef('pk'))
+                        .order_by()
+                        .values('job_requisition')
+                        .annotate(total=Count('id'))
+                        .values('total')
+                    )
+                    expected = Coalesce(Subquery(active_count, output_field=IntegerField()), Value(0))
+                    drifted = JobRequisition.objects.filter(tenant=tenant).annotate(expected=expected).filter(
+                        ~Q(num_of_applications=expected)
+                    )
+                    fixed = JobRequisition.objects.filter(pk__in=drifted.values('pk')).update(num_of_applications=expected)
+                    if fixed:
+                        bump_tenant_cache(PUBLIC_JOB_FEED, tenant.schema_name)
+                    logger.info(f"Reconciled {fixed} requisition counter(s) for tenant {tenant.schema_name}")
+                    self.stdout.write(self.style.SUCCESS(f"Reconciled {fixed} requisition counter(s) for tenant {tenant.schema_name}"))
+                except Exception as e:
+                    logger.error(f"Error reconciling application counts for tenant {tenant.schema_name}: {str(e)}")
+                    self.stdout.write(self.style.ERROR(f"Error reconciling application counts for tenant {tenant.schema_name}: {str(e)}"))
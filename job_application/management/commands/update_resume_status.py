@@ -1,57 +1,63 @@
 from django.core.management.base import BaseCommand
-from django_tenants.utils import tenant_context
+from django.utils import timezone
 from job_application.models import JobApplication
-from core.models import Tenant
+from core.utils.tenant_tasks import (
+    add_tenant_task_arguments, command_progress, run_for_tenants, tenant_task_options,
+)
 import logging
 
 logger = logging.getLogger('job_applications')
 
+RESUME_DOCUMENT_TYPES = {"resume", "curriculum vitae (cv)", "cv"}
+
+
+def mark_resume_status(tenant):
+    """
+    Set resume_status on the tenant's active applications that carry a resume
+    document but are flagged as having none, with a single UPDATE. Returns the
+    number of applications updated.
+    """
+    applications = JobApplication.active_objects.filter(tenant=tenant, resume_status=False)
+    with_resume = []
+    for app_id, documents in applications.values_list('id', 'documents').iterator(chunk_size=500):
+        if not isinstance(documents, list):
+            logger.error(f"Documents field for application {app_id} is not a list: {type(documents)}")
+            continue
+        if any(
+            isinstance(doc, dict) and (doc.get('document_type') or '').lower() in RESUME_DOCUMENT_TYPES
+            for doc in documents
+        ):
+            with_resume.append(app_id)
+
+    if not with_resume:
+        logger.info(f"No applications to update for tenant {tenant.schema_name}")
+        return 0
+    updated = JobApplication.objects.filter(id__in=with_resume).update(resume_status=True, updated_at=timezone.now())
+    logger.info(f"Updated resume_status for {updated} applications in tenant {tenant.schema_name}")
+    return updated
+
+
 class Command(BaseCommand):
     help = 'Updates resume_status for applications with resume documents'
 
+    def add_arguments(self, parser):
+        add_tenant_task_arguments(parser)
+
     def handle(self, *args, **options):
-        try:
-            tenant = Tenant.objects.get(schema_name="proliance")
-        except Tenant.DoesNotExist:
-            logger.error("Tenant 'proliance' not found")
-            self.stdout.write(self.style.ERROR("Tenant 'proliance' not found"))
-            return
-
-        with tenant_context(tenant):
-            try:
-                applications = JobApplication.active_objects.filter(
-                    tenant=tenant,
-                    resume_status=False
-                )
-                if not applications.exists():
-                    logger.info("No applications with resume_status=False found")
-                    self.stdout.write(self.style.SUCCESS("No applications with resume_status=False found"))
-                    return
-
-                for app in applications:
-                    try:
-                        # Check if documents is a list and iterate directly
-                        documents = app.documents if app.documents else []
-                        if not isinstance(documents, list):
-                            logger.error(f"Documents field for application {app.id} is not a list: {type(documents)}")
-                            self.stdout.write(self.style.ERROR(f"Documents field for application {app.id} is not a list"))
-                            continue
-
-                        has_resume = any(
-                            doc.get('document_type', '').lower() in ["resume", "curriculum vitae (cv)", "cv"]
-                            for doc in documents
-                        )
-                        if has_resume:
-                            app.resume_status = True
-                            app.save()
-                            logger.info(f"Updated resume_status for application {app.id}")
-                            self.stdout.write(self.style.SUCCESS(f"Updated resume_status for application {app.id}"))
-                        else:
-                            logger.info(f"No resume found for application {app.id}")
-                            self.stdout.write(self.style.WARNING(f"No resume found for application {app.id}"))
-                    except Exception as e:
-                        logger.error(f"Error processing application {app.id}: {str(e)}")
-                        self.stdout.write(self.style.ERROR(f"Error processing application {app.id}: {str(e)}"))
-            except Exception as e:
-                logger.error(f"Error querying applications: {str(e)}")
-                self.stdout.write(self.style.ERROR(f"Error querying applications: {str(e)}"))
\ No newline at end of file
+        results = run_for_tenants(
+            mark_resume_status,
+            name='update_resume_status',
+            progress=command_progress(self),
+            **tenant_task_options(options),
+        )
+
+        updated = sum(result.result or 0 for result in results)
+        failed = [result.schema_name for result in results if not result.ok]
+        if failed:
+            self.stdout.write(self.style.ERROR(
+                f"Updated resume_status for {updated} application(s); failed for tenant(s): {', '.join(failed)}"
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"Updated resume_status for {updated} application(s) across {len(results)} tenant(s)"
+            ))
@@ -0,0 +1,49 @@
+# Generated by Django 4.2.23 on 2026-10-19 07:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_application', '0003_alter_schedule_unique_together'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['tenant', 'is_deleted', '-created_at', '-id'], name='jobapp_tenant_del_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['job_requisition', 'status'], name='jobapp_active_req_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['job_requisition', '-created_at', '-id'], name='jobapp_active_req_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['job_requisition', 'email'], name='jobapp_req_email_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['branch', '-created_at', '-id'], name='jobapp_active_branch_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='schedule',
+            index=models.Index(fields=['tenant', 'is_deleted', '-created_at', '-id'], name='sched_tenant_del_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='schedule',
+            index=models.Index(fields=['status', 'is_deleted'], name='sched_status_del_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='schedule',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['job_application'], name='sched_active_app_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='schedule',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['branch', '-created_at', '-id'], name='sched_active_branch_idx'),
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 4.2.23 on 2026-10-19 07:52
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+SEARCH_DOCUMENT = """
+    setweight(to_tsvector('english', coalesce({row}full_name, '')), 'A')
+    || setweight(to_tsvector('english', coalesce({row}email, '')), 'A')
+    || setweight(to_tsvector('english', coalesce({row}qualification, '') || ' ' || coalesce({row}knowledge_skill, '')), 'B')
+    || setweight(to_tsvector('english', coalesce({row}parsed_resume_text, '')), 'C')
+"""
+
+CREATE_TRIGGER = f"""
+CREATE OR REPLACE FUNCTION job_applications_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE'
+        AND NEW.full_name IS NOT DISTINCT FROM OLD.full_name
+        AND NEW.email IS NOT DISTINCT FROM OLD.email
+        AND NEW.qualification IS NOT DISTINCT FROM OLD.qualification
+        AND NEW.knowledge_skill IS NOT DISTINCT FROM OLD.knowledge_skill
+        AND NEW.parsed_resume_text IS NOT DISTINCT FROM OLD.parsed_resume_text THEN
+        -- Nothing searchable changed; keep the stored vector whatever the ORM wrote.
+        NEW.search_vector := OLD.search_vector;
+        RETURN NEW;
+    END IF;
+    NEW.search_vector := {SEARCH_DOCUMENT.format(row='NEW.')};
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+UPDATE job_applications_job_application SET search_vector = {SEARCH_DOCUMENT.format(row='')};
+
+CREATE TRIGGER job_applications_search_vector_trigger
+    BEFORE INSERT OR UPDATE ON job_applications_job_application
+    FOR EACH ROW EXECUTE PROCEDURE job_applications_search_vector_update();
+"""
+
+DROP_TRIGGER = """
+DROP TRIGGER IF EXISTS job_applications_search_vector_trigger ON job_applications_job_application;
+DROP FUNCTION IF EXISTS job_applications_search_vector_update();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_application', '0004_jobapplication_schedule_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobapplication',
+            name='parsed_resume_text',
+            field=models.TextField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobapplication',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='jobapp_search_vector_idx'),
+        ),
+        migrations.RunSQL(CREATE_TRIGGER, DROP_TRIGGER),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 4.2.23 on 2026-10-19 08:00
+
+import logging
+from collections import Counter
+
+from django.db import migrations, models
+from django.db.models import Count, F, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+logger = logging.getLogger('job_applications')
+
+
+def soft_delete_duplicate_applications(apps, schema_editor):
+    """
+    The old submit path checked for an existing application and inserted in two
+    steps, so concurrent submissions can have left several active unbranched
+    applications for one tenant/requisition/email. Keep the oldest of each group
+    and soft-delete the rest so the unique constraint below can be created.
+    """
+    JobApplication = apps.get_model('job_application', 'JobApplication')
+    JobRequisition = apps.get_model('talent_engine', 'JobRequisition')
+    active = JobApplication.objects.filter(branch__isnull=True, is_deleted=False)
+    groups = (
+        active.order_by().values('tenant_id', 'job_requisition_id', 'email')
+        .annotate(rows=Count('id')).filter(rows__gt=1)
+    )
+    duplicate_ids, deltas = [], Counter()
+    for group in groups:
+        ids = list(
+            active.filter(tenant_id=group['tenant_id'], job_requisition_id=group['job_requisition_id'], email=group['email'])
+            .order_by('created_at', 'id').values_list('id', flat=True)
+        )
+        logger.warning(
+            f"Keeping application {ids[0]} for {group['email']} on requisition {group['job_requisition_id']}, "
+            f"soft-deleting duplicates {', '.join(ids[1:])} in schema {schema_editor.connection.schema_name}"
+        )
+        duplicate_ids.extend(ids[1:])
+        deltas[group['job_requisition_id']] += len(ids) - 1
+    if not duplicate_ids:
+        return
+    JobApplication.objects.filter(id__in=duplicate_ids).update(is_deleted=True, updated_at=timezone.now())
+    # Soft-deleted applications no longer count towards their requisition.
+    for job_requisition_id, removed in deltas.items():
+        JobRequisition.objects.filter(pk=job_requisition_id).update(
+            num_of_applications=Greatest(F('num_of_applications') - Value(removed), Value(0))
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_application', '0005_jobapplication_search_vector'),
+        ('talent_engine', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IdentifierCounter',
+            fields=[
+                ('scope', models.CharField(max_length=100, primary_key=True, serialize=False)),
+                ('last_value', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'job_applications_identifier_counter',
+            },
+        ),
+        migrations.RunPython(soft_delete_duplicate_applications, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='jobapplication',
+            constraint=models.UniqueConstraint(condition=models.Q(('branch__isnull', True), ('is_deleted', False)), fields=('tenant', 'job_requisition', 'email'), name='unique_unbranched_application_per_email'),
+        ),
+    ]
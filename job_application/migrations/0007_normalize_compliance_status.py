@@ -0,0 +1,45 @@
+from django.db import migrations
+
+COMPLIANCE_ITEM_DEFAULTS = {
+    'name': '',
+    'description': '',
+    'required': False,
+    'status': 'pending',
+    'checked_by': None,
+    'checked_at': None,
+    'notes': '',
+}
+
+
+def normalize_compliance_status(apps, schema_editor):
+    """
+    Compliance items are now patched in place by id, which needs every
+    compliance_status to be a JSON array of objects with string ids.
+    """
+    JobApplication = apps.get_model('job_application', 'JobApplication')
+    batch = []
+    for application in JobApplication.objects.only('id', 'compliance_status').iterator(chunk_size=500):
+        items = application.compliance_status if isinstance(application.compliance_status, list) else []
+        normalized = [
+            {**COMPLIANCE_ITEM_DEFAULTS, **item, 'id': str(item.get('id', ''))}
+            for item in items if isinstance(item, dict)
+        ]
+        if normalized != application.compliance_status:
+            application.compliance_status = normalized
+            batch.append(application)
+        if len(batch) >= 500:
+            JobApplication.objects.bulk_update(batch, ['compliance_status'])
+            batch = []
+    if batch:
+        JobApplication.objects.bulk_update(batch, ['compliance_status'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_application', '0006_identifier_counter_unbranched_unique'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_compliance_status, migrations.RunPython.noop),
+    ]
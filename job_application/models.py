@@ -1,15 +1,136 @@
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db import connection, models
+from django.db.models.functions import Cast, Substr
 from django.utils import timezone
 from core.models import Tenant, Branch
 from talent_engine.models import JobRequisition
+import json
 import logging
 
 logger = logging.getLogger('job_applications')
 
-class ActiveApplicationsManager(models.Manager):
+# Merges per-item patches into compliance_status inside the UPDATE itself, so the
+# new array is built from the row's current value under its row lock.
+COMPLIANCE_PATCH_SQL = """
+    UPDATE {table} SET
+        compliance_status = (
+            SELECT COALESCE(jsonb_agg(merged.elem ORDER BY merged.ord), '[]'::jsonb)
+            FROM (
+                SELECT item.elem || COALESCE(%(patches)s::jsonb -> (item.elem ->> 'id'), '{{}}'::jsonb) AS elem,
+                       item.ord
+                FROM jsonb_array_elements({table}.compliance_status) WITH ORDINALITY AS item(elem, ord)
+                UNION ALL
+                SELECT added.value || COALESCE(%(patches)s::jsonb -> added.key, '{{}}'::jsonb) AS elem,
+                       1000000 + added.ord
+                FROM jsonb_each(%(additions)s::jsonb) WITH ORDINALITY AS added(key, value, ord)
+                WHERE NOT {table}.compliance_status @> jsonb_build_array(jsonb_build_object('id', added.key))
+            ) AS merged
+        ),
+        updated_at = %(updated_at)s
+    WHERE id = %(id)s AND (
+        %(additions)s::jsonb <> '{{}}'::jsonb
+        OR EXISTS (
+            SELECT 1 FROM jsonb_array_elements({table}.compliance_status) AS item(elem)
+            WHERE %(patches)s::jsonb ? (item.elem ->> 'id')
+        )
+    )
+    RETURNING compliance_status
+"""
+
+# Applies a batch of compliance reviews across applications in one statement; the
+# reviews are grouped into one patch object per application.
+COMPLIANCE_REVIEW_SQL = """
+    WITH patches AS (
+        SELECT review.application_id, jsonb_object_agg(review.item_id, jsonb_build_object(
+            'status', review.status,
+            'notes', review.notes,
+            'checked_by', %(checked_by)s::jsonb,
+            'checked_at', CASE WHEN review.status = 'pending' THEN NULL ELSE %(checked_at)s END
+        )) AS patch
+        FROM jsonb_to_recordset(%(reviews)s::jsonb) AS review(application_id text, item_id text, status text, notes text)
+        GROUP BY review.application_id
+    )
+    UPDATE {table} AS app SET
+        compliance_status = (
+            SELECT COALESCE(jsonb_agg(item.elem || COALESCE(patches.patch -> (item.elem ->> 'id'), '{{}}'::jsonb) ORDER BY item.ord), '[]'::jsonb)
+            FROM jsonb_array_elements(app.compliance_status) WITH ORDINALITY AS item(elem, ord)
+        ),
+        updated_at = %(updated_at)s
+    FROM patches
+    WHERE app.id = patches.application_id
+        AND app.tenant_id = %(tenant_id)s
+        AND app.is_deleted = false
+        AND (%(branch_id)s::bigint IS NULL OR app.branch_id = %(branch_id)s::bigint)
+        AND EXISTS (
+            SELECT 1 FROM jsonb_array_elements(app.compliance_status) AS item(elem)
+            WHERE patches.patch ? (item.elem ->> 'id')
+        )
+    RETURNING app.id, (
+        SELECT jsonb_agg(item.elem)
+        FROM jsonb_array_elements(app.compliance_status) AS item(elem)
+        WHERE patches.patch ? (item.elem ->> 'id')
+    )
+"""
+
+class JobApplicationManager(models.Manager):
+    # Search columns are only read by the search endpoint; keep them out of regular row fetches.
+    def get_queryset(self):
+        return super().get_queryset().defer('parsed_resume_text', 'search_vector')
+
+class ActiveApplicationsManager(JobApplicationManager):
     def get_queryset(self):
         return super().get_queryset().filter(is_deleted=False)
 
+class IdentifierCounter(models.Model):
+    """
+    Last number handed out for each "<PREFIX>-<number>" id sequence, so that new
+    rows don't have to scan MAX(id). allocate() holds the counter's row lock until
+    the surrounding transaction ends, which keeps concurrent inserts distinct.
+    """
+    scope = models.CharField(primary_key=True, max_length=100)
+    last_value = models.BigIntegerField(default=0)
+
+    class Meta:
+        db_table = 'job_applications_identifier_counter'
+
+    def __str__(self):
+        return f"{self.scope}: {self.last_value}"
+
+    @classmethod
+    def allocate(cls, model, prefix, count=1):
+        """
+        Reserve `count` consecutive numbers for `model` ids starting with `prefix`
+        and return them as a range. The first allocation for a prefix seeds the
+        counter from the highest id already in the table.
+        """
+        scope = f"{model._meta.label_lower}:{prefix}"
+        table = connection.ops.quote_name(cls._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {table} SET last_value = last_value + %s WHERE scope = %s RETURNING last_value",
+                [count, scope],
+            )
+            row = cursor.fetchone()
+            if row is None:
+                seed = cls.highest_number(model, prefix)
+                cursor.execute(
+                    f"INSERT INTO {table} (scope, last_value) VALUES (%s, %s) "
+                    f"ON CONFLICT (scope) DO UPDATE SET last_value = {table}.last_value + %s RETURNING last_value",
+                    [scope, seed + count, count],
+                )
+                row = cursor.fetchone()
+        return range(row[0] - count + 1, row[0] + 1)
+
+    @staticmethod
+    def highest_number(model, prefix):
+        return model.objects.filter(id__startswith=f"{prefix}-").annotate(
+            number=Substr('id', len(prefix) + 2)
+        ).filter(number__regex=r'^[0-9]+$').aggregate(
+            highest=models.Max(Cast('number', models.BigIntegerField()))
+        )['highest'] or 0
+
+
 class JobApplication(models.Model):
     STATUS_CHOICES = [
         ('new', 'New'),
@@ -48,28 +169,52 @@ class JobApplication(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     date_of_birth = models.DateField(blank=True, null=True)
+    parsed_resume_text = models.TextField(blank=True, null=True, editable=False)
+    # Maintained by the job_applications_search_vector_update trigger (migration 0005).
+    search_vector = SearchVectorField(null=True, editable=False)
 
-    objects = models.Manager()
+    objects = JobApplicationManager()
     active_objects = ActiveApplicationsManager()
 
     class Meta:
         db_table = 'job_applications_job_application'
         unique_together = ('tenant', 'job_requisition', 'email', 'branch')
+        indexes = [
+            models.Index(fields=['tenant', 'is_deleted', '-created_at', '-id'], name='jobapp_tenant_del_created_idx'),
+            models.Index(fields=['job_requisition', 'status'], condition=models.Q(is_deleted=False), name='jobapp_active_req_status_idx'),
+            models.Index(fields=['job_requisition', '-created_at', '-id'], condition=models.Q(is_deleted=False), name='jobapp_active_req_created_idx'),
+            models.Index(fields=['job_requisition', 'email'], name='jobapp_req_email_idx'),
+            models.Index(fields=['branch', '-created_at', '-id'], condition=models.Q(is_deleted=False), name='jobapp_active_branch_idx'),
+            GinIndex(fields=['search_vector'], name='jobapp_search_vector_idx'),
+        ]
+        constraints = [
+            # unique_together treats NULL branches as distinct; public submissions have no branch.
+            models.UniqueConstraint(
+                fields=['tenant', 'job_requisition', 'email'],
+                condition=models.Q(branch__isnull=True, is_deleted=False),
+                name='unique_unbranched_application_per_email'
+            )
+        ]
 
     def __str__(self):
         return f"{self.full_name} - {self.job_requisition.title} ({self.tenant.name})"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Column values as loaded, for the cache invalidation in job_application.signals.
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
     def save(self, *args, **kwargs):
         is_new = not self.pk
         if not self.id:
             prefix = self.tenant.name[:3].upper()
-            latest = JobApplication.objects.filter(id__startswith=prefix).aggregate(models.Max('id'))['id__max']
-            number = int(latest.split('-')[1]) + 1 if latest else 1
+            [number] = IdentifierCounter.allocate(JobApplication, prefix)
             self.id = f"{prefix}-{number:04d}"
         super().save(*args, **kwargs)
         if is_new:
-            self.job_requisition.num_of_applications += 1
-            self.job_requisition.save()
+            JobRequisition.adjust_application_counts({self.job_requisition_id: 1})
 
     # def soft_delete(self):
     #     self.is_deleted = True
@@ -78,11 +223,8 @@ class JobApplication(models.Model):
     def soft_delete(self):
         if not self.is_deleted:
             self.is_deleted = True
-            self.save()
-            if self.job_requisition.num_of_applications > 0:
-                self.job_requisition.num_of_applications -= 1
-            # self.job_requisition.num_of_applications -= 1
-            self.job_requisition.save()
+            self.save(update_fields=['is_deleted', 'updated_at'])
+            JobRequisition.adjust_application_counts({self.job_requisition_id: -1})
             logger.info(f"JobApplication {self.id} soft-deleted for tenant {self.tenant.schema_name}")
 
 
@@ -95,41 +237,98 @@ class JobApplication(models.Model):
     def restore(self):
         if self.is_deleted:
             self.is_deleted = False
-            self.save()
-            self.job_requisition.num_of_applications += 1
-            self.job_requisition.save()
+            self.save(update_fields=['is_deleted', 'updated_at'])
+            JobRequisition.adjust_application_counts({self.job_requisition_id: 1})
             logger.info(f"JobApplication {self.id} restored for tenant {self.tenant.schema_name}")
 
 
+    @staticmethod
+    def build_compliance_status(job_requisition):
+        return [
+            {
+                "id": str(item["id"]),
+                "name": item["name"],
+                "description": item["description"],
+                "required": item["required"],
+                "status": "pending",
+                "checked_by": None,
+                "checked_at": None,
+                "notes": ""
+            } for item in job_requisition.compliance_checklist
+        ]
+
     def initialize_compliance_status(self, job_requisition):
         if not self.compliance_status:
-            self.compliance_status = [
-                {
-                    "id": str(item["id"]),
-                    "name": item["name"],
-                    "description": item["description"],
-                    "required": item["required"],
-                    "status": "pending",
-                    "checked_by": None,
-                    "checked_at": None,
-                    "notes": ""
-                } for item in job_requisition.compliance_checklist
-            ]
-            self.save()
+            self.compliance_status = self.build_compliance_status(job_requisition)
+            self.save(update_fields=['compliance_status', 'updated_at'])
             logger.info(f"Initialized compliance status for application {self.id}")
 
+    def patch_compliance_items(self, patches, additions=None):
+        """
+        Merge `patches` ({item_id: {key: value}}) into the matching compliance_status
+        items with one UPDATE that touches only compliance_status and updated_at.
+        `additions` ({item_id: item}) are appended when no item has that id yet.
+        Concurrent patches to different items of the same application both apply.
+        Returns the patched and added items keyed by id.
+        """
+        patches = {str(item_id): changes for item_id, changes in patches.items()}
+        additions = {str(item_id): item for item_id, item in (additions or {}).items()}
+        updated_at = timezone.now()
+        with connection.cursor() as cursor:
+            cursor.execute(COMPLIANCE_PATCH_SQL.format(table=connection.ops.quote_name(self._meta.db_table)), {
+                'id': self.pk,
+                'patches': json.dumps(patches),
+                'additions': json.dumps(additions),
+                'updated_at': updated_at,
+            })
+            row = cursor.fetchone()
+        if row is None:
+            return {}
+        self.compliance_status = json.loads(row[0]) if isinstance(row[0], str) else row[0]
+        self.updated_at = updated_at
+        touched = set(patches) | set(additions)
+        return {str(item['id']): item for item in self.compliance_status if str(item.get('id')) in touched}
+
+    @classmethod
+    def review_compliance_items(cls, tenant, reviews, checked_by, branch_id=None):
+        """
+        Apply `reviews` (dicts of application_id, item_id, status, notes) across any
+        number of active applications of `tenant` with a single UPDATE, restricted
+        to `branch_id` when given. Only compliance_status and updated_at are written.
+        Returns {(application_id, item_id): item} for the reviews that matched.
+        """
+        checked_at = timezone.now()
+        with connection.cursor() as cursor:
+            cursor.execute(COMPLIANCE_REVIEW_SQL.format(table=connection.ops.quote_name(cls._meta.db_table)), {
+                'reviews': json.dumps([
+                    {**review, 'application_id': str(review['application_id']), 'item_id': str(review['item_id'])}
+                    for review in reviews
+                ]),
+                'checked_by': json.dumps(checked_by.id if checked_by else None),
+                'checked_at': checked_at.isoformat(),
+                'updated_at': checked_at,
+                'tenant_id': tenant.id,
+                'branch_id': branch_id,
+            })
+            rows = cursor.fetchall()
+        updated = {}
+        for application_id, items in rows:
+            for item in (json.loads(items) if isinstance(items, str) else items) or []:
+                updated[(application_id, str(item['id']))] = item
+        return updated
+
     def update_compliance_status(self, item_id, status, checked_by=None, notes=""):
-        for item in self.compliance_status:
-            if str(item["id"]) == str(item_id):
-                item["status"] = status
-                item["checked_by"] = checked_by.id if checked_by else None
-                item["checked_at"] = timezone.now().isoformat() if status != "pending" else None
-                item["notes"] = notes
-                self.save()
-                logger.info(f"Updated compliance status for item {item_id} in application {self.id}")
-                return item
-        logger.warning(f"Compliance item {item_id} not found in application {self.id}")
-        raise ValueError("Compliance item not found")
+        updated = self.patch_compliance_items({item_id: {
+            "status": status,
+            "checked_by": checked_by.id if checked_by else None,
+            "checked_at": timezone.now().isoformat() if status != "pending" else None,
+            "notes": notes,
+        }})
+        if str(item_id) not in updated:
+            logger.warning(f"Compliance item {item_id} not found in application {self.id}")
+            raise ValueError("Compliance item not found")
+        logger.info(f"Updated compliance status for item {item_id} in application {self.id}")
+        return updated[str(item_id)]
 
 
 
@@ -178,6 +377,12 @@ class Schedule(models.Model):
     class Meta:
         db_table = 'job_applications_schedule'
         unique_together = ('tenant', 'job_application', 'interview_start_date_time', 'branch')
+        indexes = [
+            models.Index(fields=['tenant', 'is_deleted', '-created_at', '-id'], name='sched_tenant_del_created_idx'),
+            models.Index(fields=['status', 'is_deleted'], name='sched_status_del_idx'),
+            models.Index(fields=['job_application'], condition=models.Q(is_deleted=False), name='sched_active_app_idx'),
+            models.Index(fields=['branch', '-created_at', '-id'], condition=models.Q(is_deleted=False), name='sched_active_branch_idx'),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=['job_application'],
@@ -191,12 +396,19 @@ class Schedule(models.Model):
 
     def save(self, *args, **kwargs):
         if not self.id:
-            prefix = self.tenant.name[:3].upper()
-            latest = Schedule.objects.filter(id__startswith=prefix).aggregate(models.Max('id'))['id__max']
-            number = int(latest.split('-')[1]) + 1 if latest else 1
-            self.id = f"{prefix}-{number:04d}"
+            [self.id] = Schedule.allocate_ids(self.tenant, 1)
         super().save(*args, **kwargs)
 
+    @classmethod
+    def allocate_ids(cls, tenant, count):
+        """
+        Reserve `count` consecutive "<PREFIX>-<number>" ids for new schedules in one
+        counter update (see IdentifierCounter). Call inside the transaction that
+        inserts them.
+        """
+        prefix = tenant.name[:3].upper()
+        return [f"{prefix}-{number:04d}" for number in IdentifierCounter.allocate(Schedule, prefix, count)]
+
     def soft_delete(self):
         self.is_deleted = True
         self.save()
@@ -5,11 +5,16 @@ from django.conf import settings
 from django.utils import timezone
 from django.core.validators import URLValidator
 from rest_framework import serializers
+from .document_storage import (
+    ALLOWED_DOCUMENT_TYPES, MAX_DOCUMENT_SIZE, finalize_document_upload, upload_application_documents
+)
 from .models import JobApplication, Schedule
 import logging
 from lumina_care.supabase_client import supabase
 import mimetypes
 import io
+from collections.abc import Mapping
+from rest_framework.fields import empty
 
 logger = logging.getLogger('job_applications')
 
@@ -18,7 +23,9 @@ logger = logging.getLogger('job_applications')
 
 class DocumentSerializer(serializers.Serializer):
     document_type = serializers.CharField(max_length=50)
-    file = serializers.FileField(write_only=True)
+    file = serializers.FileField(write_only=True, required=False)
+    # Alternative to `file`: the token from an upload intent the client uploaded to directly.
+    upload_token = serializers.CharField(write_only=True, required=False)
     file_url = serializers.SerializerMethodField(read_only=True)
     uploaded_at = serializers.DateTimeField(read_only=True, default=timezone.now)
 
@@ -29,19 +36,24 @@ class DocumentSerializer(serializers.Serializer):
         return None
 
     def validate_file(self, value):
-        allowed_types = [
-            'application/pdf',
-            'application/msword',
-            'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
-        ]
-        if value.content_type not in allowed_types:
+        if value.content_type not in ALLOWED_DOCUMENT_TYPES:
             raise serializers.ValidationError(
                 f"Invalid file type: {value.content_type}. Only PDF and Word (.doc, .docx) files are allowed."
             )
-        max_size = 50 * 1024 * 1024
-        if value.size > max_size:
+        if value.size > MAX_DOCUMENT_SIZE:
             raise serializers.ValidationError(f"File size exceeds 50 MB limit.")
         return value
+
+    def validate(self, data):
+        if ('file' in data) == ('upload_token' in data):
+            raise serializers.ValidationError("Provide either a file or an upload_token.")
+        if 'upload_token' in data:
+            try:
+                # Replace the token with the stored document entry once the object checks out.
+                return finalize_document_upload(data['upload_token'], self.context.get('job_requisition'), data['document_type'])
+            except ValueError as e:
+                raise serializers.ValidationError({'upload_token': str(e)})
+        return data
     
     def validate_document_type(self, value):
         job_requisition = self.context.get('job_requisition')
@@ -84,6 +96,16 @@ class DocumentSerializer(serializers.Serializer):
     #     return value
 
 
+class DocumentUploadIntentSerializer(serializers.Serializer):
+    unique_link = serializers.CharField()
+    document_type = serializers.CharField(max_length=50)
+    filename = serializers.CharField(max_length=255)
+    content_type = serializers.ChoiceField(choices=ALLOWED_DOCUMENT_TYPES)
+    size = serializers.IntegerField(min_value=1, max_value=MAX_DOCUMENT_SIZE)
+
+    validate_document_type = DocumentSerializer.validate_document_type
+
+
 class ComplianceDocumentSerializer(serializers.Serializer):
     file_url = serializers.CharField(allow_blank=True, required=False, allow_null=True)
     uploaded_at = serializers.DateTimeField(allow_null=True, required=False)
@@ -101,6 +123,17 @@ class ComplianceStatusSerializer(serializers.Serializer):
     document = ComplianceDocumentSerializer(required=False, allow_null=True)
 
 
+class ComplianceReviewSerializer(serializers.Serializer):
+    application_id = serializers.CharField(max_length=20)
+    item_id = serializers.CharField()
+    status = serializers.ChoiceField(choices=['pending', 'passed', 'failed'])
+    notes = serializers.CharField(allow_blank=True, required=False, default='')
+
+
+class ComplianceReviewBatchSerializer(serializers.Serializer):
+    reviews = ComplianceReviewSerializer(many=True, allow_empty=False, max_length=1000)
+
+
 class JobApplicationSerializer(serializers.ModelSerializer):
     documents = DocumentSerializer(many=True, required=False)
     job_requisition_id = serializers.CharField(source='job_requisition.id', read_only=True)
@@ -110,6 +143,13 @@ class JobApplicationSerializer(serializers.ModelSerializer):
 
     branch = serializers.SlugRelatedField(slug_field='name', read_only=True, allow_null=True)
 
+    # Fields returned for ?view=summary, see lumina_care.sparse_fields.
+    summary_fields = (
+        'id', 'tenant', 'branch', 'job_requisition', 'job_requisition_id', 'job_requisition_title',
+        'full_name', 'email', 'phone', 'screening_score', 'resume_status', 'status', 'source',
+        'interview_location', 'is_deleted', 'applied_at', 'created_at', 'updated_at'
+    )
+
     class Meta:
         model = JobApplication
         fields = [
@@ -165,34 +205,13 @@ class JobApplicationSerializer(serializers.ModelSerializer):
             validated_data['branch'] = user.branch
         logger.debug(f"Creating application for tenant: {tenant.schema_name}, job_requisition: {validated_data['job_requisition'].title}")
 
-        documents = []
-        #FOR SUPERBASE FILE HANDLING
-        for doc_data in documents_data:
-            file = doc_data['file']
-            file_ext = os.path.splitext(file.name)[1]
-            filename = f"{uuid.uuid4()}{file_ext}"
-            folder_path = f"application_documents/{timezone.now().strftime('%Y/%m/%d')}"
-            path = f"{folder_path}/{filename}"
-            content_type = mimetypes.guess_type(file.name)[0]
-
-            # Upload to Supabase
-            supabase.storage.from_(settings.SUPABASE_BUCKET).upload(
-                path, file.read(), {"content-type": content_type or 'application/octet-stream'}
-            )
-            file_url = supabase.storage.from_(settings.SUPABASE_BUCKET).get_public_url(path)
-
-            documents.append({
-                'document_type': doc_data['document_type'],
-                'file_path': path,
-                'file_url': file_url,
-                'uploaded_at': timezone.now().isoformat()
-            })
-        #FOR SUPERBASE FILE HANDLING
-
-        validated_data['documents'] = documents
-        logger.debug(f"Documents to be saved: {documents}")
+        # Documents arrive already uploaded when the view stores them ahead of the transaction.
+        if any('file' in doc for doc in documents_data):
+            documents_data = upload_application_documents(documents_data)
+        validated_data['documents'] = documents_data
+        validated_data['compliance_status'] = JobApplication.build_compliance_status(validated_data['job_requisition'])
+        logger.debug(f"Documents to be saved: {documents_data}")
         application = JobApplication.objects.create(**validated_data)
-        application.initialize_compliance_status(validated_data['job_requisition'])
         logger.info(f"Application created: {application.id} for {application.full_name}")
         return application
 
@@ -281,26 +300,34 @@ class JobApplicationSerializer(serializers.ModelSerializer):
         if compliance_status is not None:
             validated_data['compliance_status'] = compliance_status
 
-        return super().update(instance, validated_data)
+        # Write only the submitted columns rather than the whole row.
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        instance.save(update_fields=[*validated_data, 'updated_at'])
+        return instance
 
 #FOR SUPERBASE FILE HANDLING
 
+    @staticmethod
+    def normalize_compliance_status(items):
+        return [
+            {
+                'id': item.get('id', ''),
+                'name': item.get('name', ''),
+                'description': item.get('description', ''),
+                'required': item.get('required', False),
+                'status': item.get('status', 'pending'),
+                'checked_by': item.get('checked_by', None),
+                'checked_at': item.get('checked_at', None),
+                'notes': item.get('notes', ''),
+                'document': item.get('document', {'file_url': '', 'uploaded_at': ''})
+            } for item in items
+        ]
+
     def to_representation(self, instance):
         data = super().to_representation(instance)
         if 'compliance_status' in data:
-            data['compliance_status'] = [
-                {
-                    'id': item.get('id', ''),
-                    'name': item.get('name', ''),
-                    'description': item.get('description', ''),
-                    'required': item.get('required', False),
-                    'status': item.get('status', 'pending'),
-                    'checked_by': item.get('checked_by', None),
-                    'checked_at': item.get('checked_at', None),
-                    'notes': item.get('notes', ''),
-                    'document': item.get('document', {'file_url': '', 'uploaded_at': ''})
-                } for item in data['compliance_status']
-            ]
+            data['compliance_status'] = self.normalize_compliance_status(data['compliance_status'])
         return data
 
 
@@ -312,6 +339,13 @@ class ScheduleSerializer(serializers.ModelSerializer):
     job_requisition_title = serializers.CharField(source='job_application.job_requisition.title', read_only=True)
     branch = serializers.SlugRelatedField(slug_field='name', read_only=True, allow_null=True)
 
+    # Fields returned for ?view=summary, see lumina_care.sparse_fields.
+    summary_fields = (
+        'id', 'branch', 'job_application', 'job_application_id', 'candidate_name', 'job_requisition_title',
+        'interview_start_date_time', 'interview_end_date_time', 'meeting_mode', 'timezone', 'status',
+        'is_deleted', 'created_at', 'updated_at'
+    )
+
     class Meta:
         model = Schedule
         fields = [
@@ -338,6 +372,12 @@ class ScheduleSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Job application is required.")
         if job_application.status != 'shortlisted':
             raise serializers.ValidationError("Schedules can only be created for shortlisted applicants.")
+        return self.validate_schedule_details(data)
+
+    def validate_schedule_details(self, data):
+        """
+        Checks that don't depend on the job application, shared with ScheduleBulkCreateSerializer.
+        """
         if data.get('meeting_mode') == 'Virtual' and not data.get('meeting_link'):
             raise serializers.ValidationError("Meeting link is required for virtual interviews.")
         if data.get('meeting_mode') == 'Virtual' and data.get('meeting_link'):
@@ -374,6 +414,125 @@ class ScheduleSerializer(serializers.ModelSerializer):
         if validated_data.get('status') != 'cancelled':
             validated_data['cancellation_reason'] = None
         return super().update(instance, validated_data)
-    
 
 
+class ScheduleBulkCreateSerializer(ScheduleSerializer):
+    """
+    One set of interview details for up to 1000 job applications. The details are
+    validated once; each application is checked by ScheduleBulkCreateView.
+    """
+    job_applications = serializers.ListField(
+        child=serializers.CharField(max_length=20), allow_empty=False, max_length=1000
+    )
+
+    class Meta(ScheduleSerializer.Meta):
+        fields = [
+            'job_applications', 'interview_start_date_time', 'interview_end_date_time', 'meeting_mode',
+            'meeting_link', 'interview_address', 'message', 'timezone',
+        ]
+        read_only_fields = []
+
+    def validate(self, data):
+        return self.validate_schedule_details(data)
+
+
+
+_MISSING = object()
+
+
+def _compile_item_serializer(serializer):
+    """
+    Build a function that renders one dict-like item exactly as
+    `serializer.to_representation` would, resolving DRF's per-field lookup rules
+    (defaults, allow_null, skipped optional fields) once instead of per row.
+    """
+    steps = []
+    for field in serializer._readable_fields:
+        if isinstance(field, serializers.SerializerMethodField):
+            steps.append((field.field_name, None, field, field.to_representation))
+            continue
+        if isinstance(field, serializers.ListSerializer):
+            child = _compile_item_serializer(field.child)
+            render = lambda value, child=child: [child(item) for item in value]
+        elif isinstance(field, serializers.BaseSerializer):
+            render = _compile_item_serializer(field)
+        else:
+            render = field.to_representation
+        steps.append((field.field_name, field.source_attrs, field, render))
+
+    def render_item(item):
+        data = {}
+        for name, source_attrs, field, render in steps:
+            if source_attrs is None:
+                data[name] = render(item)
+                continue
+            value = item
+            for attr in source_attrs:
+                value = value.get(attr, _MISSING) if isinstance(value, Mapping) else getattr(value, attr, _MISSING)
+                if value is _MISSING:
+                    break
+            if value is _MISSING:
+                if field.default is not empty:
+                    value = field.get_default()
+                elif field.allow_null:
+                    value = None
+                elif not field.required:
+                    continue
+                else:
+                    raise KeyError(f"{name} missing on {type(item).__name__}")
+            data[name] = None if value is None else render(value)
+        return data
+
+    return render_item
+
+
+class JobApplicationFastSerializer:
+    """
+    Read-only, values()-based equivalent of JobApplicationSerializer(many=True) for
+    large list responses. Column lookups and per-field mappers are derived from
+    JobApplicationSerializer itself, so the output matches it byte for byte.
+    """
+    serializer_class = JobApplicationSerializer
+
+    def __init__(self, fields=None):
+        serializer = self.serializer_class()
+        model = serializer.Meta.model
+        self.columns = []
+        for field in serializer._readable_fields:
+            if fields is not None and field.field_name not in fields:
+                continue
+            if isinstance(field, serializers.PrimaryKeyRelatedField):
+                lookup = model._meta.get_field(field.source).attname
+                render = None
+            elif isinstance(field, serializers.SlugRelatedField):
+                lookup = '__'.join(field.source_attrs + [field.slug_field])
+                render = None
+            elif isinstance(field, serializers.ListSerializer):
+                child = _compile_item_serializer(field.child)
+                lookup = field.source
+                render = lambda value, child=child: [child(item) for item in value]
+            else:
+                lookup = '__'.join(field.source_attrs)
+                render = field.to_representation
+            self.columns.append((field.field_name, lookup, render))
+        self.lookups = list(dict.fromkeys(lookup for _, lookup, _ in self.columns))
+        self.field_names = [name for name, _, _ in self.columns]
+
+    def values(self, queryset, *key_fields):
+        """
+        `key_fields` are fetched alongside the serialized columns, e.g. for pagination cursors.
+        """
+        lookups = list(dict.fromkeys([*self.lookups, *key_fields]))
+        return queryset.select_related(None).prefetch_related(None).values(*lookups)
+
+    def to_representation(self, row):
+        data = {}
+        for name, lookup, render in self.columns:
+            value = row[lookup]
+            data[name] = value if value is None or render is None else render(value)
+        if 'compliance_status' in data:
+            data['compliance_status'] = self.serializer_class.normalize_compliance_status(data['compliance_status'])
+        return data
+
+    def serialize(self, rows):
+        return [self.to_representation(row) for row in rows]
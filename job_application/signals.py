@@ -0,0 +1,38 @@
+# job_application/signals.py
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from core.utils.cache_keys import APPLICATION_FACETS, PUBLIC_JOB_FEED, bump_tenant_cache
+from .facets import FACET_FIELDS
+from .models import JobApplication
+
+FEED_FIELDS = ('status', 'is_deleted')
+
+
+def _changed(instance, attnames):
+    """
+    Whether any of `attnames` differs from what JobApplication.from_db loaded.
+    Values are read straight from __dict__, so deferred columns are never fetched;
+    a column that was neither loaded nor assigned counts as unchanged.
+    """
+    loaded = getattr(instance, '_loaded_values', None)
+    if loaded is None:
+        return True
+    return any(instance.__dict__.get(attname) != loaded.get(attname) for attname in attnames)
+
+
+@receiver(post_save, sender=JobApplication)
+def invalidate_application_caches(sender, instance, created, **kwargs):
+    # The public feed only shows shortlisted counts, so other edits leave it valid.
+    if created:
+        feed_changed = instance.status == 'shortlisted'
+    else:
+        feed_changed = _changed(instance, FEED_FIELDS)
+    facets_changed = created or _changed(instance, FACET_FIELDS)
+    instance._loaded_values = {
+        attname: instance.__dict__[attname] for attname in {*FEED_FIELDS, *FACET_FIELDS} if attname in instance.__dict__
+    }
+    if feed_changed:
+        bump_tenant_cache(PUBLIC_JOB_FEED, instance.tenant.schema_name)
+    if facets_changed:
+        bump_tenant_cache(APPLICATION_FACETS, instance.tenant.schema_name)
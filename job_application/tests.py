@@ -1,3 +1,955 @@
-from django.test import TestCase
+import csv
+import importlib
+import io
+import json
+import os
+import tempfile
+from datetime import timedelta
 
-# Create your tests here.
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.models import Branch, OutboundEmail, TenantConfig
+from core.utils.cache_keys import EMAIL_TEMPLATES, PUBLIC_JOB_FEED, bump_tenant_cache, tenant_cache_version
+from core.utils.testing import TenantTestCase
+from talent_engine.models import JobRequisition
+from users.models import CustomUser
+from .models import JobApplication, Schedule
+from .serializers import JobApplicationFastSerializer, JobApplicationSerializer
+from .views import (
+    ApplicationDocumentLocalUploadView, ComplianceReviewBatchView, DocumentUploadIntentView,
+    JobApplicationBulkDeleteView, JobApplicationExportView, JobApplicationFacetsView, JobApplicationListCreateView,
+    JobApplicationSearchView, PermanentDeleteJobApplicationsView, PublishedJobRequisitionsWithShortlistedApplicationsView,
+    PublishedPublicJobRequisitionsWithShortlistedApplicationsView, RecoverSoftDeletedJobApplicationsView, ScheduleBulkCreateView, ScheduleExportView, ScheduleListCreateView,
+)
+
+
+class QueryPlanTests(TenantTestCase):
+    """
+    Runs EXPLAIN on the querysets behind the main list/lookup views and fails when
+    the planner has to fall back to a sequential scan. Sequential scans are
+    disabled for the session so any access path without a usable index shows up
+    as `Seq Scan` regardless of how small the seeded tables are.
+    """
+
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.name = 'Plan Test'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.branch = Branch.objects.create(tenant=cls.tenant, name='Head Office')
+        now = timezone.now()
+        requisitions = JobRequisition.objects.bulk_create([
+            JobRequisition(
+                id=f"PLA-{index:04d}", tenant=cls.tenant, branch=cls.branch, title=f"Role {index}",
+                unique_link=f"plan-test-{index}", job_application_code=f"PLA-JA-{index:04d}",
+                status='open' if index % 2 else 'closed', publish_status=bool(index % 2),
+                deadline_date=(now + timedelta(days=index - 10)).date(), is_deleted=index % 7 == 0,
+            )
+            for index in range(1, 41)
+        ])
+        cls.requisition = requisitions[0]
+        applications = JobApplication.objects.bulk_create([
+            JobApplication(
+                id=f"PLA-{index:05d}", tenant=cls.tenant, branch=cls.branch if index % 3 else None,
+                job_requisition=requisitions[index % len(requisitions)], full_name=f"Applicant {index}",
+                email=f"applicant{index}@example.com", phone='000', qualification='-', experience='-',
+                status='shortlisted' if index % 5 == 0 else 'new', is_deleted=index % 11 == 0,
+            )
+            for index in range(1, 801)
+        ])
+        Schedule.objects.bulk_create([
+            Schedule(
+                id=f"PLA-{index:05d}", tenant=cls.tenant, branch=application.branch, job_application=application,
+                interview_start_date_time=now + timedelta(days=index % 30), meeting_mode='Virtual',
+                status='scheduled' if index % 4 else 'completed', is_deleted=index % 13 == 0,
+            )
+            for index, application in enumerate(applications[::2], start=1)
+        ])
+        with connection.cursor() as cursor:
+            for model in (JobRequisition, JobApplication, Schedule):
+                cursor.execute(f"ANALYZE {connection.ops.quote_name(model._meta.db_table)}")
+
+    def setUp(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SET enable_seqscan = off")
+
+    def tearDown(self):
+        with connection.cursor() as cursor:
+            cursor.execute("RESET enable_seqscan")
+
+    def assertNoSeqScan(self, queryset):
+        plan = queryset.explain()
+        self.assertNotIn('Seq Scan', plan, f"Sequential scan in plan for:\n{queryset.query}\n\n{plan}")
+
+    def test_application_list_plans(self):
+        active = JobApplication.active_objects.filter(tenant=self.tenant)
+        self.assertNoSeqScan(active.order_by('-created_at', '-id')[:51])
+        self.assertNoSeqScan(active.filter(branch=self.branch).order_by('-created_at', '-id')[:51])
+        self.assertNoSeqScan(
+            JobApplication.objects.filter(tenant=self.tenant, is_deleted=True).order_by('-created_at', '-id')[:51]
+        )
+
+    def test_application_by_requisition_plans(self):
+        active = JobApplication.active_objects.filter(job_requisition=self.requisition)
+        self.assertNoSeqScan(active.filter(tenant=self.tenant).order_by('-created_at', '-id')[:51])
+        self.assertNoSeqScan(active.filter(status='shortlisted'))
+
+    def test_application_lookup_by_code_and_email_plan(self):
+        self.assertNoSeqScan(JobApplication.objects.filter(
+            job_requisition__job_application_code=self.requisition.job_application_code,
+            email='applicant40@example.com',
+        ))
+
+    def test_schedule_plans(self):
+        active = Schedule.active_objects.filter(tenant=self.tenant)
+        self.assertNoSeqScan(active.order_by('-created_at', '-id')[:51])
+        self.assertNoSeqScan(Schedule.objects.filter(status='scheduled', is_deleted=False))
+        self.assertNoSeqScan(active.filter(branch=self.branch).order_by('-created_at', '-id')[:51])
+        self.assertNoSeqScan(Schedule.active_objects.filter(job_application_id__in=['PLA-00005', 'PLA-00010']))
+
+    def test_requisition_plans(self):
+        active = JobRequisition.active_objects.filter(tenant=self.tenant)
+        self.assertNoSeqScan(active.order_by('-created_at', '-id')[:51])
+        self.assertNoSeqScan(active.filter(publish_status=True, status='open'))
+        self.assertNoSeqScan(JobRequisition.active_objects.filter(branch=self.branch).order_by('-created_at', '-id')[:51])
+        self.assertNoSeqScan(
+            JobRequisition.active_objects.filter(status='open', deadline_date__lt=timezone.now().date())
+        )
+
+
+class ShortlistedRequisitionsQueryCountTests(TenantTestCase):
+    """
+    PublishedJobRequisitionsWithShortlistedApplicationsView must issue the same
+    number of queries however many requisitions, applications and schedules exist.
+    """
+
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.name = 'Count Test'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create(email='admin@count-test.example.com', role='admin', tenant=cls.tenant)
+
+    def seed(self, start, requisitions, shortlisted_per_requisition):
+        now = timezone.now()
+        for index in range(start, start + requisitions):
+            requisition = JobRequisition.objects.create(
+                id=f"COU-{index:04d}", tenant=self.tenant, title=f"Role {index}",
+                unique_link=f"count-test-{index}", publish_status=True, status='open',
+            )
+            applications = JobApplication.objects.bulk_create([
+                JobApplication(
+                    id=f"COU-{index:04d}{number:02d}", tenant=self.tenant, job_requisition=requisition,
+                    full_name=f"Applicant {number}", email=f"applicant{index}-{number}@example.com",
+                    phone='000', qualification='-', experience='-',
+                    status='shortlisted' if number < shortlisted_per_requisition else 'new',
+                )
+                for number in range(shortlisted_per_requisition + 2)
+            ])
+            Schedule.objects.bulk_create([
+                Schedule(
+                    id=f"COU-{index:04d}{number:02d}", tenant=self.tenant, job_application=application,
+                    interview_start_date_time=now + timedelta(days=1), meeting_mode='Virtual',
+                )
+                for number, application in enumerate(applications[:shortlisted_per_requisition])
+            ])
+
+    def count_queries(self):
+        request = APIRequestFactory().get('/api/talent-engine-job-applications/published-requisitions-with-shortlisted/')
+        request.tenant = self.tenant
+        force_authenticate(request, user=self.user)
+        with CaptureQueriesContext(connection) as context:
+            response = PublishedJobRequisitionsWithShortlistedApplicationsView.as_view()(request)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries), response.data
+
+    def test_query_count_is_constant(self):
+        self.seed(1, requisitions=2, shortlisted_per_requisition=2)
+        small_count, small_data = self.count_queries()
+
+        self.seed(3, requisitions=8, shortlisted_per_requisition=5)
+        large_count, large_data = self.count_queries()
+
+        self.assertEqual(len(small_data), 2)
+        self.assertEqual(len(large_data), 10)
+        self.assertEqual(small_count, large_count)
+        self.assertLessEqual(large_count, 8)
+
+    def test_counts_and_schedules(self):
+        self.seed(1, requisitions=1, shortlisted_per_requisition=3)
+        _, data = self.count_queries()
+        [entry] = data
+        self.assertEqual(entry['shortlisted_count'], 3)
+        self.assertEqual(entry['total_applications'], 5)
+        self.assertEqual(len(entry['shortlisted_applications']), 3)
+        for application in entry['shortlisted_applications']:
+            self.assertTrue(application['scheduled'])
+            self.assertEqual(len(application['schedules']), 1)
+            self.assertEqual(application['schedules'][0]['job_application_id'], application['id'])
+
+
+class FastSerializerParityTests(TenantTestCase):
+    """
+    JobApplicationFastSerializer must render exactly the same JSON as
+    JobApplicationSerializer for every shape of row the list endpoints return.
+    """
+
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.name = 'Parity Test'
+
+    @classmethod
+    def setUpTestData(cls):
+        branch = Branch.objects.create(tenant=cls.tenant, name='Head Office')
+        requisition = JobRequisition.objects.create(
+            id='PAR-0001', tenant=cls.tenant, title='Care Assistant', unique_link='parity-test-1',
+        )
+        uploaded_at = timezone.now().isoformat()
+        JobApplication.objects.create(
+            id='PAR-00001', tenant=cls.tenant, branch=branch, job_requisition=requisition,
+            full_name='Full Record', email='full@example.com', phone='000', qualification='BSc',
+            experience='3 years', date_of_birth=timezone.now().date(), screening_score=71.5,
+            documents=[
+                {'document_type': 'resume', 'file_url': 'https://files.example.com/a.pdf', 'uploaded_at': uploaded_at},
+                {'document_type': 'cover_letter', 'uploaded_at': uploaded_at},
+            ],
+            compliance_status=[
+                {'id': 'dbs', 'name': 'DBS', 'required': True, 'status': 'completed', 'checked_by': 'admin',
+                 'checked_at': uploaded_at, 'document': {'file_url': 'https://files.example.com/dbs.pdf',
+                                                         'uploaded_at': uploaded_at}},
+                {'name': 'Right to work'},
+            ],
+        )
+        JobApplication.objects.create(
+            id='PAR-00002', tenant=cls.tenant, job_requisition=requisition, full_name='Sparse Record',
+            email='sparse@example.com', phone='000', qualification='-', experience='-',
+        )
+
+    def test_output_matches_model_serializer(self):
+        queryset = JobApplication.objects.filter(tenant=self.tenant).select_related(
+            'branch', 'job_requisition', 'tenant'
+        ).order_by('id')
+        fast_serializer = JobApplicationFastSerializer()
+        renderer = JSONRenderer()
+        expected = renderer.render(JobApplicationSerializer(queryset, many=True).data)
+        actual = renderer.render(fast_serializer.serialize(fast_serializer.values(queryset)))
+        self.assertEqual(actual, expected)
+
+
+class ListEndpointFixtures:
+    """
+    One requisition, application and schedule, plus helpers that add more
+    schedules and call a list view.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create(email='admin@sparse-test.example.com', role='admin', tenant=cls.tenant)
+        requisition = JobRequisition.objects.create(
+            id='SPA-0001', tenant=cls.tenant, title='Care Assistant', unique_link='sparse-test-1',
+        )
+        application = JobApplication.objects.create(
+            id='SPA-00001', tenant=cls.tenant, job_requisition=requisition, full_name='Applicant',
+            email='applicant@example.com', phone='000', qualification='-', experience='-',
+            status='shortlisted', cover_letter='A long cover letter',
+        )
+        Schedule.objects.create(
+            id='SPA-00001', tenant=cls.tenant, job_application=application,
+            interview_start_date_time=timezone.now() + timedelta(days=1), meeting_mode='Virtual',
+            meeting_link='https://meet.example.com/x', message='A long message',
+        )
+
+    def add_schedules(self, count):
+        requisition = JobRequisition.objects.get(pk='SPA-0001')
+        for index in range(2, count + 2):
+            application = JobApplication.objects.create(
+                id=f'SPA-{index:05d}', tenant=self.tenant, job_requisition=requisition, full_name=f'Applicant {index}',
+                email=f'applicant{index}@example.com', phone='000', qualification='-', experience='-',
+            )
+            Schedule.objects.create(
+                id=f'SPA-{index:05d}', tenant=self.tenant, job_application=application,
+                interview_start_date_time=timezone.now() + timedelta(days=index), meeting_mode='Virtual',
+            )
+
+    def get(self, view, path):
+        request = APIRequestFactory().get(path)
+        request.tenant = self.tenant
+        force_authenticate(request, user=self.user)
+        with CaptureQueriesContext(connection) as context:
+            response = view.as_view()(request)
+        sql = '\n'.join(query['sql'] for query in context.captured_queries)
+        return response, sql
+
+
+class EagerLoadingTests(ListEndpointFixtures, TenantTestCase):
+    """
+    List responses issue the same queries however many rows they serialize.
+    """
+
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.name = 'Eager Test'
+
+    def test_schedule_list_query_count_is_constant(self):
+        response, sql = self.get(ScheduleListCreateView, '/api/schedules/')
+        self.assertEqual(response.status_code, 200)
+        queries = sql.count('SELECT')
+        self.assertIn('"talent_engine_job_requisition"', sql)
+
+        self.add_schedules(3)
+        response, sql = self.get(ScheduleListCreateView, '/api/schedules/')
+        self.assertEqual(len(response.data['results']), 4)
+        self.assertEqual(sql.count('SELECT'), queries)
+
+
+class SparseFieldsetTests(ListEndpointFixtures, TenantTestCase):
+    """
+    `?view=summary` / `?fields=` must trim both the payload and the columns read.
+    """
+
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.name = 'Sparse Test'
+
+    def test_application_summary(self):
+        response, sql = self.get(JobApplicationListCreateView, '/api/applications/?view=summary')
+        self.assertEqual(response.status_code, 200)
+        [row] = response.data['results']
+        self.assertEqual(list(row), list(JobApplicationSerializer.summary_fields))
+        for column in ('documents', 'compliance_status', 'employment_gaps', 'cover_letter'):
+            self.assertNotIn(f'"{column}"', sql)
+
+    def test_schedule_fields(self):
+        response, sql = self.get(ScheduleListCreateView, '/api/schedules/?fields=id,status,candidate_name')
+        self.assertEqual(response.status_code, 200)
+        [row] = response.data['results']
+        self.assertEqual(list(row), ['id', 'candidate_name', 'status'])
+        self.assertNotIn('"message"', sql)
+        self.assertNotIn('"cover_letter"', sql)
+        # Deferred columns are never fetched back one row at a time (e.g. by post_init receivers).
+        self.assertEqual(sql.count('SELECT'), 1)
+
+    def test_unknown_field_is_rejected(self):
+        response, _ = self.get(ScheduleListCreateView, '/api/schedules/?fields=id,nope')
+        self.assertEqual(response.status_code, 400)
+
+    def test_invalid_cursor_is_not_found(self):
+        for view, path in [(ScheduleListCreateView, '/api/schedules/'), (JobApplicationListCreateView, '/api/applications/')]:
+            response, _ = self.get(view, f'{path}?cursor=not-a-cursor')
+            self.assertEqual(response.status_code, 404)
+
+
+class StreamingExportTests(ListEndpointFixtures, TenantTestCase):
+    """
+    Exports stream every matching row in the requested format.
+    """
+
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.name = 'Export Test'
+
+    def export(self, view, path):
+        body, _ = self.export_with_queries(view, path)
+        return body
+
+    def export_with_queries(self, view, path):
+        # Rows are read while the response streams, so count queries through to the last chunk.
+        with CaptureQueriesContext(connection) as context:
+            response, _ = self.get(view, path)
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.streaming)
+            body = b''.join(response.streaming_content).decode('utf-8')
+        return body, sum(query['sql'].startswith('SELECT') for query in context.captured_queries)
+
+    def test_application_ndjson(self):
+        body = self.export(JobApplicationExportView, '/api/applications/export/')
+        [row] = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual(row['id'], 'SPA-00001')
+        self.assertEqual(row['cover_letter'], 'A long cover letter')
+
+    def test_schedule_csv_with_fields(self):
+        body = self.export(ScheduleExportView, '/api/schedules/export/?export_format=csv&fields=id,status')
+        rows = list(csv.reader(io.StringIO(body)))
+        self.assertEqual(rows, [['id', 'status'], ['SPA-00001', 'scheduled']])
+
+    def test_unknown_format_is_rejected(self):
+        response, _ = self.get(ScheduleExportView, '/api/schedules/export/?export_format=xlsx')
+        self.assertEqual(response.status_code, 400)
+
+    def test_schedule_export_query_count_is_constant(self):
+        body, queries = self.export_with_queries(ScheduleExportView, '/api/schedules/export/?export_format=csv')
+        self.assertEqual(len(body.splitlines()), 2)
+        self.add_schedules(3)
+        body, more_queries = self.export_with_queries(ScheduleExportView, '/api/schedules/export/?export_format=csv')
+        self.assertEqual(len(body.splitlines()), 5)
+        self.assertEqual(more_queries, queries)
+
+    def test_csv_cells_are_not_formulas(self):
+        JobApplication.objects.filter(pk='SPA-00001').update(full_name='=SUM(1+2)', phone='+44 1234')
+        body = self.export(JobApplicationExportView, '/api/applications/export/?export_format=csv&fields=id,full_name,phone')
+        rows = list(csv.reader(io.StringIO(body)))
+        self.assertEqual(rows, [['id', 'full_name', 'phone'], ['SPA-00001', "'=SUM(1+2)", "'+44 1234"]])
+
+
+class ApplicationSearchTests(TenantTestCase):
+    """
+    The search_vector trigger keeps applications searchable as they are written.
+    """
+
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.name = 'Search Test'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create(email='admin@search-test.example.com', role='admin', tenant=cls.tenant)
+        requisition = JobRequisition.objects.create(
+            id='SEA-0001', tenant=cls.tenant, title='Nurse', unique_link='search-test-1',
+        )
+        cls.applications = [
+            JobApplication.objects.create(
+                id=f'SEA-0000{index}', tenant=cls.tenant, job_requisition=requisition, full_name=name,
+                email=f'applicant{index}@example.com', phone='000', qualification=qualification,
+                experience='-', knowledge_skill=skill,
+            )
+            for index, (name, qualification, skill) in enumerate([
+                ('Ada Palliative', 'BSc Nursing', 'wound care'),
+                ('Grace Hopper', 'Diploma', 'palliative care, medication rounds'),
+                ('Alan Turing', 'MSc Computing', 'databases'),
+            ], start=1)
+        ]
+
+    def search(self, term):
+        request = APIRequestFactory().get('/api/applications/search/', {'q': term})
+        request.tenant = self.tenant
+        force_authenticate(request, user=self.user)
+        response = JobApplicationSearchView.as_view()(request)
+        self.assertEqual(response.status_code, 200)
+        return response.data['results']
+
+    def test_ranked_with_highlight(self):
+        results = self.search('palliative')
+        self.assertEqual([row['id'] for row in results], ['SEA-00001', 'SEA-00002'])
+        self.assertIn('<mark>palliative</mark>', results[1]['highlight'])
+
+    def test_vector_follows_writes(self):
+        application = JobApplication.objects.get(id='SEA-00003')
+        application.parsed_resume_text = 'Ten years of palliative nursing.'
+        application.save()
+        self.assertIn('SEA-00003', [row['id'] for row in self.search('palliative')])
+
+
+class ApplicationFacetsTests(TenantTestCase):
+    """
+    Facet counts come from one query, are cached, and refresh after application writes.
+    """
+
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.name = 'Facet Test'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create(email='admin@facet-test.example.com', role='admin', tenant=cls.tenant)
+        cls.branch = Branch.objects.create(tenant=cls.tenant, name='North')
+        requisition = JobRequisition.objects.create(
+            id='FAC-0001', tenant=cls.tenant, title='Carer', unique_link='facet-test-1',
+        )
+        for index, (status, source) in enumerate([('new', 'Website'), ('new', 'Referral'), ('shortlisted', 'Website')]):
+            JobApplication.objects.create(
+                id=f'FAC-0000{index}', tenant=cls.tenant, job_requisition=requisition,
+                branch=cls.branch if index else None, full_name=f'Applicant {index}',
+                email=f'applicant{index}@example.com', phone='000', qualification='-', experience='-',
+                status=status, source=source,
+            )
+
+    def facets(self):
+        request = APIRequestFactory().get('/api/applications/facets/')
+        request.tenant = self.tenant
+        force_authenticate(request, user=self.user)
+        with CaptureQueriesContext(connection) as context:
+            response = JobApplicationFacetsView.as_view()(request)
+        self.assertEqual(response.status_code, 200)
+        return response.data, sum('GROUPING SETS' in query['sql'] for query in context.captured_queries)
+
+    def test_breakdowns_and_invalidation(self):
+        facets, facet_queries = self.facets()
+        self.assertEqual(facet_queries, 1)
+        self.assertEqual(facets['total'], 3)
+        self.assertEqual(facets['status'], [{'value': 'new', 'count': 2}, {'value': 'shortlisted', 'count': 1}])
+        self.assertEqual(facets['source'], [{'value': 'Website', 'count': 2}, {'value': 'Referral', 'count': 1}])
+        self.assertEqual(
+            sorted(facets['branch'], key=lambda item: item['count']),
+            [{'id': None, 'name': None, 'count': 1}, {'id': self.branch.id, 'name': 'North', 'count': 2}],
+        )
+
+        _, facet_queries = self.facets()
+        self.assertEqual(facet_queries, 0)
+
+        application = JobApplication.objects.get(id='FAC-00000')
+        application.status = 'rejected'
+        with self.captureOnCommitCallbacks(execute=True):
+            application.save()
+        facets, _ = self.facets()
+        self.assertIn({'value': 'rejected', 'count': 1}, facets['status'])
+
+
+class ApplicationSubmissionTests(TenantTestCase):
+    """
+    A public submission writes its row once, with ids from the counter table and
+    duplicates rejected by the unique constraint.
+    """
+
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.name = 'Submission Test'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.requisition = JobRequisition.objects.create(
+            id='SUB-0001', tenant=cls.tenant, title='Carer', publish_status=True,
+            unique_link=f'{cls.tenant.schema_name}-submission-test-1',
+            compliance_checklist=[{'id': 'dbs', 'name': 'DBS check', 'description': '', 'required': True}],
+        )
+        JobApplication.objects.bulk_create([
+            JobApplication(
+                id=f'SUB-{index:04d}', tenant=cls.tenant, job_requisition=cls.requisition, full_name='Existing',
+                email=f'existing{index}@example.com', phone='000', qualification='-', experience='-',
+            )
+            for index in (9, 10)
+        ])
+
+    def submit(self, email):
+        request = APIRequestFactory().post('/api/applications/applications/', {
+            'unique_link': self.requisition.unique_link, 'full_name': 'New Applicant', 'email': email,
+            'phone': '000', 'qualification': '-', 'experience': '-',
+        }, format='multipart')
+        with CaptureQueriesContext(connection) as context:
+            response = JobApplicationListCreateView.as_view()(request)
+        return response, [query['sql'] for query in context.captured_queries]
+
+    def test_single_insert_with_compliance_status(self):
+        response, sql = self.submit('new@example.com')
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data['application_id'], 'SUB-0011')
+        table = JobApplication._meta.db_table
+        self.assertEqual(sum(f'INSERT INTO "{table}"' in query for query in sql), 1)
+        self.assertFalse([query for query in sql if f'UPDATE "{table}"' in query])
+        application = JobApplication.objects.get(id='SUB-0011')
+        self.assertEqual([item['status'] for item in application.compliance_status], ['pending'])
+
+    def test_duplicate_submission_rejected_by_constraint(self):
+        self.assertEqual(self.submit('dup@example.com')[0].status_code, 201)
+        response, _ = self.submit('dup@example.com')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(JobApplication.objects.filter(email='dup@example.com').count(), 1)
+
+
+@override_settings(APPLICATION_DOCUMENT_BACKEND='local')
+class DocumentUploadIntentTests(TenantTestCase):
+    """
+    Documents uploaded through a signed intent are verified and referenced by the submission.
+    """
+
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.name = 'Upload Test'
+
+    @classmethod
+    def setUpClass(cls):
+        # Uploads land in a throwaway MEDIA_ROOT; nothing here talks to Supabase.
+        cls.enterClassContext(override_settings(MEDIA_ROOT=cls.enterClassContext(tempfile.TemporaryDirectory())))
+        super().setUpClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.requisition = JobRequisition.objects.create(
+            id='UPL-0001', tenant=cls.tenant, title='Carer', publish_status=True,
+            unique_link=f'{cls.tenant.schema_name}-upload-test-1', documents_required=['Curriculum Vitae (CV)'],
+        )
+
+    def upload(self, content):
+        factory = APIRequestFactory()
+        request = factory.post('/api/applications/uploads/intents/', {
+            'unique_link': self.requisition.unique_link, 'document_type': 'Curriculum Vitae (CV)',
+            'filename': 'cv.pdf', 'content_type': 'application/pdf', 'size': len(content),
+        }, format='json')
+        intent = DocumentUploadIntentView.as_view()(request)
+        self.assertEqual(intent.status_code, 201, intent.data)
+        request = factory.put(intent.data['upload_url'], content, content_type='application/pdf')
+        response = ApplicationDocumentLocalUploadView.as_view()(request, token=intent.data['upload_token'])
+        self.assertEqual(response.status_code, 201, response.data)
+        return intent.data
+
+    def submit(self, intent):
+        request = APIRequestFactory().post('/api/applications/applications/', {
+            'unique_link': self.requisition.unique_link, 'full_name': 'Direct Upload', 'email': 'direct@example.com',
+            'phone': '000', 'qualification': '-', 'experience': '-',
+            'documents[0][document_type]': 'Curriculum Vitae (CV)', 'documents[0][upload_token]': intent['upload_token'],
+        }, format='multipart')
+        return JobApplicationListCreateView.as_view()(request)
+
+    def test_submission_references_uploaded_object(self):
+        intent = self.upload(b'%PDF-1.7\n' + b'0' * 128)
+        response = self.submit(intent)
+        self.assertEqual(response.status_code, 201, response.data)
+        application = JobApplication.objects.get(id=response.data['application_id'])
+        self.assertEqual([doc['file_path'] for doc in application.documents], [intent['object_key']])
+        self.assertTrue(os.path.isfile(os.path.join(settings.MEDIA_ROOT, intent['object_key'])))
+
+    def test_mismatched_content_is_rejected(self):
+        response = self.submit(self.upload(b'MZ not a pdf'))
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(JobApplication.objects.filter(email='direct@example.com').exists())
+
+
+class ComplianceItemPatchTests(TenantTestCase):
+    """
+    Compliance items are patched in place by id without overwriting concurrent edits.
+    """
+
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.name = 'Compliance Test'
+
+    @classmethod
+    def setUpTestData(cls):
+        requisition = JobRequisition.objects.create(
+            id='COM-0001', tenant=cls.tenant, title='Carer', unique_link='compliance-test-1',
+            compliance_checklist=[
+                {'id': 'dbs', 'name': 'DBS check', 'description': '', 'required': True},
+                {'id': 'rtw', 'name': 'Right to work', 'description': '', 'required': True},
+            ],
+        )
+        cls.application = JobApplication.objects.create(
+            tenant=cls.tenant, job_requisition=requisition, full_name='Applicant', email='applicant@example.com',
+            phone='000', qualification='-', experience='-',
+            compliance_status=JobApplication.build_compliance_status(requisition),
+        )
+
+    def test_concurrent_reviewers_keep_each_others_changes(self):
+        first = JobApplication.objects.get(pk=self.application.pk)
+        second = JobApplication.objects.get(pk=self.application.pk)
+        with CaptureQueriesContext(connection) as context:
+            first.update_compliance_status('dbs', 'passed', notes='Clear')
+        # django-tenants sets the search_path on each new cursor.
+        [query] = [query['sql'] for query in context.captured_queries if not query['sql'].startswith('SET search_path')]
+        self.assertNotIn('"full_name"', query)
+        second.update_compliance_status('rtw', 'failed')
+
+        items = {item['id']: item for item in JobApplication.objects.get(pk=self.application.pk).compliance_status}
+        self.assertEqual((items['dbs']['status'], items['dbs']['notes']), ('passed', 'Clear'))
+        self.assertEqual(items['rtw']['status'], 'failed')
+        self.assertEqual(list(items), ['dbs', 'rtw'])
+
+    def test_additions_append_only_missing_items(self):
+        updated = self.application.patch_compliance_items(
+            {'dbs': {'status': 'uploaded'}},
+            {'dbs': {'id': 'dbs', 'status': 'pending'}, 'ref': {'id': 'ref', 'name': 'References', 'status': 'pending'}},
+        )
+        self.assertEqual(updated['dbs']['status'], 'uploaded')
+        self.assertEqual(updated['ref']['name'], 'References')
+        ids = [item['id'] for item in JobApplication.objects.get(pk=self.application.pk).compliance_status]
+        self.assertEqual(ids, ['dbs', 'rtw', 'ref'])
+
+    def test_unknown_item(self):
+        with self.assertRaises(ValueError):
+            self.application.update_compliance_status('missing', 'passed')
+
+    def test_batch_review(self):
+        user = CustomUser.objects.create(email='admin@compliance-test.example.com', role='admin', tenant=self.tenant)
+        request = APIRequestFactory().post('/api/applications/compliance-items/review/', {'reviews': [
+            {'application_id': self.application.pk, 'item_id': 'dbs', 'status': 'passed'},
+            {'application_id': self.application.pk, 'item_id': 'rtw', 'status': 'failed', 'notes': 'Expired visa'},
+            {'application_id': self.application.pk, 'item_id': 'missing', 'status': 'passed'},
+            {'application_id': 'COM-9999', 'item_id': 'dbs', 'status': 'passed'},
+        ]}, format='json')
+        request.tenant = self.tenant
+        force_authenticate(request, user=user)
+        with CaptureQueriesContext(connection) as context:
+            response = ComplianceReviewBatchView.as_view()(request)
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(sum('UPDATE' in query['sql'] for query in context.captured_queries), 1)
+        self.assertEqual([result['result'] for result in response.data['results']], ['updated', 'updated', 'not_found', 'not_found'])
+
+        items = {item['id']: item for item in JobApplication.objects.get(pk=self.application.pk).compliance_status}
+        self.assertEqual((items['dbs']['status'], items['dbs']['checked_by']), ('passed', user.id))
+        self.assertEqual((items['rtw']['status'], items['rtw']['notes']), ('failed', 'Expired visa'))
+
+
+class ScheduleBulkCreateTests(TenantTestCase):
+    """
+    Bulk scheduling inserts every schedule and invitation with one statement each
+    and reports a result per application.
+    """
+
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.name = 'Bulk Schedule Test'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create(
+            email='admin@bulk-schedule-test.example.com', role='admin', tenant=cls.tenant, first_name='Hiring', last_name='Lead',
+        )
+        TenantConfig.objects.create(tenant=cls.tenant, email_templates={
+            'interviewScheduling': {'content': 'Hi [Candidate Name], the [Position] interview is on [Insert Date].', 'is_auto_sent': True},
+        })
+        requisition = JobRequisition.objects.create(
+            id='BUL-0001', tenant=cls.tenant, title='Carer', unique_link='bulk-schedule-test-1',
+        )
+        for index, status in enumerate(['shortlisted', 'shortlisted', 'shortlisted', 'new'], start=1):
+            JobApplication.objects.create(
+                id=f'BUL-{index:05d}', tenant=cls.tenant, job_requisition=requisition, full_name=f'Applicant {index}',
+                email=f'applicant{index}@example.com', phone='000', qualification='-', experience='-', status=status,
+            )
+        Schedule.objects.create(
+            tenant=cls.tenant, job_application_id='BUL-00003',
+            interview_start_date_time=timezone.now() + timedelta(days=1), meeting_mode='Virtual',
+        )
+
+    def setUp(self):
+        super().setUp()
+        # The test schema is shared by every class; drop templates cached by another one.
+        with self.captureOnCommitCallbacks(execute=True):
+            bump_tenant_cache(EMAIL_TEMPLATES, self.tenant.schema_name)
+
+    def test_schedules_valid_applications_and_reports_the_rest(self):
+        start = timezone.now() + timedelta(days=3)
+        request = APIRequestFactory().post('/api/applications/schedules/bulk/', {
+            'job_applications': ['BUL-00001', 'BUL-00002', 'BUL-00003', 'BUL-00004', 'BUL-00001', 'BUL-99999'],
+            'interview_start_date_time': start.isoformat(),
+            'meeting_mode': 'Virtual',
+            'meeting_link': 'https://meet.example.com/interview',
+        }, format='json')
+        request.tenant = self.tenant
+        force_authenticate(request, user=self.user)
+        with CaptureQueriesContext(connection) as context:
+            response = ScheduleBulkCreateView.as_view()(request)
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(
+            [result['result'] for result in response.data['results']],
+            ['scheduled', 'scheduled', 'already_scheduled', 'not_shortlisted', 'duplicate', 'not_found'],
+        )
+        inserts = [query['sql'] for query in context.captured_queries if query['sql'].startswith('INSERT')]
+        self.assertEqual(sum('"job_applications_schedule"' in sql for sql in inserts), 1)
+        self.assertEqual(sum('"core_outboundemail"' in sql for sql in inserts), 1)
+
+        first = response.data['results'][0]
+        schedule = Schedule.objects.get(pk=first['schedule_id'])
+        self.assertEqual(schedule.job_application_id, 'BUL-00001')
+        self.assertEqual(schedule.message, f"Hi Applicant 1, the Carer interview is on {start.strftime('%d %b %Y')}.")
+        email = OutboundEmail.objects.get(pk=first['email_id'])
+        self.assertEqual((email.to, email.reference, email.category), (['applicant1@example.com'], schedule.id, 'interview_invitation'))
+        self.assertNotEqual(response.data['results'][1]['schedule_id'], schedule.id)
+
+
+class PublicJobFeedCacheTests(TenantTestCase):
+    """
+    The public job feed is served from cache with a content ETag, and every write
+    it depends on moves the tenant's PUBLIC_JOB_FEED namespace once committed.
+    """
+
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.name = 'Feed Test'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.requisition = JobRequisition.objects.create(
+            id='FEE-0001', tenant=cls.tenant, title='Carer', unique_link='feed-test-1', publish_status=True,
+        )
+
+    def setUp(self):
+        # The cache outlives each test's rollback; start every test from an empty feed.
+        cache.clear()
+
+    def get(self, etag=None):
+        headers = {'HTTP_IF_NONE_MATCH': etag} if etag else {}
+        request = APIRequestFactory().get(
+            '/api/applications/public-published-requisitions-with-shortlisted/',
+            {'schema_name': self.tenant.schema_name}, **headers,
+        )
+        return PublishedPublicJobRequisitionsWithShortlistedApplicationsView.as_view()(request)
+
+    def version(self):
+        return tenant_cache_version(PUBLIC_JOB_FEED, self.tenant.schema_name)
+
+    def test_matching_etag_is_not_modified(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual([row['job_requisition']['title'] for row in response.data], ['Carer'])
+        etag = response['ETag']
+        self.assertRegex(etag, r'^"[0-9a-f]{64}"$')
+        cache_control = {part.strip() for part in response['Cache-Control'].split(',')}
+        self.assertTrue({'public', f'max-age={settings.PUBLIC_JOB_FEED_MAX_AGE}'} <= cache_control)
+
+        response = self.get(etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertIn('public', response['Cache-Control'])
+
+    def test_requisition_save_changes_etag(self):
+        etag = self.get()['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.requisition.title = 'Senior Carer'
+            self.requisition.save()
+        response = self.get(etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual([row['job_requisition']['title'] for row in response.data], ['Senior Carer'])
+
+    def test_tenant_save_bumps_feed(self):
+        before = self.version()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tenant.about_us = 'We care.'
+            self.tenant.save()
+        self.assertEqual(self.version(), before + 1)
+
+    def test_adjust_application_counts_bumps_feed(self):
+        before = self.version()
+        with self.captureOnCommitCallbacks(execute=True):
+            JobRequisition.adjust_application_counts({self.requisition.pk: 1})
+        self.assertEqual(self.version(), before + 1)
+        self.requisition.refresh_from_db()
+        self.assertEqual(self.requisition.num_of_applications, 1)
+
+
+class ApplicationDeletionTests(TenantTestCase):
+    """
+    num_of_applications drops once when an application is soft-deleted, not again when it is purged.
+    """
+
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.name = 'Deletion Test'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create(email='admin@deletion-test.example.com', role='admin', tenant=cls.tenant)
+        cls.requisition = JobRequisition.objects.create(
+            id='DEL-0001', tenant=cls.tenant, title='Carer', unique_link='deletion-test-1', num_of_applications=2,
+        )
+        # Explicit ids skip the counter increment in JobApplication.save(), hence num_of_applications above.
+        for index in range(1, 3):
+            JobApplication.objects.create(
+                id=f'DEL-{index:05d}', tenant=cls.tenant, job_requisition=cls.requisition, full_name=f'Applicant {index}',
+                email=f'applicant{index}@example.com', phone='000', qualification='-', experience='-',
+            )
+
+    def post(self, view, path, ids):
+        request = APIRequestFactory().post(path, {'ids': ids}, format='json')
+        request.tenant = self.tenant
+        force_authenticate(request, user=self.user)
+        response = view.as_view()(request)
+        self.assertEqual(response.status_code, 200, response.data)
+
+    def num_of_applications(self):
+        return JobRequisition.objects.values_list('num_of_applications', flat=True).get(pk='DEL-0001')
+
+    def test_permanent_delete_keeps_count_from_soft_delete(self):
+        self.assertEqual(self.num_of_applications(), 2)
+        self.post(JobApplicationBulkDeleteView, '/api/applications/applications/bulk-delete/applications/', ['DEL-00001'])
+        self.assertEqual(self.num_of_applications(), 1)
+        self.post(
+            PermanentDeleteJobApplicationsView, '/api/applications/applications/permanent-delete/application/', ['DEL-00001'],
+        )
+        self.assertFalse(JobApplication.objects.filter(pk='DEL-00001').exists())
+        self.assertEqual(self.num_of_applications(), 1)
+
+
+class BulkDeleteQueryCountTests(TenantTestCase):
+    """
+    Bulk soft-delete and restore issue a fixed number of queries however many applications they touch.
+    """
+
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.name = 'Bulk Test'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create(email='admin@bulk-test.example.com', role='admin', tenant=cls.tenant)
+        requisitions = [
+            JobRequisition.objects.create(
+                id=f'BLK-{index:04d}', tenant=cls.tenant, title='Carer', unique_link=f'bulk-test-{index}',
+            )
+            for index in range(1, 3)
+        ]
+        for index in range(1, 7):
+            JobApplication.objects.create(
+                id=f'BLK-{index:05d}', tenant=cls.tenant, job_requisition=requisitions[index % 2],
+                full_name=f'Applicant {index}', email=f'applicant{index}@example.com', phone='000',
+                qualification='-', experience='-',
+            )
+
+    def count_queries(self, view, path, ids):
+        request = APIRequestFactory().post(path, {'ids': ids}, format='json')
+        request.tenant = self.tenant
+        force_authenticate(request, user=self.user)
+        with CaptureQueriesContext(connection) as context:
+            response = view.as_view()(request)
+        self.assertEqual(response.status_code, 200, response.data)
+        # django-tenants sets the search_path on each new cursor.
+        return sum(not query['sql'].startswith('SET search_path') for query in context.captured_queries)
+
+    def delete_and_restore(self, ids):
+        deleted = self.count_queries(
+            JobApplicationBulkDeleteView, '/api/applications/applications/bulk-delete/applications/', ids,
+        )
+        self.assertEqual(JobApplication.objects.filter(pk__in=ids, is_deleted=True).count(), len(ids))
+        restored = self.count_queries(
+            RecoverSoftDeletedJobApplicationsView, '/api/applications/applications/recover/application/', ids,
+        )
+        self.assertFalse(JobApplication.objects.filter(pk__in=ids, is_deleted=True).exists())
+        return deleted, restored
+
+    def test_query_count_is_independent_of_batch_size(self):
+        single = self.delete_and_restore(['BLK-00001'])
+        batch = self.delete_and_restore([f'BLK-{index:05d}' for index in range(2, 7)])
+        self.assertEqual(single, batch)
+
+
+class DuplicateApplicationMigrationTests(TenantTestCase):
+    """
+    The unbranched-uniqueness migration soft-deletes all but the oldest duplicate first.
+    """
+
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.name = 'Duplicate Test'
+
+    def test_keeps_oldest_active_application(self):
+        migration = importlib.import_module('job_application.migrations.0006_identifier_counter_unbranched_unique')
+        [constraint] = [c for c in JobApplication._meta.constraints if c.name == 'unique_unbranched_application_per_email']
+        requisition = JobRequisition.objects.create(
+            id='DUP-0001', tenant=self.tenant, title='Carer', unique_link='duplicate-test-1', num_of_applications=3,
+        )
+        with connection.schema_editor() as schema_editor:
+            schema_editor.remove_constraint(JobApplication, constraint)
+        for index in range(1, 4):
+            JobApplication.objects.create(
+                id=f'DUP-{index:05d}', tenant=self.tenant, job_requisition=requisition, full_name='Applicant',
+                email='same@example.com', phone='000', qualification='-', experience='-',
+            )
+
+        with connection.cursor() as cursor:
+            # Run the deferred foreign key checks of the inserts above before touching the table's indexes.
+            cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+        with connection.schema_editor() as schema_editor:
+            migration.soft_delete_duplicate_applications(apps, schema_editor)
+            schema_editor.add_constraint(JobApplication, constraint)
+
+        self.assertEqual(list(JobApplication.active_objects.values_list('id', flat=True)), ['DUP-00001'])
+        requisition.refresh_from_db()
+        self.assertEqual(requisition.num_of_applications, 1)
@@ -10,7 +10,10 @@ from .views import (
     ScheduleListCreateView, ScheduleDetailView, ScheduleBulkDeleteView, SoftDeletedSchedulesView,
     RecoverSoftDeletedSchedulesView,PermanentDeleteSchedulesView,JobApplicationWithSchedulesView,ComplianceStatusUpdateView,
     ResumeParseView, JobApplicationsByRequisitionView, PublishedJobRequisitionsWithShortlistedApplicationsView,
-    ResumeScreeningView,TimezoneChoicesView,ApplicantComplianceUploadView, PublishedPublicJobRequisitionsWithShortlistedApplicationsView
+    ResumeScreeningView,TimezoneChoicesView,ApplicantComplianceUploadView, PublishedPublicJobRequisitionsWithShortlistedApplicationsView,
+    JobApplicationExportView, JobApplicationsByRequisitionExportView, ScheduleExportView, JobApplicationSearchView,
+    JobApplicationFacetsView, DocumentUploadIntentView, ApplicationDocumentLocalUploadView,
+    ComplianceReviewBatchView, ScheduleBulkCreateView
 )
 
 app_name = 'job_applications'
@@ -20,17 +23,25 @@ app_name = 'job_applications'
 urlpatterns = [
    
     path('applications/', JobApplicationListCreateView.as_view(), name='application-list-create'),
+    path('applications/export/', JobApplicationExportView.as_view(), name='application-export'),
+    path('applications/search/', JobApplicationSearchView.as_view(), name='application-search'),
+    path('applications/facets/', JobApplicationFacetsView.as_view(), name='application-facets'),
+    path('applications/uploads/intents/', DocumentUploadIntentView.as_view(), name='application-document-upload-intent'),
+    path('applications/uploads/local/<str:token>/', ApplicationDocumentLocalUploadView.as_view(), name='application-document-local-upload'),
     path('applications/<str:id>/', JobApplicationDetailView.as_view(), name='application-detail'),
     path('applications/bulk-delete/applications/', JobApplicationBulkDeleteView.as_view(), name='application-bulk-delete'),
     path('applications/deleted/soft_deleted/', SoftDeletedJobApplicationsView.as_view(), name='soft-deleted-applications'),
     path('applications/recover/application/', RecoverSoftDeletedJobApplicationsView.as_view(), name='recover-applications'),
     path('applications/permanent-delete/application/', PermanentDeleteJobApplicationsView.as_view(), name='permanent-delete-applications'),
     path('applications/job-requisitions/<str:job_requisition_id>/applications/', JobApplicationsByRequisitionView.as_view(), name='job-applications-by-requisition'),
+    path('applications/job-requisitions/<str:job_requisition_id>/applications/export/', JobApplicationsByRequisitionExportView.as_view(), name='job-applications-by-requisition-export'),
+    path('applications/job-requisitions/<str:job_requisition_id>/facets/', JobApplicationFacetsView.as_view(), name='job-applications-by-requisition-facets'),
 
 
     path('applications/code/<str:code>/email/<str:email>/with-schedules/schedules/', JobApplicationWithSchedulesView.as_view(), name='application-with-schedules'),
 
     # path('applications/<str:id>/with-schedules/schedules/', JobApplicationWithSchedulesView.as_view(), name='application-with-schedules'),
+    path('applications/compliance-items/review/', ComplianceReviewBatchView.as_view(), name='compliance-review-batch'),
     path('applications/compliance/<str:job_application_id>/compliance-items/<str:item_id>/', ComplianceStatusUpdateView.as_view(), name='applicant-compliance-status'),
     path('applications/<str:job_application_id>/compliance-items/submit/', ComplianceStatusUpdateView.as_view(), name='submit-compliance-items'),
     
@@ -54,7 +65,9 @@ urlpatterns = [
     # Schedule Endpoints
     path('schedules/', ScheduleListCreateView.as_view(), name='schedule-list-create'),
     path('schedules/api/timezone-choices/', TimezoneChoicesView.as_view(), name='timezone_choices'),
+    path('schedules/export/', ScheduleExportView.as_view(), name='schedule-export'),
     path('schedules/bulk-delete/', ScheduleBulkDeleteView.as_view(), name='schedule-bulk-delete'),
+    path('schedules/bulk/', ScheduleBulkCreateView.as_view(), name='schedule-bulk-create'),
     path('schedules/<str:id>/', ScheduleDetailView.as_view(), name='schedule-detail'),
     path('schedules/deleted/soft_deleted/', SoftDeletedSchedulesView.as_view(), name='soft-deleted-schedules'),
     path('schedules/recover/schedule/', RecoverSoftDeletedSchedulesView.as_view(), name='recover-schedules'),
@@ -1,32 +1,57 @@
 import logging
+import hashlib
 import os
 import uuid
 import requests
 import tempfile
 import mimetypes
 import pytz
+from collections import Counter
+from html import escape
 
 from django.conf import settings
+from django.core.cache import cache
 from django.core.files.storage import default_storage
-from django.core.mail import EmailMessage
 from django.db import connection, transaction, IntegrityError
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank
+from django.db.models import Count, Exists, F, OuterRef, Prefetch, Q, TextField, Value
+from django.db.models.functions import Coalesce, Concat
 from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
 from django_tenants.utils import tenant_context, schema_context
+from auditlog.models import LogEntry
 
 from rest_framework import generics, serializers, status
+from rest_framework.exceptions import APIException
 from rest_framework.parsers import JSONParser, MultiPartParser, FormParser
 from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from core.models import TenantConfig, Tenant, Branch
-from core.utils.email_config import configure_email_backend
+from core.utils.email_templates import get_email_template
+from core.utils.outbox import enqueue_email, enqueue_emails
+from core.utils.bulk_ops import bulk_set_deleted, bulk_log_entries
+from core.utils.cache_keys import APPLICATION_FACETS, PUBLIC_JOB_FEED, bump_tenant_cache, tenant_cache_key
+from lumina_care.eager_loading import EagerLoadingMixin
+from lumina_care.sparse_fields import SparseFieldsMixin
+from lumina_care.exports import StreamingExportMixin
+from lumina_care.pagination import KeysetPagination
 
 from talent_engine.models import JobRequisition
 from talent_engine.serializers import JobRequisitionSerializer
 
+from .document_storage import (
+    create_upload_intent, remove_application_documents, store_local_upload, upload_application_documents
+)
+from .facets import application_facets
 from .models import JobApplication, Schedule
-from .serializers import JobApplicationSerializer, ScheduleSerializer, ComplianceStatusSerializer
+from .serializers import (
+    JobApplicationSerializer, JobApplicationFastSerializer, ScheduleSerializer, ComplianceStatusSerializer,
+    DocumentUploadIntentSerializer, ComplianceReviewBatchSerializer, ScheduleBulkCreateSerializer,
+)
 from .permissions import IsSubscribedAndAuthorized, BranchRestrictedPermission
 from .tenant_utils import resolve_tenant_from_unique_link
 from .utils import parse_resume, screen_resume, extract_resume_fields
@@ -87,6 +112,36 @@ class ResumeParseView(APIView):
             return Response({"detail": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+def queue_rejection_emails(tenant, job_requisition, applications, email_template):
+    """
+    Queue the interviewRejection email (a compiled template, see
+    core.utils.email_templates) for each application in the outbox.
+    Call it inside the transaction that rejects them.
+    """
+    from_email = tenant.default_from_email or 'hiring@proliance.com'
+    placeholders = {
+        'Job Title': job_requisition.title,
+        'Position': job_requisition.title,
+        'Company': tenant.name,
+        'Your Name': 'Hiring Manager',
+        'your.email@proliance.com': from_email,
+    }
+    queued = []
+    for app in applications:
+        email_content = email_template.render({**placeholders, 'Candidate Name': app.full_name})
+        queued.append(enqueue_email(
+            tenant,
+            subject=f'Application Update for {job_requisition.title} at Proliance',
+            body=email_content,
+            to=app.email,
+            from_email=from_email,
+            category='rejection',
+            reference=app.id,
+        ))
+        logger.info(f"Rejection email queued for {app.email} for JobRequisition {job_requisition.id}")
+    return queued
+
+
 class ResendRejectionEmailsView(APIView):
     permission_classes = [IsAuthenticated, IsSubscribedAndAuthorized, BranchRestrictedPermission]
     parser_classes = [JSONParser]
@@ -119,51 +174,28 @@ class ResendRejectionEmailsView(APIView):
                     logger.warning(f"No rejected applications found for IDs {application_ids}")
                     return Response({"detail": "No rejected applications found."}, status=status.HTTP_400_BAD_REQUEST)
 
-                failed_emails = []
                 try:
-                    tenant_config = TenantConfig.objects.get(tenant=tenant)
-                    email_config = tenant_config.email_templates.get('interviewRejection', {})
-                    
-                    if not email_config.get('is_auto_sent', False):
+                    email_template = get_email_template(tenant, 'interviewRejection')
+
+                    if not (email_template and email_template.is_auto_sent):
                         logger.info(f"Auto-send not enabled for interviewRejection template for tenant {tenant.schema_name}")
                         return Response({"detail": "Auto-send is not enabled for rejection emails."}, status=status.HTTP_400_BAD_REQUEST)
 
-                    email_template = email_config.get('content', '')
-                    if not email_template:
+                    if not email_template.content:
                         logger.warning(f"No email template content found for interviewRejection for tenant {tenant.schema_name}")
                         return Response({"detail": "No email template content found."}, status=status.HTTP_400_BAD_REQUEST)
 
-                    email_backend = configure_email_backend(tenant)
-                    for app in applications:
-                        try:
-                            email_content = email_template.replace('[Candidate Name]', app.full_name)
-                            email_content = email_content.replace('[Job Title]', job_requisition.title)
-                            email_content = email_content.replace('[Your Name]', 'Hiring Manager')
-                            email_content = email_content.replace('[your.email@proliance.com]', tenant.default_from_email or 'hiring@proliance.com')
-
-                            email = EmailMessage(
-                                subject=f'Application Update for {job_requisition.title} at Proliance',
-                                body=email_content,
-                                from_email=tenant.default_from_email or 'hiring@proliance.com',
-                                to=[app.email],
-                                connection=email_backend
-                            )
-                            email.send()
-                            logger.info(f"Rejection email sent to {app.email} for JobRequisition {job_requisition.id}")
-                        except Exception as e:
-                            logger.error(f"Failed to send rejection email to {app.email}: {str(e)}")
-                            failed_emails.append({
-                                "application_id": app.id,
-                                "full_name": app.full_name,
-                                "email": app.email
-                            })
+                    with transaction.atomic():
+                        queued = queue_rejection_emails(tenant, job_requisition, applications, email_template)
                 except TenantConfig.DoesNotExist:
                     logger.error(f"Tenant configuration not found for tenant {tenant.schema_name}")
                     return Response({"detail": "Tenant configuration not found."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
                 response_data = {
-                    "detail": f"Attempted to resend rejection emails to {len(applications)} applicants.",
-                    "failed_emails": failed_emails
+                    "detail": f"Queued rejection emails to {len(queued)} applicants.",
+                    # Delivery happens in the background; failures show up in the outbox status endpoint.
+                    "failed_emails": [],
+                    "emails": [{"application_id": email.reference, "email_id": email.id} for email in queued]
                 }
                 return Response(response_data, status=status.HTTP_200_OK)
 
@@ -183,41 +215,21 @@ class ResumeScreeningView(APIView):
 
 
     def send_rejection_emails(self, tenant, job_requisition, applications):
+        # Runs inside the screening transaction; the outbox worker does the sending.
         try:
-            tenant_config = TenantConfig.objects.get(tenant=tenant)
-            email_config = tenant_config.email_templates.get('interviewRejection', {})
-            
-            if not email_config.get('is_auto_sent', False):
+            email_template = get_email_template(tenant, 'interviewRejection')
+
+            if not (email_template and email_template.is_auto_sent):
                 logger.info(f"Auto-send not enabled for interviewRejection template for tenant {tenant.schema_name}")
                 return
 
-            email_template = email_config.get('content', '')
-            if not email_template:
+            if not email_template.content:
                 logger.warning(f"No email template content found for interviewRejection for tenant {tenant.schema_name}")
                 return
 
-            email_backend = configure_email_backend(tenant)
-            for app in applications:
-                if app.status == 'rejected':
-                    try:
-                        # Perform sequential placeholder replacements
-                        email_content = email_template
-                        email_content = email_content.replace('[Candidate Name]', app.full_name)
-                        email_content = email_content.replace('[Job Title]', job_requisition.title)
-                        email_content = email_content.replace('[Your Name]', 'Hiring Manager')
-                        email_content = email_content.replace('[your.email@proliance.com]', tenant.default_from_email or 'hiring@proliance.com')
-
-                        email = EmailMessage(
-                            subject=f'Application Update for {job_requisition.title} at Proliance',
-                            body=email_content,
-                            from_email=tenant.default_from_email or 'hiring@proliance.com',
-                            to=[app.email],
-                            connection=email_backend
-                        )
-                        email.send()
-                        logger.info(f"Rejection email sent to {app.email} for JobRequisition {job_requisition.id}")
-                    except Exception as e:
-                        logger.error(f"Failed to send rejection email to {app.email}: {str(e)}")
+            with transaction.atomic():
+                rejected = [app for app in applications if app.status == 'rejected']
+                queue_rejection_emails(tenant, job_requisition, rejected, email_template)
         except TenantConfig.DoesNotExist:
             logger.error(f"Tenant configuration not found for tenant {tenant.schema_name}")
         except Exception as e:
@@ -373,6 +385,7 @@ class ResumeScreeningView(APIView):
                             app.screening_status = 'processed'
                             app.screening_score = score
                             app.employment_gaps = employment_gaps
+                            app.parsed_resume_text = resume_text
                             app.save()
 
                             results.append({
@@ -525,9 +538,10 @@ class JobApplicationWithSchedulesView(generics.RetrieveAPIView):
             return Response({"detail": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-class JobApplicationsByRequisitionView(generics.ListAPIView):
+class JobApplicationsByRequisitionView(SparseFieldsMixin, EagerLoadingMixin, generics.ListAPIView):
     serializer_class = JobApplicationSerializer
     permission_classes = [IsAuthenticated, IsSubscribedAndAuthorized, BranchRestrictedPermission]
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         try:
@@ -551,7 +565,6 @@ class JobApplicationsByRequisitionView(generics.ListAPIView):
                     applications = applications.filter(branch=self.request.user.branch)
                 
                 logger.debug(f"Query: {applications.query}")
-                logger.info(f"Retrieved {applications.count()} job applications for JobRequisition {job_requisition_id}")
                 
                 # return applications
                 return applications.order_by('-created_at')
@@ -562,9 +575,12 @@ class JobApplicationsByRequisitionView(generics.ListAPIView):
 
     def list(self, request, *args, **kwargs):
         try:
-            queryset = self.get_queryset()
-            serializer = self.get_serializer(queryset, many=True)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            fast_serializer = JobApplicationFastSerializer(fields=self.sparse_fields)
+            page = self.paginate_queryset(fast_serializer.values(self.filter_queryset(self.get_queryset()), *self.get_sparse_key_fields()))
+            logger.info(f"Retrieved {len(page)} job applications for JobRequisition {self.kwargs['job_requisition_id']}")
+            return self.get_paginated_response(fast_serializer.serialize(page))
+        except APIException:
+            raise
         except Exception as e:
             return Response({"detail": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
@@ -576,21 +592,43 @@ class PublishedJobRequisitionsWithShortlistedApplicationsView(generics.ListAPIVi
     def get_queryset(self):
         try:
             tenant = self.request.tenant
+            user = self.request.user
             connection.set_schema(tenant.schema_name)
             logger.debug(f"Schema set to: {connection.schema_name}")
 
             with tenant_context(tenant):
+                # Counts and prefetches honour the recruiter branch scope; the requisition
+                # itself is listed when any active application exists in the user's branch.
+                recruiter_branch = user.branch if user.role == 'recruiter' and user.branch else None
+                counted = Q(applications__is_deleted=False)
+                applications = JobApplication.active_objects.filter(tenant=tenant, status='shortlisted')
+                schedules = Schedule.active_objects.filter(tenant=tenant).select_related('tenant', 'branch')
+                if recruiter_branch:
+                    counted &= Q(applications__branch=recruiter_branch)
+                    applications = applications.filter(branch=recruiter_branch)
+                    schedules = schedules.filter(branch=recruiter_branch)
+
+                listed = JobApplication.active_objects.filter(job_requisition=OuterRef('pk'))
+                if user.branch:
+                    listed = listed.filter(branch=user.branch)
+
                 queryset = JobRequisition.objects.filter(
                     tenant=tenant,
                     publish_status=True,
-                    applications__isnull=False,
-                    applications__is_deleted=False
-                ).distinct()
-                if self.request.user.branch:
-                    queryset = queryset.filter(applications__branch=self.request.user.branch)
+                ).filter(Exists(listed)).annotate(
+                    total_applications=Count('applications', filter=counted),
+                    shortlisted_count=Count('applications', filter=counted & Q(applications__status='shortlisted')),
+                ).select_related('tenant', 'branch', 'requested_by', 'stats').prefetch_related(
+                    Prefetch(
+                        'applications',
+                        queryset=applications.select_related('tenant', 'branch').prefetch_related(
+                            Prefetch('schedules', queryset=schedules.order_by('-created_at'), to_attr='active_schedules')
+                        ).order_by('-created_at'),
+                        to_attr='shortlisted_applications',
+                    )
+                )
                 logger.debug(f"Query: {queryset.query}")
-                logger.info(f"Retrieved {queryset.count()} published job requisitions with applications for tenant {tenant.schema_name}")
-                return queryset.order_by('-created_at')
+                return queryset.order_by('-created_at', '-id')
 
         except Exception as e:
             logger.exception("Error retrieving published job requisitions with applications")
@@ -599,58 +637,31 @@ class PublishedJobRequisitionsWithShortlistedApplicationsView(generics.ListAPIVi
     def list(self, request, *args, **kwargs):
         try:
             tenant = request.tenant
-            queryset = self.get_queryset()
-            job_requisition_serializer = self.get_serializer(queryset, many=True)
+            with tenant_context(tenant):
+                job_requisitions = list(self.get_queryset())
+                shortlisted = [app for job_requisition in job_requisitions for app in job_requisition.shortlisted_applications]
+                schedules = [schedule for app in shortlisted for schedule in app.active_schedules]
 
-            job_requisition_dict = {item['id']: item for item in job_requisition_serializer.data}
+                job_requisition_data = self.get_serializer(job_requisitions, many=True).data
+                application_data = iter(JobApplicationSerializer(shortlisted, many=True).data)
+                schedule_data = iter(ScheduleSerializer(schedules, many=True).data)
 
-            response_data = []
-            with tenant_context(tenant):
-                for job_requisition in queryset:
-                    shortlisted_applications = JobApplication.active_objects.filter(
-                        tenant=tenant,
-                        job_requisition=job_requisition,
-                        status='shortlisted'
-                    ).select_related('job_requisition')
-                    if request.user.role == 'recruiter' and request.user.branch:
-                        shortlisted_applications = shortlisted_applications.filter(branch=request.user.branch)
-                    
-                    application_serializer = JobApplicationSerializer(shortlisted_applications, many=True)
-                    
-                    # Process each application to include schedule information
+                response_data = []
+                for job_requisition, requisition_data in zip(job_requisitions, job_requisition_data):
                     enhanced_applications = []
-                    for app_data in application_serializer.data:
-                        application_id = app_data['id']
-                        schedules = Schedule.active_objects.filter(
-                            tenant=tenant,
-                            job_application_id=application_id
-                        ).select_related('job_application')
-                        if request.user.role == 'recruiter' and request.user.branch:
-                            schedules = schedules.filter(branch=request.user.branch)
-                        
-                        schedule_serializer = ScheduleSerializer(schedules, many=True)
-                        app_data['scheduled'] = schedules.exists()
-                        app_data['schedules'] = schedule_serializer.data
+                    for application in job_requisition.shortlisted_applications:
+                        app_data = next(application_data)
+                        app_data['scheduled'] = bool(application.active_schedules)
+                        app_data['schedules'] = [next(schedule_data) for _ in application.active_schedules]
                         enhanced_applications.append(app_data)
-                    
-                    total_applications = JobApplication.active_objects.filter(
-                        tenant=tenant,
-                        job_requisition=job_requisition
-                    )
-                    if request.user.role == 'recruiter' and request.user.branch:
-                        total_applications = total_applications.filter(branch=request.user.branch)
-                    total_applications = total_applications.count()
-                    
+
                     response_data.append({
-                        'job_requisition': job_requisition_dict.get(job_requisition.id),
+                        'job_requisition': requisition_data,
                         'shortlisted_applications': enhanced_applications,
-                        'shortlisted_count': shortlisted_applications.count(),
-                        'total_applications': total_applications
+                        'shortlisted_count': job_requisition.shortlisted_count,
+                        'total_applications': job_requisition.total_applications
                     })
 
-            # Sort response_data by job_requisition's created_at to maintain LIFO
-            response_data.sort(key=lambda x: job_requisition_dict[x['job_requisition']['id']]['created_at'], reverse=True)        
-
             logger.info(f"Retrieved {len(response_data)} job requisitions with shortlisted applications for tenant {tenant.schema_name}")
             return Response(response_data, status=status.HTTP_200_OK)
 
@@ -688,7 +699,7 @@ class PublishedPublicJobRequisitionsWithShortlistedApplicationsView(generics.Lis
 
             # Fetch published job requisitions for the tenant
             with tenant_context(tenant):
-                queryset = JobRequisition.objects.filter(
+                queryset = JobRequisition.active_objects.filter(
                     tenant=tenant,
                     publish_status=True
                 )
@@ -703,54 +714,75 @@ class PublishedPublicJobRequisitionsWithShortlistedApplicationsView(generics.Lis
                         logger.error(f"Branch {branch_name} not found for tenant {schema_name}")
                         raise serializers.ValidationError(f"Branch {branch_name} not found.")
 
-                queryset = queryset.distinct()
-                logger.info(f"Retrieved {queryset.count()} published job requisitions for tenant {tenant.schema_name}")
-                return queryset.order_by('-created_at'), tenant  # Return tenant along with queryset
+                queryset = queryset.annotate(
+                    shortlisted_count=Count(
+                        'applications',
+                        filter=Q(applications__is_deleted=False, applications__status='shortlisted')
+                    )
+                ).select_related('tenant', 'branch', 'requested_by')
+                return queryset.order_by('-created_at', '-id'), tenant  # Return tenant along with queryset
 
         except Exception as e:
             logger.exception("Error retrieving published job requisitions")
             raise
 
+    def build_feed(self):
+        queryset, tenant = self.get_queryset()
+        with tenant_context(tenant):
+            job_requisitions = list(queryset)
+            job_requisition_data = self.get_serializer(job_requisitions, many=True).data
+
+        tenant_data = {
+            "logo_url": tenant.logo,
+            "about_us": tenant.about_us,
+            "title": tenant.title,
+        }
+        response_data = [
+            {
+                'job_requisition': requisition_data,
+                'tenant': tenant_data,
+                'shortlisted_count': job_requisition.shortlisted_count,
+            }
+            for job_requisition, requisition_data in zip(job_requisitions, job_requisition_data)
+        ]
+        body = JSONRenderer().render(response_data)
+        logger.info(f"Built public job feed with {len(response_data)} job requisitions for tenant {tenant.schema_name}")
+        return {'etag': f'"{hashlib.sha256(body).hexdigest()}"', 'data': response_data}
+
     def list(self, request, *args, **kwargs):
         try:
-            # Fetch the queryset and tenant from get_queryset
-            queryset, tenant = self.get_queryset()
-            job_requisition_serializer = self.get_serializer(queryset, many=True)
-
-            response_data = []
-            with tenant_context(tenant):
-                for job_requisition in queryset:
-                    job_requisition_data = self.get_serializer(job_requisition).data
-
-                    tenant_data = {
-                        "logo_url": tenant.logo,
-                        "about_us": tenant.about_us,
-                        "title": tenant.title,
-                    }
-
-                    shortlisted_count = JobApplication.active_objects.filter(
-                        tenant=tenant,
-                        job_requisition=job_requisition,
-                        status='shortlisted'
-                    ).count()
-
-                    response_data.append({
-                        'job_requisition': job_requisition_data,
-                        'tenant': tenant_data,
-                        'shortlisted_count': shortlisted_count,
-                    })
-
-            logger.info(f"Retrieved {len(response_data)} job requisitions with tenant details for tenant {tenant.schema_name}")
-            return Response(response_data, status=status.HTTP_200_OK)
+            schema_name = request.query_params.get("schema_name")
+            branch_name = request.query_params.get("branch_name") or ''
+
+            feed = None
+            cache_key = None
+            if schema_name:
+                cache_key = tenant_cache_key(PUBLIC_JOB_FEED, schema_name, branch_name)
+                feed = cache.get(cache_key)
+            if feed is None:
+                feed = self.build_feed()
+                if cache_key:
+                    cache.set(cache_key, feed, settings.PUBLIC_JOB_FEED_CACHE_TIMEOUT)
+            else:
+                logger.debug(f"Serving cached public job feed for tenant {schema_name}")
+
+            if feed['etag'] in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', '')):
+                response = Response(status=status.HTTP_304_NOT_MODIFIED)
+            else:
+                response = Response(feed['data'], status=status.HTTP_200_OK)
+            response['ETag'] = feed['etag']
+            patch_cache_control(response, public=True, max_age=settings.PUBLIC_JOB_FEED_MAX_AGE, must_revalidate=True)
+            return response
 
         except Exception as e:
             logger.exception("Error processing job requisitions and tenant details")
             return Response({"detail": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-class JobApplicationListCreateView(generics.GenericAPIView):
+class JobApplicationListCreateView(SparseFieldsMixin, EagerLoadingMixin, generics.GenericAPIView):
     parser_classes = (MultiPartParser, FormParser)
     serializer_class = JobApplicationSerializer
+    pagination_class = KeysetPagination
 
     def get_permissions(self):
         if self.request.method == 'GET':
@@ -775,10 +807,12 @@ class JobApplicationListCreateView(generics.GenericAPIView):
 
     def get(self, request, *args, **kwargs):
         try:
-            applications = self.get_queryset()
-            serializer = self.get_serializer(applications, many=True)
-            logger.info(f"Retrieved {len(applications)} job applications for tenant {request.tenant.schema_name}")
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            fast_serializer = JobApplicationFastSerializer(fields=self.sparse_fields)
+            page = self.paginate_queryset(fast_serializer.values(self.filter_queryset(self.get_queryset()), *self.get_sparse_key_fields()))
+            logger.info(f"Retrieved {len(page)} job applications for tenant {request.tenant.schema_name}")
+            return self.get_paginated_response(fast_serializer.serialize(page))
+        except APIException:
+            raise
         except Exception as e:
             logger.exception(f"Error retrieving job applications: {str(e)}")
             return Response({"detail": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -803,24 +837,6 @@ class JobApplicationListCreateView(generics.GenericAPIView):
                 logger.error("Missing email in POST request")
                 return Response({"detail": "Email is required."}, status=status.HTTP_400_BAD_REQUEST)
 
-            # Check for existing active application
-            with schema_context(tenant.schema_name):
-                existing_application = JobApplication.active_objects.filter(
-                    tenant=tenant,
-                    job_requisition=job_requisition,
-                    email=email
-                )
-                if request.user.is_authenticated and request.user.branch:
-                    existing_application = existing_application.filter(branch=request.user.branch)
-                else:
-                    existing_application = existing_application.filter(branch__isnull=True)
-
-                if existing_application.exists():
-                    logger.warning(f"Duplicate application attempt for email {email} for JobRequisition {job_requisition.id}")
-                    return Response({
-                        "detail": "An application with this email already exists for this job."
-                    }, status=status.HTTP_400_BAD_REQUEST)
-
             application_data = {
                 "job_requisition": job_requisition.id,
                 "full_name": request.data.get("full_name"),
@@ -839,12 +855,19 @@ class JobApplicationListCreateView(generics.GenericAPIView):
             while True:
                 doc_type = request.data.get(f"documents[{index}][document_type]")
                 doc_file = request.data.get(f"documents[{index}][file]")
+                upload_token = request.data.get(f"documents[{index}][upload_token]")
                 if doc_type and doc_file:
                     documents.append({
                         "document_type": doc_type,
                         "file": doc_file
                     })
                     index += 1
+                elif doc_type and upload_token:
+                    documents.append({
+                        "document_type": doc_type,
+                        "upload_token": upload_token
+                    })
+                    index += 1
                 else:
                     break
 
@@ -862,26 +885,229 @@ class JobApplicationListCreateView(generics.GenericAPIView):
                 logger.error(f"Validation failed: {serializer.errors}")
                 return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+            # Upload before opening the transaction so no connection or row lock waits on storage.
+            uploaded_documents = upload_application_documents(serializer.validated_data.get("documents", []))
+
+            # Duplicates are caught by the unique constraints rather than a pre-check query.
             try:
                 with transaction.atomic():
-                    application = serializer.save()
-                    logger.info(f"Application created: {application.id} for tenant {tenant.schema_name}")
-                    return Response({
-                        "detail": "Application submitted successfully.",
-                        "application_id": application.id
-                    }, status=status.HTTP_201_CREATED)
+                    application = serializer.save(documents=uploaded_documents)
             except IntegrityError as e:
-                logger.error(f"IntegrityError during application creation for email {email}: {str(e)}")
+                remove_application_documents(uploaded_documents)
+                logger.warning(f"Duplicate application attempt for email {email} for JobRequisition {job_requisition.id}: {str(e)}")
                 return Response({
                     "detail": "An application with this email already exists for this job."
                 }, status=status.HTTP_400_BAD_REQUEST)
+            except Exception:
+                remove_application_documents(uploaded_documents)
+                raise
+
+            logger.info(f"Application created: {application.id} for tenant {tenant.schema_name}")
+            return Response({
+                "detail": "Application submitted successfully.",
+                "application_id": application.id
+            }, status=status.HTTP_201_CREATED)
 
         except Exception as e:
             logger.exception(f"Unexpected error during job application submission: {str(e)}")
             return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 
-class JobApplicationDetailView(generics.RetrieveUpdateDestroyAPIView):
+class DocumentUploadIntentView(APIView):
+    """
+    Issues a short-lived signed URL for uploading one application document straight
+    to storage. The client PUTs the file there and submits the returned
+    `upload_token` as `documents[i][upload_token]` in place of the file.
+    """
+    permission_classes = [AllowAny]
+    parser_classes = [JSONParser, FormParser, MultiPartParser]
+
+    def post(self, request):
+        unique_link = request.data.get("unique_link")
+        tenant, job_requisition = resolve_tenant_from_unique_link(unique_link)
+        if not tenant or not job_requisition:
+            logger.error(f"Invalid or expired unique_link for upload intent: {unique_link}")
+            return Response({"detail": "Invalid or expired job link."}, status=status.HTTP_400_BAD_REQUEST)
+        request.tenant = tenant
+
+        serializer = DocumentUploadIntentSerializer(data=request.data, context={"request": request, "job_requisition": job_requisition})
+        if not serializer.is_valid():
+            logger.error(f"Upload intent validation failed: {serializer.errors}")
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            data = serializer.validated_data
+            intent = create_upload_intent(
+                request, job_requisition, data['document_type'], data['filename'], data['content_type'], data['size']
+            )
+            logger.info(f"Issued upload intent {intent['object_key']} for JobRequisition {job_requisition.id} in tenant {tenant.schema_name}")
+            return Response(intent, status=status.HTTP_201_CREATED)
+        except Exception as e:
+            logger.exception(f"Error creating upload intent for JobRequisition {job_requisition.id}: {str(e)}")
+            return Response({"detail": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class ApplicationDocumentLocalUploadView(APIView):
+    """
+    Receives direct uploads when APPLICATION_DOCUMENT_BACKEND is 'local'; with the
+    Supabase backend clients upload to the storage API instead.
+    """
+    permission_classes = [AllowAny]
+    authentication_classes = []
+    parser_classes = []
+
+    def put(self, request, token):
+        if getattr(settings, 'APPLICATION_DOCUMENT_BACKEND', 'supabase') != 'local':
+            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            path = store_local_upload(token, request.stream)
+            logger.info(f"Stored direct upload {path}")
+            return Response({"object_key": path}, status=status.HTTP_201_CREATED)
+        except ValueError as e:
+            logger.warning(f"Rejected direct upload: {str(e)}")
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+class ApplicationExportMixin(StreamingExportMixin):
+    """
+    Streams applications through JobApplicationFastSerializer instead of model instances.
+    """
+    http_method_names = ['get', 'head', 'options']
+    export_filename = 'applications'
+
+    def get_export_fieldnames(self):
+        return JobApplicationFastSerializer(fields=self.sparse_fields).field_names
+
+    def iter_export_rows(self, queryset):
+        fast_serializer = JobApplicationFastSerializer(fields=self.sparse_fields)
+        for row in fast_serializer.values(queryset).iterator(chunk_size=self.get_export_chunk_size()):
+            yield fast_serializer.to_representation(row)
+
+
+class JobApplicationExportView(ApplicationExportMixin, JobApplicationListCreateView):
+    """
+    Tenant-wide export, filtered like JobApplicationListCreateView.
+    """
+
+
+class JobApplicationsByRequisitionExportView(ApplicationExportMixin, JobApplicationsByRequisitionView):
+    """
+    Export of one requisition's applications, filtered like JobApplicationsByRequisitionView.
+    """
+
+
+class JobApplicationSearchView(SparseFieldsMixin, generics.GenericAPIView):
+    """
+    Ranked full-text search over applicant name, email, qualification, skills and
+    parsed resume text (`?q=`, web-search syntax). Uses the trigger-maintained
+    search_vector column and its GIN index; highlights are only built for the
+    returned rows. Optional filters: `job_requisition`, `status`.
+    """
+    serializer_class = JobApplicationSerializer
+    permission_classes = [IsAuthenticated, IsSubscribedAndAuthorized, BranchRestrictedPermission]
+    search_config = 'english'
+    default_limit = 20
+    max_limit = 100
+    # Control characters cannot occur in parsed text, so the markers survive HTML escaping intact.
+    highlight_start, highlight_stop = '\x02', '\x03'
+
+    def get_queryset(self):
+        tenant = self.request.tenant
+        connection.set_schema(tenant.schema_name)
+        queryset = JobApplication.active_objects.filter(tenant=tenant)
+        if self.request.user.role == 'recruiter' and self.request.user.branch:
+            queryset = queryset.filter(branch=self.request.user.branch)
+        job_requisition_id = self.request.query_params.get('job_requisition')
+        if job_requisition_id:
+            queryset = queryset.filter(job_requisition_id=job_requisition_id)
+        status_param = self.request.query_params.get('status')
+        if status_param:
+            queryset = queryset.filter(status=status_param)
+        return queryset
+
+    def get_limit(self):
+        try:
+            return max(1, min(int(self.request.query_params.get('limit', self.default_limit)), self.max_limit))
+        except ValueError:
+            return self.default_limit
+
+    def get(self, request, *args, **kwargs):
+        term = request.query_params.get('q', '').strip()
+        if not term:
+            return Response({"detail": "Query parameter 'q' is required."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            query = SearchQuery(term, search_type='websearch', config=self.search_config)
+            document = Concat(
+                F('qualification'), Value(' '), Coalesce('knowledge_skill', Value('')), Value(' '),
+                Coalesce('parsed_resume_text', Value('')), output_field=TextField()
+            )
+            # Postgres evaluates costly select-list expressions that the sort does not need
+            # after ORDER BY/LIMIT, so ts_headline only runs for the rows actually returned.
+            matches = (
+                self.get_queryset()
+                .filter(search_vector=query)
+                .annotate(
+                    rank=SearchRank(F('search_vector'), query),
+                    headline=SearchHeadline(
+                        document, query, config=self.search_config, start_sel=self.highlight_start,
+                        stop_sel=self.highlight_stop, max_fragments=2, fragment_delimiter=' … ',
+                    ),
+                )
+                .order_by('-rank', '-created_at', '-id')
+            )
+            fast_serializer = JobApplicationFastSerializer(fields=self.sparse_fields or JobApplicationSerializer.summary_fields)
+            results = []
+            for row in fast_serializer.values(matches, 'rank', 'headline')[:self.get_limit()]:
+                item = fast_serializer.to_representation(row)
+                item['rank'] = row['rank']
+                item['highlight'] = escape(row['headline'] or '').replace(
+                    self.highlight_start, '<mark>'
+                ).replace(self.highlight_stop, '</mark>')
+                results.append(item)
+            logger.info(f"Search returned {len(results)} applications for tenant {request.tenant.schema_name}")
+            return Response({"count": len(results), "results": results}, status=status.HTTP_200_OK)
+        except Exception as e:
+            logger.exception(f"Error searching job applications for tenant {request.tenant.schema_name}: {str(e)}")
+            return Response({"detail": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class JobApplicationFacetsView(APIView):
+    """
+    Pipeline counts by status, screening status, branch and source for a tenant,
+    or for one requisition when routed with `job_requisition_id`. Recruiters only
+    see their branch. Cached per tenant until an application write bumps the
+    APPLICATION_FACETS namespace.
+    """
+    permission_classes = [IsAuthenticated, IsSubscribedAndAuthorized, BranchRestrictedPermission]
+
+    def get(self, request, job_requisition_id=None):
+        tenant = request.tenant
+        try:
+            connection.set_schema(tenant.schema_name)
+            queryset = JobApplication.active_objects.filter(tenant=tenant)
+            if job_requisition_id:
+                if not JobRequisition.objects.filter(id=job_requisition_id, tenant=tenant).exists():
+                    logger.error(f"JobRequisition {job_requisition_id} not found for tenant {tenant.schema_name}")
+                    return Response({"detail": "Job requisition not found."}, status=status.HTTP_404_NOT_FOUND)
+                queryset = queryset.filter(job_requisition_id=job_requisition_id)
+            branch_id = None
+            if request.user.role == 'recruiter' and request.user.branch:
+                branch_id = request.user.branch_id
+                queryset = queryset.filter(branch_id=branch_id)
+
+            cache_key = tenant_cache_key(APPLICATION_FACETS, tenant.schema_name, job_requisition_id or '*', branch_id or '*')
+            facets = cache.get(cache_key)
+            if facets is None:
+                facets = application_facets(queryset)
+                cache.set(cache_key, facets, timeout=getattr(settings, 'APPLICATION_FACETS_CACHE_TIMEOUT', 600))
+                logger.debug(f"Computed application facets for tenant {tenant.schema_name}, requisition {job_requisition_id}")
+            return Response(facets, status=status.HTTP_200_OK)
+        except Exception as e:
+            logger.exception(f"Error computing application facets for tenant {tenant.schema_name}: {str(e)}")
+            return Response({"detail": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class JobApplicationDetailView(EagerLoadingMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = JobApplicationSerializer
     permission_classes = [IsAuthenticated, IsSubscribedAndAuthorized, BranchRestrictedPermission]
     lookup_field = 'id'
@@ -922,22 +1148,28 @@ class JobApplicationBulkDeleteView(generics.GenericAPIView):
                 applications = JobApplication.active_objects.filter(tenant=tenant, id__in=ids)
                 if request.user.role == 'recruiter' and request.user.branch:
                     applications = applications.filter(branch=request.user.branch)
-                count = applications.count()
-                if count == 0:
-                    logger.warning("No active applications found for provided IDs")
-                    return Response({"detail": "No applications found."}, status=status.HTTP_404_NOT_FOUND)
                 with transaction.atomic():
-                    for application in applications:
-                        application.soft_delete()
+                    rows = bulk_set_deleted(applications, ids, True, returning=('job_requisition',))
+                    count = len(rows)
+                    if count == 0:
+                        logger.warning("No active applications found for provided IDs")
+                        return Response({"detail": "No applications found."}, status=status.HTTP_404_NOT_FOUND)
+                    JobRequisition.adjust_application_counts(
+                        {k: -v for k, v in Counter(row['job_requisition_id'] for row in rows).items()}
+                    )
+                    bump_tenant_cache(APPLICATION_FACETS, tenant.schema_name)
+                    bulk_log_entries(JobApplication, [row['id'] for row in rows], LogEntry.Action.UPDATE,
+                                     changes={"is_deleted": ["False", "True"]}, request=request)
                     logger.info(f"Soft-deleted {count} applications for tenant {tenant.schema_name}")
             return Response({"detail": f"Soft-deleted {count} application(s)."}, status=status.HTTP_200_OK)
         except Exception as e:
             logger.error(f"Bulk soft delete failed: {str(e)}")
             return Response({"detail": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-class SoftDeletedJobApplicationsView(generics.ListAPIView):
+class SoftDeletedJobApplicationsView(SparseFieldsMixin, EagerLoadingMixin, generics.ListAPIView):
     serializer_class = JobApplicationSerializer
     permission_classes = [IsAuthenticated, IsSubscribedAndAuthorized, BranchRestrictedPermission]
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         tenant = self.request.tenant
@@ -957,13 +1189,16 @@ class SoftDeletedJobApplicationsView(generics.ListAPIView):
 
     def list(self, request, *args, **kwargs):
         try:
-            queryset = self.get_queryset()
-            serializer = self.get_serializer(queryset, many=True)
-            logger.info(f"Retrieved {queryset.count()} soft-deleted job applications for tenant {request.tenant.schema_name}")
+            fast_serializer = JobApplicationFastSerializer(fields=self.sparse_fields)
+            page = self.paginate_queryset(fast_serializer.values(self.filter_queryset(self.get_queryset()), *self.get_sparse_key_fields()))
+            logger.info(f"Retrieved {len(page)} soft-deleted job applications for tenant {request.tenant.schema_name}")
             return Response({
-                "detail": f"Retrieved {queryset.count()} soft-deleted application(s).",
-                "data": serializer.data
+                "detail": f"Retrieved {len(page)} soft-deleted application(s).",
+                **self.paginator.get_pagination_data(),
+                "data": fast_serializer.serialize(page)
             }, status=status.HTTP_200_OK)
+        except APIException:
+            raise
         except Exception as e:
             logger.exception(f"Error listing soft-deleted job applications for tenant {request.tenant.schema_name}: {str(e)}")
             return Response({"detail": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -989,15 +1224,19 @@ class RecoverSoftDeletedJobApplicationsView(generics.GenericAPIView):
                 applications = JobApplication.objects.filter(id__in=ids, tenant=tenant, is_deleted=True)
                 if request.user.role == 'recruiter' and request.user.branch:
                     applications = applications.filter(branch=request.user.branch)
-                if not applications.exists():
-                    logger.warning(f"No soft-deleted applications found for IDs {ids} in tenant {tenant.schema_name}")
-                    return Response({"detail": "No soft-deleted applications found."}, status=status.HTTP_404_NOT_FOUND)
 
-                recovered_count = 0
                 with transaction.atomic():
-                    for application in applications:
-                        application.restore()
-                        recovered_count += 1
+                    rows = bulk_set_deleted(applications, ids, False, returning=('job_requisition',))
+                    recovered_count = len(rows)
+                    if recovered_count == 0:
+                        logger.warning(f"No soft-deleted applications found for IDs {ids} in tenant {tenant.schema_name}")
+                        return Response({"detail": "No soft-deleted applications found."}, status=status.HTTP_404_NOT_FOUND)
+                    JobRequisition.adjust_application_counts(
+                        Counter(row['job_requisition_id'] for row in rows)
+                    )
+                    bump_tenant_cache(APPLICATION_FACETS, tenant.schema_name)
+                    bulk_log_entries(JobApplication, [row['id'] for row in rows], LogEntry.Action.UPDATE,
+                                     changes={"is_deleted": ["True", "False"]}, request=request)
 
                 logger.info(f"Successfully recovered {recovered_count} applications for tenant {tenant.schema_name}")
                 return Response({
@@ -1028,7 +1267,7 @@ class PermanentDeleteJobApplicationsView(generics.GenericAPIView):
             connection.set_schema(tenant.schema_name)
 
             with tenant_context(tenant):
-                applications = JobApplication.objects.select_related('job_requisition').filter(
+                applications = JobApplication.objects.filter(
                     id__in=ids, tenant=tenant, is_deleted=True
                 )
 
@@ -1040,13 +1279,11 @@ class PermanentDeleteJobApplicationsView(generics.GenericAPIView):
                     return Response({"detail": "No soft-deleted applications found."}, status=status.HTTP_404_NOT_FOUND)
 
                 with transaction.atomic():
-                    for app in applications:
-                        job_requisition = app.job_requisition
-                        if job_requisition and job_requisition.num_of_applications > 0:
-                            job_requisition.num_of_applications -= 1
-                            job_requisition.save()
+                    # num_of_applications was already decremented when these were soft-deleted.
+                    deleted_ids = list(applications.values_list('id', flat=True))
 
                     deleted_count = applications.delete()[0]
+                    bulk_log_entries(JobApplication, deleted_ids, LogEntry.Action.DELETE, request=request)
 
                 logger.info(f"Successfully permanently deleted {deleted_count} applications for tenant {tenant.schema_name}")
                 return Response({
@@ -1059,9 +1296,43 @@ class PermanentDeleteJobApplicationsView(generics.GenericAPIView):
 
 
 
-class ScheduleListCreateView(generics.GenericAPIView):
+def interview_placeholders(tenant, user, details):
+    """
+    interviewScheduling placeholder values that come from the interview details
+    and are the same for every candidate invited to it.
+    """
+    timezone_str = details.get('timezone', 'UTC')
+    interview_start_date_time = details['interview_start_date_time']
+    interview_end_date_time = details.get('interview_end_date_time')
+    interview_start_time = interview_start_date_time.astimezone(pytz.timezone(timezone_str)).strftime("%I:%M %p")
+    interview_end_time = interview_end_date_time.astimezone(pytz.timezone(timezone_str)).strftime("%I:%M %p") if interview_end_date_time else 'TBD'
+    location = details.get('meeting_link') if details['meeting_mode'] == 'Virtual' else details.get('interview_address', '')
+    return {
+        'Company': tenant.name,
+        'Insert Date': interview_start_date_time.strftime("%d %b %Y"),
+        'Insert Time': f"{interview_start_time} - {interview_end_time}",
+        'Meeting Mode': 'Zoom' if details['meeting_mode'] == 'Virtual' else 'On-site',
+        'Zoom / Google Meet / On-site – Insert Address or Link': location,
+        'Name(s) & Position(s)': user.get_full_name() or 'Hiring Team',
+        'Your Name': user.get_full_name() or 'Hiring Team',
+        'your.email@proliance.com': tenant.default_from_email or 'no-reply@proliance.com',
+        'Timezone': timezone_str,
+    }
+
+
+def application_placeholders(job_application):
+    job_requisition = job_application.job_requisition
+    return {
+        'Candidate Name': job_application.full_name,
+        'Position': job_requisition.title,
+        'Dashboard Link': f"{settings.WEB_PAGE_URL}/application-dashboard/{job_requisition.job_application_code}/{job_application.email}/{job_requisition.unique_link}",
+    }
+
+
+class ScheduleListCreateView(SparseFieldsMixin, EagerLoadingMixin, generics.GenericAPIView):
     serializer_class = ScheduleSerializer
     permission_classes = [IsAuthenticated, IsSubscribedAndAuthorized, BranchRestrictedPermission]
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         tenant = self.request.tenant
@@ -1083,10 +1354,12 @@ class ScheduleListCreateView(generics.GenericAPIView):
 
     def get(self, request, *args, **kwargs):
         try:
-            queryset = self.get_queryset()
-            serializer = self.get_serializer(queryset.order_by('-created_at'), many=True)
-            logger.info(f"Retrieved {queryset.count()} schedules for tenant {request.tenant.schema_name}")
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            page = self.paginate_queryset(self.filter_queryset(self.get_queryset()))
+            serializer = self.get_serializer(page, many=True)
+            logger.info(f"Retrieved {len(page)} schedules for tenant {request.tenant.schema_name}")
+            return self.get_paginated_response(serializer.data)
+        except APIException:
+            raise
         except Exception as e:
             logger.exception(f"Error retrieving schedules for tenant {request.tenant.schema_name}: {str(e)}")
             return Response({"detail": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -1129,12 +1402,12 @@ class ScheduleListCreateView(generics.GenericAPIView):
                 return Response({"detail": "At least one job application ID is required."}, status=status.HTTP_400_BAD_REQUEST)
 
             created_schedules = []
+            queued_emails = []
             with tenant_context(tenant):
                 try:
-                    config = TenantConfig.objects.get(tenant=tenant)
-                    email_template = config.email_templates.get('interviewScheduling', {})
-                    template_content = email_template.get('content', '')
-                    is_auto_sent = email_template.get('is_auto_sent', False)
+                    email_template = get_email_template(tenant, 'interviewScheduling')
+                    template_content = email_template.content if email_template else ''
+                    is_auto_sent = bool(email_template and email_template.is_auto_sent)
                 except TenantConfig.DoesNotExist:
                     logger.warning(f"TenantConfig not found for tenant {tenant.schema_name}")
                     template_content = ''
@@ -1153,32 +1426,10 @@ class ScheduleListCreateView(generics.GenericAPIView):
                         return Response({"detail": f"Job application {job_application_id} not found."}, status=status.HTTP_404_NOT_FOUND)
 
                     with transaction.atomic():
-                        timezone_str = serializer.validated_data.get('timezone', 'UTC')
-                        interview_start_date_time = serializer.validated_data['interview_start_date_time']
-                        interview_end_date_time = serializer.validated_data.get('interview_end_date_time')
-                        interview_date = interview_start_date_time.strftime("%d %b %Y")
-                        interview_start_time = interview_start_date_time.astimezone(pytz.timezone(timezone_str)).strftime("%I:%M %p")
-                        interview_end_time = interview_end_date_time.astimezone(pytz.timezone(timezone_str)).strftime("%I:%M %p") if interview_end_date_time else 'TBD'
-                        location = serializer.validated_data.get('meeting_link') if serializer.validated_data['meeting_mode'] == 'Virtual' else serializer.validated_data.get('interview_address', '')
-                        placeholders = {
-                            '[Candidate Name]': job_application.full_name,
-                            '[Position]': job_application.job_requisition.title,
-                            '[Company]': tenant.name,
-                            '[Insert Date]': interview_date,
-                            '[Insert Time]': f"{interview_start_time} - {interview_end_time}",
-                            '[Meeting Mode]': 'Zoom' if serializer.validated_data['meeting_mode'] == 'Virtual' else 'On-site',
-                            '[Zoom / Google Meet / On-site – Insert Address or Link]': location,
-                            '[Name(s) & Position(s)]': request.user.get_full_name() or 'Hiring Team',
-                            '[Your Name]': request.user.get_full_name() or 'Hiring Team',
-                            '[your.email@proliance.com]': tenant.default_from_email or 'no-reply@proliance.com',
-                            '[Dashboard Link]': f"{settings.WEB_PAGE_URL}/application-dashboard/{job_application.job_requisition.job_application_code}/{job_application.email}/{job_application.job_requisition.unique_link}",
-                            '[Timezone]': timezone_str,
-                        }
-
                         email_body = data.get('message', template_content)
                         if not data.get('message') and template_content:
-                            for placeholder, value in placeholders.items():
-                                email_body = email_body.replace(placeholder, str(value))
+                            placeholders = interview_placeholders(tenant, request.user, serializer.validated_data)
+                            email_body = email_template.render({**placeholders, **application_placeholders(job_application)})
 
                         schedule = serializer.save(
                             tenant=tenant,
@@ -1189,38 +1440,23 @@ class ScheduleListCreateView(generics.GenericAPIView):
                         created_schedules.append(schedule.id)
 
                         if is_auto_sent:
-                            try:
-                                email_connection = configure_email_backend(tenant)
-                                logger.info(f"Email configuration for tenant {tenant.schema_name}: "
-                                            f"host={tenant.email_host}, "
-                                            f"port={tenant.email_port}, "
-                                            f"use_ssl={tenant.email_use_ssl}, "
-                                            f"host_user={tenant.email_host_user}, "
-                                            f"host_password={'*' * len(tenant.email_host_password) if tenant.email_host_password else None}, "
-                                            f"default_from_email={tenant.default_from_email}")
-
-                                email_subject = f"Interview Schedule for {job_application.job_requisition.title}"
-                                email = EmailMessage(
-                                    subject=email_subject,
-                                    body=email_body,
-                                    from_email=tenant.default_from_email or 'no-reply@proliance.com',
-                                    to=[job_application.email],
-                                    connection=email_connection,
-                                )
-                                email.content_subtype = 'html'
-                                email.send(fail_silently=False)
-                                logger.info(f"Email sent to {job_application.email} for schedule {schedule.id} in tenant {tenant.schema_name}")
-                            except Exception as email_error:
-                                logger.exception(f"Failed to send email for schedule {schedule.id} to {job_application.email}: {str(email_error)}")
-                                return Response({
-                                    "detail": "Failed to send confirmation email due to invalid email configuration.",
-                                    "error": str(email_error),
-                                    "suggestion": "Please check the email settings in the tenant configuration. Ensure that only one of EMAIL_USE_TLS or EMAIL_USE_SSL is set to True."
-                                }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+                            email = enqueue_email(
+                                tenant,
+                                subject=f"Interview Schedule for {job_application.job_requisition.title}",
+                                body=email_body,
+                                to=job_application.email,
+                                from_email=tenant.default_from_email or 'no-reply@proliance.com',
+                                category='interview_invitation',
+                                reference=schedule.id,
+                                content_subtype='html',
+                            )
+                            queued_emails.append(email.id)
+                            logger.info(f"Email queued to {job_application.email} for schedule {schedule.id} in tenant {tenant.schema_name}")
 
             return Response({
                 "detail": "Schedules created successfully.",
-                "schedule_ids": created_schedules
+                "schedule_ids": created_schedules,
+                "email_ids": queued_emails
             }, status=status.HTTP_201_CREATED)
 
         except Exception as e:
@@ -1231,6 +1467,136 @@ class ScheduleListCreateView(generics.GenericAPIView):
 
 
 
+class ScheduleBulkCreateView(APIView):
+    """
+    Schedules the same interview for many job applications in one transaction.
+    Body: the interview details accepted by ScheduleListCreateView plus
+    "job_applications": [ids]. Applications are fetched in one query, schedule
+    ids are allocated as a block, and the schedules and their invitation emails
+    are each inserted with one statement. An application that can't be
+    scheduled doesn't stop the others; every id gets a result: scheduled,
+    not_found, not_shortlisted, already_scheduled or duplicate.
+    """
+    permission_classes = [IsAuthenticated, IsSubscribedAndAuthorized, BranchRestrictedPermission]
+    parser_classes = [JSONParser]
+
+    def post(self, request):
+        tenant = request.tenant
+        serializer = ScheduleBulkCreateSerializer(data=request.data, context={'request': request})
+        if not serializer.is_valid():
+            logger.error(f"Bulk schedule validation failed: {serializer.errors}")
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        details = dict(serializer.validated_data)
+        job_application_ids = details.pop('job_applications')
+        message = details.pop('message', None)
+        try:
+            with tenant_context(tenant):
+                try:
+                    email_template = get_email_template(tenant, 'interviewScheduling')
+                except TenantConfig.DoesNotExist:
+                    logger.warning(f"TenantConfig not found for tenant {tenant.schema_name}")
+                    email_template = None
+                is_auto_sent = bool(email_template and email_template.is_auto_sent)
+
+                applications = JobApplication.active_objects.filter(
+                    tenant=tenant, id__in=set(job_application_ids)
+                ).select_related('job_requisition', 'branch')
+                if request.user.role == 'recruiter' and request.user.branch:
+                    applications = applications.filter(branch=request.user.branch)
+                applications = {application.id: application for application in applications}
+                already_scheduled = set(
+                    Schedule.active_objects.filter(job_application_id__in=list(applications), status='scheduled')
+                    .values_list('job_application_id', flat=True)
+                )
+
+                results, to_schedule, seen = [], [], set()
+                for job_application_id in job_application_ids:
+                    application = applications.get(job_application_id)
+                    if job_application_id in seen:
+                        result = 'duplicate'
+                    elif application is None:
+                        result = 'not_found'
+                    elif application.status != 'shortlisted':
+                        result = 'not_shortlisted'
+                    elif job_application_id in already_scheduled:
+                        result = 'already_scheduled'
+                    else:
+                        result = 'scheduled'
+                        to_schedule.append(application)
+                    seen.add(job_application_id)
+                    results.append({"job_application": job_application_id, "result": result})
+
+                shared = interview_placeholders(tenant, request.user, details) if is_auto_sent and not message else {}
+                bodies = [
+                    message or (email_template.render({**shared, **application_placeholders(application)}) if shared else '')
+                    for application in to_schedule
+                ]
+
+                schedule_ids, email_ids = {}, {}
+                if to_schedule:
+                    with transaction.atomic():
+                        ids = Schedule.allocate_ids(tenant, len(to_schedule))
+                        schedules = Schedule.objects.bulk_create([
+                            Schedule(
+                                id=schedule_id,
+                                tenant=tenant,
+                                job_application=application,
+                                branch=request.user.branch or application.branch,
+                                message=body if is_auto_sent else '',
+                                **details,
+                            )
+                            for schedule_id, application, body in zip(ids, to_schedule, bodies)
+                        ])
+                        schedule_ids = {schedule.job_application_id: schedule.id for schedule in schedules}
+                        if is_auto_sent:
+                            emails = enqueue_emails(tenant, [
+                                {
+                                    'subject': f"Interview Schedule for {application.job_requisition.title}",
+                                    'body': body,
+                                    'to': application.email,
+                                    'from_email': tenant.default_from_email or 'no-reply@proliance.com',
+                                    'category': 'interview_invitation',
+                                    'reference': schedule.id,
+                                    'content_subtype': 'html',
+                                }
+                                for schedule, application, body in zip(schedules, to_schedule, bodies)
+                            ])
+                            email_ids = {
+                                schedule.job_application_id: email.id for schedule, email in zip(schedules, emails)
+                            }
+        except IntegrityError as e:
+            # Lost a race with another request scheduling one of the same applications.
+            logger.warning(f"Bulk schedule conflict for tenant {tenant.schema_name}: {str(e)}")
+            return Response(
+                {"detail": "One or more applications were scheduled concurrently. Please retry."},
+                status=status.HTTP_409_CONFLICT
+            )
+        except Exception as e:
+            logger.exception(f"Error bulk creating schedules for tenant {tenant.schema_name}: {str(e)}")
+            return Response({"detail": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+        for result in results:
+            if result['result'] == 'scheduled':
+                result['schedule_id'] = schedule_ids[result['job_application']]
+                result['email_id'] = email_ids.get(result['job_application'])
+        logger.info(f"Bulk scheduled {len(schedule_ids)} of {len(job_application_ids)} applications for tenant {tenant.schema_name}")
+        return Response({
+            "detail": f"Scheduled {len(schedule_ids)} of {len(job_application_ids)} application(s).",
+            "scheduled": len(schedule_ids),
+            "skipped": len(job_application_ids) - len(schedule_ids),
+            "results": results,
+        }, status=status.HTTP_201_CREATED if schedule_ids else status.HTTP_200_OK)
+
+
+class ScheduleExportView(StreamingExportMixin, ScheduleListCreateView):
+    """
+    Streams schedules filtered like ScheduleListCreateView (including ?status=).
+    """
+    http_method_names = ['get', 'head', 'options']
+    export_filename = 'schedules'
+
+
 class TimezoneChoicesView(APIView):
     permission_classes = [IsAuthenticated, IsSubscribedAndAuthorized]
 
@@ -1240,7 +1606,7 @@ class TimezoneChoicesView(APIView):
         ]
         return Response(timezone_choices, status=status.HTTP_200_OK)
 
-class ScheduleDetailView(generics.RetrieveUpdateDestroyAPIView):
+class ScheduleDetailView(EagerLoadingMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = ScheduleSerializer
     permission_classes = [IsAuthenticated, IsSubscribedAndAuthorized, BranchRestrictedPermission]
     lookup_field = 'id'
@@ -1379,15 +1745,15 @@ class ScheduleBulkDeleteView(generics.GenericAPIView):
                 schedules = Schedule.active_objects.filter(id__in=ids, tenant=tenant)
                 if request.user.role == 'recruiter' and request.user.branch:
                     schedules = schedules.filter(branch=request.user.branch)
-                if not schedules.exists():
-                    logger.warning(f"No active schedules found for IDs {ids} in tenant {tenant.schema_name}")
-                    return Response({"detail": "No schedules found."}, status=status.HTTP_404_NOT_FOUND)
 
-                deleted_count = 0
                 with transaction.atomic():
-                    for schedule in schedules:
-                        schedule.soft_delete()
-                        deleted_count += 1
+                    rows = bulk_set_deleted(schedules, ids, True)
+                    deleted_count = len(rows)
+                    if deleted_count == 0:
+                        logger.warning(f"No active schedules found for IDs {ids} in tenant {tenant.schema_name}")
+                        return Response({"detail": "No schedules found."}, status=status.HTTP_404_NOT_FOUND)
+                    bulk_log_entries(Schedule, [row['id'] for row in rows], LogEntry.Action.UPDATE,
+                                     changes={"is_deleted": ["False", "True"]}, request=request)
 
                 logger.info(f"Successfully soft-deleted {deleted_count} schedules for tenant {tenant.schema_name}")
                 return Response({
@@ -1398,9 +1764,10 @@ class ScheduleBulkDeleteView(generics.GenericAPIView):
             logger.exception(f"Error during bulk soft deletion of schedules for tenant {tenant.schema_name if tenant else 'unknown'}: {str(e)}")
             return Response({"detail": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-class SoftDeletedSchedulesView(generics.ListAPIView):
+class SoftDeletedSchedulesView(SparseFieldsMixin, EagerLoadingMixin, generics.ListAPIView):
     serializer_class = ScheduleSerializer
     permission_classes = [IsAuthenticated, IsSubscribedAndAuthorized, BranchRestrictedPermission]
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         tenant = self.request.tenant
@@ -1420,13 +1787,16 @@ class SoftDeletedSchedulesView(generics.ListAPIView):
 
     def list(self, request, *args, **kwargs):
         try:
-            queryset = self.get_queryset()
-            serializer = self.get_serializer(queryset, many=True)
-            logger.info(f"Retrieved {queryset.count()} soft-deleted schedules for tenant {request.tenant.schema_name}")
+            page = self.paginate_queryset(self.filter_queryset(self.get_queryset()))
+            serializer = self.get_serializer(page, many=True)
+            logger.info(f"Retrieved {len(page)} soft-deleted schedules for tenant {request.tenant.schema_name}")
             return Response({
-                "detail": f"Retrieved {queryset.count()} soft-deleted schedule(s).",
+                "detail": f"Retrieved {len(page)} soft-deleted schedule(s).",
+                **self.paginator.get_pagination_data(),
                 "data": serializer.data
             }, status=status.HTTP_200_OK)
+        except APIException:
+            raise
         except Exception as e:
             logger.exception(f"Error listing soft-deleted schedules for tenant {request.tenant.schema_name}: {str(e)}")
             return Response({"detail": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -1452,15 +1822,15 @@ class RecoverSoftDeletedSchedulesView(generics.GenericAPIView):
                 schedules = Schedule.objects.filter(id__in=ids, tenant=tenant, is_deleted=True)
                 if request.user.role == 'recruiter' and request.user.branch:
                     schedules = schedules.filter(branch=request.user.branch)
-                if not schedules.exists():
-                    logger.warning(f"No soft-deleted schedules found for IDs {ids} in tenant {tenant.schema_name}")
-                    return Response({"detail": "No soft-deleted schedules found."}, status=status.HTTP_404_NOT_FOUND)
 
-                recovered_count = 0
                 with transaction.atomic():
-                    for schedule in schedules:
-                        schedule.restore()
-                        recovered_count += 1
+                    rows = bulk_set_deleted(schedules, ids, False)
+                    recovered_count = len(rows)
+                    if recovered_count == 0:
+                        logger.warning(f"No soft-deleted schedules found for IDs {ids} in tenant {tenant.schema_name}")
+                        return Response({"detail": "No soft-deleted schedules found."}, status=status.HTTP_404_NOT_FOUND)
+                    bulk_log_entries(Schedule, [row['id'] for row in rows], LogEntry.Action.UPDATE,
+                                     changes={"is_deleted": ["True", "False"]}, request=request)
 
                 logger.info(f"Successfully recovered {recovered_count} schedules for tenant {tenant.schema_name}")
                 return Response({
@@ -1513,50 +1883,96 @@ class ComplianceStatusUpdateView(APIView):
     serializer_class = ComplianceStatusSerializer  # Added serializer_class
     permission_classes = [IsAuthenticated, IsSubscribedAndAuthorized, BranchRestrictedPermission]
 
-    def post(self, request, application_id, item_id):
+    def post(self, request, job_application_id, item_id):
         try:
             tenant = request.tenant
             connection.set_schema(tenant.schema_name)
             with tenant_context(tenant):
                 try:
-                    application = JobApplication.active_objects.get(id=application_id, tenant=tenant)
+                    application = JobApplication.active_objects.only('id', 'branch_id').get(id=job_application_id, tenant=tenant)
                 except JobApplication.DoesNotExist:
-                    logger.error(f"JobApplication {application_id} not found for tenant {tenant.schema_name}")
+                    logger.error(f"JobApplication {job_application_id} not found for tenant {tenant.schema_name}")
                     return Response({"detail": "Job application not found."}, status=status.HTTP_404_NOT_FOUND)
 
                 # if request.user.role == 'recruiter' and request.user.branch and application.branch != request.user.branch:
-                if request.user.branch and application.branch != request.user.branch:
-                    logger.error(f"User {request.user.id} not authorized to access application {application_id} in branch {application.branch}")
+                if request.user.branch and application.branch_id != request.user.branch.id:
+                    logger.error(f"User {request.user.id} not authorized to access application {job_application_id} in branch {application.branch_id}")
                     return Response({"detail": "Not authorized to access this application."}, status=status.HTTP_403_FORBIDDEN)
 
-                status = request.data.get('status')
+                item_status = request.data.get('status')
                 notes = request.data.get('notes', '')
-                if status not in ['pending', 'passed', 'failed']:
-                    logger.error(f"Invalid compliance status: {status}")
+                if item_status not in ['pending', 'passed', 'failed']:
+                    logger.error(f"Invalid compliance status: {item_status}")
                     return Response({"detail": "Invalid status. Must be 'pending', 'passed', or 'failed'."}, status=status.HTTP_400_BAD_REQUEST)
 
                 updated_item = application.update_compliance_status(
                     item_id=item_id,
-                    status=status,
+                    status=item_status,
                     checked_by=request.user,
                     notes=notes
                 )
-                logger.info(f"Compliance status updated for item {item_id} in application {application_id}")
+                logger.info(f"Compliance status updated for item {item_id} in application {job_application_id}")
                 return Response({
                     "detail": "Compliance status updated successfully.",
                     "compliance_item": updated_item
                 }, status=status.HTTP_200_OK)
 
         except ValueError as ve:
-            logger.error(f"Compliance item {item_id} not found in application {application_id}: {str(ve)}")
+            logger.error(f"Compliance item {item_id} not found in application {job_application_id}: {str(ve)}")
             return Response({"detail": str(ve)}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
-            logger.exception(f"Error updating compliance status for application {application_id}: {str(e)}")
+            logger.exception(f"Error updating compliance status for application {job_application_id}: {str(e)}")
             return Response({"detail": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
 
 
+class ComplianceReviewBatchView(APIView):
+    """
+    Applies many compliance reviews, possibly across applications, in one UPDATE.
+    Body: {"reviews": [{"application_id", "item_id", "status", "notes"}, ...]}.
+    Branch-restricted users can only touch applications in their branch; reviews
+    that don't match an active application and item come back as `not_found`.
+    """
+    permission_classes = [IsAuthenticated, IsSubscribedAndAuthorized, BranchRestrictedPermission]
+    parser_classes = [JSONParser]
+
+    def post(self, request):
+        serializer = ComplianceReviewBatchSerializer(data=request.data)
+        if not serializer.is_valid():
+            logger.error(f"Compliance review batch validation failed: {serializer.errors}")
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        tenant = request.tenant
+        reviews = serializer.validated_data['reviews']
+        try:
+            with tenant_context(tenant):
+                updated = JobApplication.review_compliance_items(
+                    tenant, reviews, checked_by=request.user, branch_id=request.user.branch_id
+                )
+        except Exception as e:
+            logger.exception(f"Error applying compliance review batch for tenant {tenant.schema_name}: {str(e)}")
+            return Response({"detail": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+        results = []
+        for review in reviews:
+            item = updated.get((review['application_id'], review['item_id']))
+            results.append({
+                "application_id": review['application_id'],
+                "item_id": review['item_id'],
+                "result": "updated" if item else "not_found",
+                "compliance_item": item,
+            })
+        updated_count = sum(result['result'] == 'updated' for result in results)
+        logger.info(f"Applied {updated_count} of {len(reviews)} compliance reviews for tenant {tenant.schema_name}")
+        return Response({
+            "detail": f"Updated {updated_count} of {len(reviews)} compliance item(s).",
+            "updated": updated_count,
+            "not_found": len(reviews) - updated_count,
+            "results": results,
+        }, status=status.HTTP_200_OK)
+
+
 class ApplicantComplianceUploadView(APIView):
     permission_classes = []  # No authentication required
 
@@ -1633,46 +2049,36 @@ class ApplicantComplianceUploadView(APIView):
                         'uploaded_at': timezone.now().isoformat()
                     })
 
-                # Update compliance_status
-                updated_compliance_status = application.compliance_status.copy() if application.compliance_status else []
-                for doc_id, doc_name, doc_data in zip(document_ids, document_names, documents_data):
-                    for item in updated_compliance_status:
-                        if str(item.get('id')) == str(doc_id):
-                            item['name'] = compliance_checklist[doc_id]  # Ensure name is set correctly
-                            item['document'] = {
-                                'file_url': doc_data['file_url'],
-                                'uploaded_at': doc_data['uploaded_at']
-                            }
-                            item['status'] = 'uploaded'
-                            item['notes'] = ''
-                            break
-                    else:
-                        # If the compliance item doesn't exist, create a new one
-                        updated_compliance_status.append({
-                            'id': doc_id,
-                            'name': compliance_checklist[doc_id],
-                            'description': '',
-                            'required': True,
-                            'status': 'uploaded',
-                            'checked_by': None,
-                            'checked_at': None,
-                            'notes': '',
-                            'document': {
-                                'file_url': doc_data['file_url'],
-                                'uploaded_at': doc_data['uploaded_at']
-                            }
-                        })
-
-                # Update the application
-                with transaction.atomic():
-                    application.compliance_status = updated_compliance_status
-                    application.save()
+                # Patch only the uploaded items; items missing from compliance_status are appended.
+                patches, additions = {}, {}
+                for doc_id, doc_data in zip(document_ids, documents_data):
+                    document = {
+                        'file_url': doc_data['file_url'],
+                        'uploaded_at': doc_data['uploaded_at']
+                    }
+                    patches[doc_id] = {
+                        'name': compliance_checklist[doc_id],  # Ensure name is set correctly
+                        'document': document,
+                        'status': 'uploaded',
+                        'notes': ''
+                    }
+                    additions[doc_id] = {
+                        'id': doc_id,
+                        'name': compliance_checklist[doc_id],
+                        'description': '',
+                        'required': True,
+                        'status': 'uploaded',
+                        'checked_by': None,
+                        'checked_at': None,
+                        'notes': '',
+                        'document': document
+                    }
+                application.patch_compliance_items(patches, additions)
 
-                # Serialize the updated application
-                serializer = JobApplicationSerializer(application, context={'request': request})
+                compliance_status = ComplianceStatusSerializer(application.compliance_status, many=True).data
                 return Response({
                     "detail": "Compliance documents uploaded successfully.",
-                    "compliance_status": serializer.data['compliance_status']
+                    "compliance_status": JobApplicationSerializer.normalize_compliance_status(compliance_status)
                 }, status=status.HTTP_200_OK)
 
         except Exception as e:
@@ -0,0 +1,141 @@
+# lumina_care/eager_loading.py
+import logging
+from collections.abc import Mapping
+from functools import lru_cache, wraps
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import QuerySet
+from django.test.utils import CaptureQueriesContext
+from rest_framework import serializers
+from rest_framework.relations import PrimaryKeyRelatedField
+
+logger = logging.getLogger('core')
+
+
+def _relation_paths(model, source_attrs):
+    """
+    Walk a dotted serializer source across model relations. Returns the
+    select_related path (single-valued hops) and, if a multi-valued relation is
+    crossed, the prefetch_related path that ends there.
+    """
+    select, prefetch, path = [], None, []
+    for attr in source_attrs:
+        try:
+            field = model._meta.get_field(attr)
+        except Exception:
+            break
+        if not field.is_relation or field.related_model is None:
+            break
+        path.append(attr)
+        if field.many_to_many or field.one_to_many:
+            prefetch = '__'.join(path)
+            break
+        select.append('__'.join(path))
+        model = field.related_model
+    return select, prefetch, model
+
+
+def _collect(serializer, model, prefix, select, prefetch, names=None):
+    for name, field in serializer.fields.items():
+        if names is not None and name not in names:
+            continue
+        if field.write_only or field.source == '*':
+            continue
+        source_attrs = field.source.split('.')
+        if isinstance(field, serializers.SerializerMethodField):
+            continue
+        if isinstance(field, PrimaryKeyRelatedField) and len(source_attrs) == 1:
+            # Serialized from the local <name>_id column; no join needed.
+            continue
+
+        field_select, field_prefetch, related_model = _relation_paths(model, source_attrs)
+        if field_prefetch:
+            prefetch.add(prefix + field_prefetch)
+        elif field_select:
+            select.add(prefix + field_select[-1])
+            nested = field.child if isinstance(field, serializers.ListSerializer) else field
+            if isinstance(nested, serializers.BaseSerializer):
+                _collect(nested, related_model, f"{prefix}{field_select[-1]}__", select, prefetch)
+
+    for path in _hint_paths(getattr(serializer, 'eager_select_related', ()), names):
+        select.add(prefix + path)
+    for path in _hint_paths(getattr(serializer, 'eager_prefetch_related', ()), names):
+        prefetch.add(prefix + path)
+
+
+def _hint_paths(hints, names):
+    """
+    Hints are either a flat tuple of paths, or a mapping of field name to the
+    paths that field reads so they are only applied when the field is rendered.
+    """
+    if not isinstance(hints, Mapping):
+        return hints
+    return [path for name, paths in hints.items() if names is None or name in names for path in paths]
+
+
+@lru_cache(maxsize=None)
+def eager_loading_paths(serializer_class, fields=None):
+    """
+    select_related/prefetch_related paths needed to serialize `serializer_class`
+    without per-row queries. Declared fields and nested serializers are read from
+    their sources; SerializerMethodFields can declare what they touch through
+    `eager_select_related` / `eager_prefetch_related` class attributes.
+    `fields` limits the top-level fields considered (see lumina_care.sparse_fields).
+    """
+    model = getattr(getattr(serializer_class, 'Meta', None), 'model', None)
+    if model is None:
+        return (), ()
+    serializer = serializer_class()
+    select, prefetch = set(), set()
+    _collect(serializer, model, '', select, prefetch, names=fields)
+    # Drop paths already implied by a longer select_related path.
+    select = {path for path in select if not any(other.startswith(path + '__') for other in select)}
+    return tuple(sorted(select)), tuple(sorted(prefetch))
+
+
+def apply_eager_loading(queryset, serializer_class, fields=None):
+    if not isinstance(queryset, QuerySet):
+        return queryset
+    select, prefetch = eager_loading_paths(serializer_class, fields)
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    return queryset
+
+
+class EagerLoadingMixin:
+    """
+    Generic view mixin that eager-loads whatever the view's serializer reads.
+    Applied in filter_queryset, so views keep overriding get_queryset freely;
+    custom list/get methods must pass their queryset through
+    self.filter_queryset() like the generic views do.
+    Set EAGER_LOADING_DEBUG = True to log any queries still issued while the
+    serializer renders, which points at a missing hint.
+    """
+
+    def filter_queryset(self, queryset):
+        return apply_eager_loading(super().filter_queryset(queryset), self.get_serializer_class())
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        if getattr(settings, 'EAGER_LOADING_DEBUG', False):
+            serializer.to_representation = self._log_serialization_queries(serializer.to_representation)
+        return serializer
+
+    def _log_serialization_queries(self, to_representation):
+        view_name = type(self).__name__
+
+        @wraps(to_representation)
+        def wrapper(*args, **kwargs):
+            with CaptureQueriesContext(connection) as context:
+                data = to_representation(*args, **kwargs)
+            if context.captured_queries:
+                statements = '\n'.join(query['sql'] for query in context.captured_queries)
+                logger.warning(
+                    f"{view_name} issued {len(context.captured_queries)} queries during serialization:\n{statements}"
+                )
+            return data
+
+        return wrapper
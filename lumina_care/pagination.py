@@ -0,0 +1,163 @@
+# lumina_care/pagination.py
+import base64
+import json
+import logging
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+logger = logging.getLogger('core')
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination over a unique ordering, ('-created_at', '-id') by default.
+    Each page is fetched with a WHERE clause on the last seen key instead of an OFFSET,
+    so cost stays flat however deep the client pages. Views can override the key with
+    a `keyset_ordering` attribute. COUNT(*) only runs when `?include_count=true`.
+    """
+    page_size = getattr(settings, 'KEYSET_PAGE_SIZE', 50)
+    max_page_size = getattr(settings, 'KEYSET_MAX_PAGE_SIZE', 500)
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    count_query_param = 'include_count'
+    ordering = ('-created_at', '-id')
+    invalid_cursor_message = 'Invalid cursor.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.ordering = tuple(getattr(view, 'keyset_ordering', None) or self.ordering)
+        self.page_size = self.get_page_size(request)
+        self.model = queryset.model
+
+        position, reverse = self.decode_cursor(request)
+        self.count = queryset.count() if self.wants_count(request) else None
+
+        order = self._invert(self.ordering) if reverse else self.ordering
+        queryset = queryset.order_by(*order)
+        if position is not None:
+            queryset = queryset.filter(self._seek_filter(order, position))
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        self.has_next = (position is not None) if reverse else has_more
+        self.has_previous = has_more if reverse else (position is not None)
+        self.page = rows
+        return rows
+
+    def get_page_size(self, request):
+        try:
+            requested = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(requested, self.max_page_size))
+
+    def wants_count(self, request):
+        return request.query_params.get(self.count_query_param, '').lower() in ('1', 'true', 'yes')
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self._link(self._position(self.page[-1]), reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self._link(self._position(self.page[0]), reverse=True)
+
+    def get_pagination_data(self):
+        """
+        Pagination keys for views that wrap results in their own envelope.
+        """
+        data = OrderedDict()
+        if self.count is not None:
+            data['count'] = self.count
+        data['next'] = self.get_next_link()
+        data['previous'] = self.get_previous_link()
+        return data
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([*self.get_pagination_data().items(), ('results', data)]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['next', 'previous', 'results'],
+            'properties': {
+                'count': {'type': 'integer', 'example': 123},
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {'name': self.cursor_query_param, 'required': False, 'in': 'query',
+             'description': 'Opaque pagination cursor.', 'schema': {'type': 'string'}},
+            {'name': self.page_size_query_param, 'required': False, 'in': 'query',
+             'description': f'Number of results per page (max {self.max_page_size}).', 'schema': {'type': 'integer'}},
+            {'name': self.count_query_param, 'required': False, 'in': 'query',
+             'description': 'Include the total row count.', 'schema': {'type': 'boolean'}},
+        ]
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token.encode('ascii')).decode('utf-8'))
+            fields = [name.lstrip('-') for name in self.ordering]
+            values = payload['p']
+            if len(values) != len(fields):
+                raise ValueError("cursor does not match ordering")
+            position = [self.model._meta.get_field(name).to_python(value) for name, value in zip(fields, values)]
+            return position, bool(payload.get('r'))
+        except Exception as e:
+            logger.warning(f"Rejected pagination cursor {token!r}: {str(e)}")
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, position, reverse):
+        # default=str keeps full microsecond precision on datetimes, which the seek needs.
+        payload = json.dumps({'p': position, 'r': int(reverse)}, default=str, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+    def _link(self, position, reverse):
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(position, reverse))
+
+    def _position(self, obj):
+        fields = [self.model._meta.get_field(name.lstrip('-')) for name in self.ordering]
+        if isinstance(obj, dict):
+            # Rows from .values() querysets are keyed by field name.
+            return [obj[field.name] if field.name in obj else obj[field.attname] for field in fields]
+        return [getattr(obj, field.attname) for field in fields]
+
+    @staticmethod
+    def _invert(ordering):
+        return tuple(name[1:] if name.startswith('-') else f'-{name}' for name in ordering)
+
+    @staticmethod
+    def _seek_filter(ordering, position):
+        """
+        Rows strictly after `position` in `ordering`:
+        (a > x) OR (a = x AND b > y) OR ... with < for descending keys.
+        """
+        condition = Q()
+        for index, name in enumerate(ordering):
+            field = name.lstrip('-')
+            lookup = 'lt' if name.startswith('-') else 'gt'
+            branch = Q(**{f'{field}__{lookup}': position[index]})
+            for prior, prior_name in enumerate(ordering[:index]):
+                branch &= Q(**{prior_name.lstrip('-'): position[prior]})
+            condition |= branch
+        return condition
@@ -40,6 +40,7 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'django.contrib.sites',
+    'django.contrib.postgres',
     'django_crontab',
     'django_filters',
     'rest_framework',
@@ -235,6 +236,19 @@ REST_FRAMEWORK = {
     ],
 }
 
+# Keyset pagination for list endpoints (lumina_care.pagination.KeysetPagination)
+KEYSET_PAGE_SIZE = env.int('KEYSET_PAGE_SIZE', default=50)
+KEYSET_MAX_PAGE_SIZE = env.int('KEYSET_MAX_PAGE_SIZE', default=500)
+
+# Log queries issued while serializers render (lumina_care.eager_loading.EagerLoadingMixin)
+EAGER_LOADING_DEBUG = env.bool('EAGER_LOADING_DEBUG', default=False)
+
+# Rows fetched per server-side cursor round trip by streaming exports (lumina_care.exports)
+EXPORT_CHUNK_SIZE = env.int('EXPORT_CHUNK_SIZE', default=2000)
+
+# Per-query budget for typeahead lookups (lumina_care.typeahead.TypeaheadView)
+TYPEAHEAD_STATEMENT_TIMEOUT_MS = env.int('TYPEAHEAD_STATEMENT_TIMEOUT_MS', default=200)
+
 # -----------------------------------------------------------
 # SIMPLE JWT
 # -----------------------------------------------------------
@@ -257,6 +271,20 @@ EMAIL_HOST_USER = env('EMAIL_HOST_USER', default='')
 EMAIL_HOST_PASSWORD = env('EMAIL_HOST_PASSWORD', default='')
 DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
 EMAIL_DEBUG = env('EMAIL_DEBUG', default=False, cast=bool)
+# Transactional email outbox (core.utils.outbox), delivered by deliver_outbox
+OUTBOX_BATCH_SIZE = env.int('OUTBOX_BATCH_SIZE', default=200)
+OUTBOX_DELIVERY_WORKERS = env.int('OUTBOX_DELIVERY_WORKERS', default=4)
+OUTBOX_MAX_ATTEMPTS = env.int('OUTBOX_MAX_ATTEMPTS', default=6)
+OUTBOX_RETRY_BASE_DELAY = env.int('OUTBOX_RETRY_BASE_DELAY', default=60)
+OUTBOX_RETRY_MAX_DELAY = env.int('OUTBOX_RETRY_MAX_DELAY', default=60 * 60)
+OUTBOX_LEASE_SECONDS = env.int('OUTBOX_LEASE_SECONDS', default=5 * 60)
+# Messages per minute per SMTP host (0 = unlimited)
+OUTBOX_HOST_RATE_LIMIT = env.int('OUTBOX_HOST_RATE_LIMIT', default=60)
+OUTBOX_RETENTION_DAYS = env.int('OUTBOX_RETENTION_DAYS', default=30)
+# Pooled SMTP sessions (core.utils.email_config.smtp_connections) are replaced after this many seconds,
+# or sooner once idle, before servers drop them.
+EMAIL_CONNECTION_TTL = env.int('EMAIL_CONNECTION_TTL', default=5 * 60)
+EMAIL_CONNECTION_IDLE_TIMEOUT = env.int('EMAIL_CONNECTION_IDLE_TIMEOUT', default=60)
 
 # -----------------------------------------------------------
 # SUPABASE
@@ -264,6 +292,26 @@ EMAIL_DEBUG = env('EMAIL_DEBUG', default=False, cast=bool)
 SUPABASE_URL = env('SUPABASE_URL', default='')
 SUPABASE_KEY = env('SUPABASE_KEY', default='')
 SUPABASE_BUCKET = env('SUPABASE_BUCKET', default='')
+# Parallel uploads per application submission (job_application.document_storage)
+DOCUMENT_UPLOAD_WORKERS = env.int('DOCUMENT_UPLOAD_WORKERS', default=4)
+# Where application documents are stored: 'supabase', or 'local' (default_storage) for development and tests
+APPLICATION_DOCUMENT_BACKEND = env('APPLICATION_DOCUMENT_BACKEND', default='supabase')
+# Seconds an upload intent's signed URL and upload_token stay valid
+DOCUMENT_UPLOAD_INTENT_TTL = env.int('DOCUMENT_UPLOAD_INTENT_TTL', default=15 * 60)
+
+# -----------------------------------------------------------
+# CACHE
+# -----------------------------------------------------------
+# Cache invalidation bumps per-tenant version keys (core.utils.cache_keys), so every
+# process must share one cache: set CACHE_URL (e.g. redis://...) when running more than
+# one worker. The locmem default only suits a single process; `check --deploy` warns about it.
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://'),
+}
+PUBLIC_JOB_FEED_CACHE_TIMEOUT = env.int('PUBLIC_JOB_FEED_CACHE_TIMEOUT', default=15 * 60)
+PUBLIC_JOB_FEED_MAX_AGE = env.int('PUBLIC_JOB_FEED_MAX_AGE', default=60)
+APPLICATION_FACETS_CACHE_TIMEOUT = env.int('APPLICATION_FACETS_CACHE_TIMEOUT', default=10 * 60)
+EMAIL_TEMPLATE_CACHE_TIMEOUT = env.int('EMAIL_TEMPLATE_CACHE_TIMEOUT', default=60 * 60)
 
 # -----------------------------------------------------------
 # STATIC & MEDIA
@@ -317,7 +365,17 @@ CRONTAB_DJANGO_PROJECT_NAME = 'lumina_care'
 CRONJOBS = [
     ('0 11 * * *', 'talent_engine.cron.close_expired_requisitions',
      f'>> {os.path.join(LOG_DIR, "lumina_care.log")} 2>&1'),
+    ('30 2 * * *', 'talent_engine.cron.reconcile_requisition_stats',
+     f'>> {os.path.join(LOG_DIR, "lumina_care.log")} 2>&1'),
+    ('* * * * *', 'core.utils.outbox.deliver_outbox',
+     f'>> {os.path.join(LOG_DIR, "lumina_care.log")} 2>&1'),
+    ('15 3 * * *', 'core.utils.outbox.purge_sent_emails',
+     f'>> {os.path.join(LOG_DIR, "lumina_care.log")} 2>&1'),
 ]
+# Tenant schemas processed concurrently by per-tenant cron jobs
+CRON_TENANT_WORKERS = env.int('CRON_TENANT_WORKERS', default=4)
+# Seconds a per-tenant task may run before its in-flight query is cancelled (0 = no limit)
+TENANT_TASK_TIMEOUT = env.int('TENANT_TASK_TIMEOUT', default=600)
 
 # -----------------------------------------------------------
 # INTERNATIONALIZATION
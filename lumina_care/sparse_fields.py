@@ -0,0 +1,145 @@
+# lumina_care/sparse_fields.py
+import logging
+from functools import lru_cache
+
+from django.db.models import QuerySet
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+from lumina_care.eager_loading import _relation_paths, apply_eager_loading, eager_loading_paths
+
+logger = logging.getLogger('core')
+
+
+def _concrete_path(model, source_attrs):
+    """
+    Longest prefix of a serializer source made of concrete model fields, as an
+    ORM lookup ('job_application__full_name'). Properties and reverse relations
+    end the walk; the columns behind them cannot be named in .only().
+    """
+    path = []
+    for attr in source_attrs:
+        try:
+            field = model._meta.get_field(attr)
+        except Exception:
+            break
+        if not field.concrete:
+            break
+        path.append(attr)
+        if not field.is_relation or field.related_model is None:
+            break
+        model = field.related_model
+    return '__'.join(path)
+
+
+@lru_cache(maxsize=None)
+def sparse_only_fields(serializer_class, fields, key_fields=()):
+    """
+    Model lookups to pass to .only() so that `fields` of `serializer_class` can be
+    rendered without loading any other column. SerializerMethodFields named after a
+    model field load that field; anything else a method reads must be covered by the
+    serializer's eager_select_related / eager_prefetch_related hints.
+    """
+    serializer = serializer_class()
+    model = serializer.Meta.model
+    lookups = {model._meta.pk.name, *key_fields}
+    for name in fields:
+        field = serializer.fields[name]
+        if field.source == '*':
+            lookups.add(_concrete_path(model, [name]))
+            continue
+        source_attrs = field.source.split('.')
+        if isinstance(field, serializers.SlugRelatedField):
+            source_attrs = source_attrs + field.slug_field.split('__')
+        lookups.add(_concrete_path(model, source_attrs))
+
+    # Relations that are joined or prefetched must stay loaded on the row.
+    select, prefetch = eager_loading_paths(serializer_class, fields)
+    for path in select:
+        lookups.add(_concrete_path(model, path.split('__')))
+    for path in prefetch:
+        hops, _, _ = _relation_paths(model, path.split('__'))
+        if hops:
+            lookups.add(_concrete_path(model, hops[-1].split('__')))
+    lookups.discard('')
+    return tuple(sorted(lookups))
+
+
+def apply_sparse_fields(queryset, serializer_class, fields, key_fields=()):
+    """
+    Restrict `queryset` to the columns and relations that `fields` of
+    `serializer_class` need. `key_fields` are always loaded (e.g. pagination keys).
+    """
+    if not isinstance(queryset, QuerySet) or fields is None:
+        return queryset
+    queryset = apply_eager_loading(queryset.select_related(None).prefetch_related(None), serializer_class, fields)
+    return queryset.only(*sparse_only_fields(serializer_class, fields, tuple(key_fields)))
+
+
+def resolve_sparse_fields(serializer_class, query_params, fields_param='fields', view_param='view'):
+    """
+    Translate `?fields=a,b` or `?view=summary` into a tuple of serializer field names
+    in declaration order, or None for the full representation. `?view=summary`
+    uses the serializer's `summary_fields`.
+    """
+    available = list(serializer_class().fields)
+    requested = query_params.get(fields_param)
+    view = query_params.get(view_param)
+
+    if requested:
+        names = [name.strip() for name in requested.split(',') if name.strip()]
+        unknown = sorted(set(names) - set(available))
+        if unknown:
+            raise ValidationError({fields_param: f"Unknown field(s): {', '.join(unknown)}."})
+    elif view and view != 'full':
+        summary_fields = getattr(serializer_class, 'summary_fields', None)
+        if view != 'summary' or not summary_fields:
+            raise ValidationError({view_param: f"Unsupported view '{view}'."})
+        names = summary_fields
+    else:
+        return None
+    names = set(names)
+    return tuple(name for name in available if name in names)
+
+
+class SparseFieldsMixin:
+    """
+    Generic view mixin for list endpoints: `?fields=` / `?view=summary` on GET
+    trims the serializer to the requested fields and defers every column and
+    join they don't need. Applied in filter_queryset, like EagerLoadingMixin;
+    place it before that mixin.
+    """
+    fields_query_param = 'fields'
+    view_query_param = 'view'
+    sparse_fields = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.sparse_fields = None
+        if request.method == 'GET':
+            self.sparse_fields = resolve_sparse_fields(
+                self.get_serializer_class(), request.query_params, self.fields_query_param, self.view_query_param
+            )
+            if self.sparse_fields is not None:
+                logger.debug(f"{type(self).__name__} serving sparse fieldset: {', '.join(self.sparse_fields)}")
+
+    def get_sparse_key_fields(self):
+        """
+        Columns the paginator reads from each row to build its cursors.
+        """
+        ordering = getattr(self, 'keyset_ordering', None) or getattr(self.pagination_class, 'ordering', None) or ()
+        return tuple(name.lstrip('-') for name in ordering)
+
+    def filter_queryset(self, queryset):
+        return apply_sparse_fields(
+            super().filter_queryset(queryset), self.get_serializer_class(), self.sparse_fields,
+            self.get_sparse_key_fields(),
+        )
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        if self.sparse_fields is not None:
+            target = serializer.child if isinstance(serializer, serializers.ListSerializer) else serializer
+            for name in [name for name in target.fields if name not in self.sparse_fields]:
+                target.fields.pop(name)
+        return serializer
@@ -0,0 +1,76 @@
+# lumina_care/typeahead.py
+import logging
+
+from django.conf import settings
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db import OperationalError, connection, transaction
+from django.db.models import Q
+from django.db.models.functions import Greatest, Upper
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+logger = logging.getLogger('core')
+
+# SQLSTATE for a statement cancelled by statement_timeout.
+QUERY_CANCELED = '57014'
+
+
+class TypeaheadView(APIView):
+    """
+    Base view for `?q=` typeahead lookups. Matches on `typeahead_fields` with the
+    pg_trgm word-similarity operator against UPPER(field), which the trigram GIN
+    indexes cover, and returns the top `limit` rows ordered by similarity. Each
+    lookup runs under a local statement_timeout (TYPEAHEAD_STATEMENT_TIMEOUT_MS); a
+    query that runs over budget returns an empty, `timed_out` result instead of
+    holding the connection.
+    """
+    typeahead_fields = ()
+    result_fields = ()
+    min_query_length = 2
+    max_query_length = 100
+    default_limit = 10
+    max_limit = 25
+
+    def get_queryset(self):
+        raise NotImplementedError
+
+    def get_limit(self, request):
+        try:
+            return max(1, min(int(request.query_params.get('limit', self.default_limit)), self.max_limit))
+        except ValueError:
+            return self.default_limit
+
+    def get_timeout_ms(self):
+        return getattr(settings, 'TYPEAHEAD_STATEMENT_TIMEOUT_MS', 200)
+
+    def search(self, queryset, term, limit):
+        match = Q()
+        for name in self.typeahead_fields:
+            match |= Q(**{f'_typeahead_{name}__trigram_word_similar': term})
+        scores = [TrigramWordSimilarity(term, f'_typeahead_{name}') for name in self.typeahead_fields]
+        return (
+            queryset
+            .alias(**{f'_typeahead_{name}': Upper(name) for name in self.typeahead_fields})
+            .filter(match)
+            .annotate(similarity=Greatest(*scores) if len(scores) > 1 else scores[0])
+            .order_by('-similarity', 'pk')
+            .values(*self.result_fields, 'similarity')[:limit]
+        )
+
+    def get(self, request, *args, **kwargs):
+        term = request.query_params.get('q', '').strip()[:self.max_query_length]
+        if len(term) < self.min_query_length:
+            return Response({"results": [], "timed_out": False}, status=status.HTTP_200_OK)
+        try:
+            queryset = self.search(self.get_queryset(), term, self.get_limit(request))
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    cursor.execute(f"SET LOCAL statement_timeout = {int(self.get_timeout_ms())}")
+                results = list(queryset)
+            return Response({"results": results, "timed_out": False}, status=status.HTTP_200_OK)
+        except OperationalError as e:
+            if getattr(e.__cause__, 'pgcode', None) != QUERY_CANCELED:
+                raise
+            logger.warning(f"{type(self).__name__} exceeded {self.get_timeout_ms()}ms for query {term!r}")
+            return Response({"results": [], "timed_out": True}, status=status.HTTP_200_OK)
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class TalentEngineConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'talent_engine'
+
+    def ready(self):
+        import talent_engine.signals
@@ -1,43 +1,117 @@
 # talent_engine/cron.py
-from django_tenants.utils import tenant_context
-from django.utils import timezone
-from core.models import Tenant
-from talent_engine.models import JobRequisition
 import logging
+from functools import partial
+
+from django.db import connection
+from django.utils import timezone
+from django_tenants.utils import tenant_context
+
+from core.utils.cache_keys import PUBLIC_JOB_FEED, bump_tenant_cache
+from core.utils.tenant_tasks import POOL_THREAD, STATUS_OK, run_for_tenants
+from talent_engine.models import JobRequisition, JobRequisitionStats
 
 logger = logging.getLogger('talent_engine')
 
-def close_expired_requisitions():
+CLOSABLE_STATUSES = ['open', 'pending']
+
+CLOSE_EXPIRED_SQL = """
+    UPDATE {table} SET status = 'closed', updated_at = %s
+    WHERE is_deleted = false AND status = ANY(%s) AND deadline_date < %s
+    RETURNING id
+"""
+
+
+def close_expired_for_tenant(tenant, today):
+    """
+    Close the tenant's open/pending requisitions whose deadline has passed with a
+    single UPDATE ... RETURNING id. Returns the closed ids.
+    """
+    with tenant_context(tenant):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                CLOSE_EXPIRED_SQL.format(table=connection.ops.quote_name(JobRequisition._meta.db_table)),
+                [timezone.now(), CLOSABLE_STATUSES, today],
+            )
+            closed_ids = [row[0] for row in cursor.fetchall()]
+        if closed_ids:
+            # The UPDATE bypasses post_save, which normally invalidates the public feed.
+            bump_tenant_cache(PUBLIC_JOB_FEED, tenant.schema_name)
+    return closed_ids
+
+
+def close_expired_requisitions(schemas=None, workers=None, pool=POOL_THREAD, timeout=None, resume=True):
+    """
+    Close expired requisitions in every tenant schema (or just `schemas`) through
+    run_for_tenants. Finished schemas are checkpointed, so a run interrupted
+    part-way resumes where it stopped when restarted the same day. Returns
+    {schema: closed count}.
+    """
+    try:
+        results = run_for_tenants(
+            partial(close_expired_for_tenant, today=timezone.now().date()),
+            schemas=schemas,
+            name='close_expired_requisitions',
+            workers=workers,
+            pool=pool,
+            timeout=timeout,
+            resume=resume,
+            progress=_log_closed,
+        )
+        closed = {result.schema_name: len(result.result) for result in results if result.status == STATUS_OK}
+        logger.info(
+            f"Completed job for closing expired job requisitions: {sum(closed.values())} closed across "
+            f"{len(closed)} tenants; {sum(not result.ok for result in results)} failed."
+        )
+        return closed
+    except Exception as e:
+        logger.error(f"Unexpected error in job: {str(e)}", exc_info=True)
+        raise
+
+
+def _log_closed(result, done, total):
+    if not result.ok:
+        logger.error(f"Error processing tenant {result.schema_name}: {result.error}")
+    elif result.result:
+        logger.info(
+            f"[{done}/{total}] Closed {len(result.result)} expired job requisitions for tenant "
+            f"{result.schema_name} in {result.elapsed_ms:.0f}ms: {', '.join(result.result)}"
+        )
+    else:
+        logger.debug(
+            f"[{done}/{total}] No expired requisitions found for tenant {result.schema_name} "
+            f"({result.elapsed_ms:.0f}ms)"
+        )
+
+
+def refresh_requisition_stats_for_tenant(tenant):
+    """
+    Rebuild every JobRequisitionStats row in the tenant's schema. Returns the rows written.
+    """
+    with tenant_context(tenant):
+        return JobRequisitionStats.refresh()
+
+
+def reconcile_requisition_stats(schemas=None, workers=None, pool=POOL_THREAD, timeout=None, resume=True):
+    """
+    Nightly safety net for the trigger-maintained pipeline stats: rebuild them in
+    every tenant schema (or just `schemas`). Returns {schema: rows refreshed}.
+    """
     try:
-        tenants = Tenant.objects.all()
-        logger.info(f"Starting job to close expired job requisitions for {tenants.count()} tenants.")
-        for tenant in tenants:
-            try:
-                with tenant_context(tenant):
-                    expired_requisitions = JobRequisition.active_objects.filter(
-                        status__in=['open', 'pending'],
-                        deadline_date__lt=timezone.now().date()
-                    )
-                    updated_count = 0
-                    for requisition in expired_requisitions:
-                        requisition.status = 'closed'
-                        requisition.save()
-                        updated_count += 1
-                        logger.info(
-                            f"Closed job requisition {requisition.id} "
-                            f"(Title: {requisition.title}) for tenant {tenant.schema_name}"
-                        )
-                    if updated_count > 0:
-                        logger.info(
-                            f"Updated {updated_count} expired job requisitions "
-                            f"to 'closed' for tenant {tenant.schema_name}"
-                        )
-                    else:
-                        logger.debug(f"No expired requisitions found for tenant {tenant.schema_name}")
-            except Exception as e:
-                logger.error(f"Error processing tenant {tenant.schema_name}: {str(e)}", exc_info=True)
-                continue
-        logger.info("Completed job for closing expired job requisitions.")
+        results = run_for_tenants(
+            refresh_requisition_stats_for_tenant,
+            schemas=schemas,
+            name='reconcile_requisition_stats',
+            workers=workers,
+            pool=pool,
+            timeout=timeout,
+            resume=resume,
+        )
+        refreshed = {result.schema_name: result.result for result in results if result.status == STATUS_OK}
+        logger.info(
+            f"Reconciled requisition stats: {sum(refreshed.values())} rows across {len(refreshed)} tenants; "
+            f"{sum(not result.ok for result in results)} failed."
+        )
+        return refreshed
     except Exception as e:
         logger.error(f"Unexpected error in job: {str(e)}", exc_info=True)
-        raise
\ No newline at end of file
+        raise
@@ -0,0 +1,19 @@
+# talent_engine/management/commands/reconcile_requisition_stats.py
+from django.core.management.base import BaseCommand
+from core.utils.tenant_tasks import add_tenant_task_arguments, tenant_task_options
+from talent_engine.cron import reconcile_requisition_stats
+
+class Command(BaseCommand):
+    help = 'Rebuilds the per-requisition pipeline stats from applications and schedules'
+
+    def add_arguments(self, parser):
+        add_tenant_task_arguments(parser)
+
+    def handle(self, *args, **options):
+        try:
+            results = reconcile_requisition_stats(**tenant_task_options(options))
+            self.stdout.write(self.style.SUCCESS(
+                f"Refreshed {sum(results.values())} requisition stats row(s) across {len(results)} tenant(s)."
+            ))
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f"Error: {str(e)}"))
@@ -1,14 +1,20 @@
 # talent_engine/management/commands/run_cron.py
 from django.core.management.base import BaseCommand
+from core.utils.tenant_tasks import add_tenant_task_arguments, tenant_task_options
 from talent_engine.cron import close_expired_requisitions
 
 class Command(BaseCommand):
     help = 'Manually run the close_expired_requisitions job'
 
-    def handle(self, *args, **kwargs):
+    def add_arguments(self, parser):
+        add_tenant_task_arguments(parser)
+
+    def handle(self, *args, **options):
         self.stdout.write("Running close_expired_requisitions...")
         try:
-            close_expired_requisitions()
-            self.stdout.write(self.style.SUCCESS("Cron job completed successfully."))
+            results = close_expired_requisitions(**tenant_task_options(options))
+            self.stdout.write(self.style.SUCCESS(
+                f"Cron job completed successfully: {sum(results.values())} requisition(s) closed across {len(results)} tenant(s)."
+            ))
         except Exception as e:
-            self.stdout.write(self.style.ERROR(f"Error: {str(e)}"))
\ No newline at end of file
+            self.stdout.write(self.style.ERROR(f"Error: {str(e)}"))
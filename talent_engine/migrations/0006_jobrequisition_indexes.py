@@ -0,0 +1,29 @@
+# Generated by Django 4.2.23 on 2026-10-19 07:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('talent_engine', '0005_participant_candidate_email_alter_participant_user'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jobrequisition',
+            index=models.Index(fields=['tenant', 'is_deleted', '-created_at', '-id'], name='jobreq_tenant_del_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobrequisition',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['branch', '-created_at', '-id'], name='jobreq_active_branch_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobrequisition',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['tenant', 'publish_status', 'status'], name='jobreq_active_published_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobrequisition',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['status', 'deadline_date'], name='jobreq_active_deadline_idx'),
+        ),
+    ]
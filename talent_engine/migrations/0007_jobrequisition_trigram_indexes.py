@@ -0,0 +1,33 @@
+# Generated by Django 4.2.23 on 2026-10-19 07:54
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('talent_engine', '0006_jobrequisition_indexes'),
+    ]
+
+    operations = [
+        # Installed into public so the operator class is visible from every tenant schema's search_path.
+        migrations.RunSQL('CREATE EXTENSION IF NOT EXISTS pg_trgm SCHEMA public', migrations.RunSQL.noop),
+        migrations.AddIndex(
+            model_name='jobrequisition',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('title'), name='gin_trgm_ops'), name='jobreq_title_trgm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobrequisition',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('job_requisition_code'), name='gin_trgm_ops'), name='jobreq_req_code_trgm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobrequisition',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('job_application_code'), name='gin_trgm_ops'), name='jobreq_app_code_trgm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobrequisition',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('interview_location'), name='gin_trgm_ops'), name='jobreq_location_trgm_idx'),
+        ),
+    ]
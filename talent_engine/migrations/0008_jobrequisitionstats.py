@@ -0,0 +1,331 @@
+# Generated by Django 4.2.23 on 2026-10-19 08:15
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+STAT_COLUMNS = (
+    'total_applications', 'new_count', 'shortlisted_count', 'rejected_count', 'hired_count',
+    'scheduled_count', 'screened_count', 'average_screening_score', 'refreshed_at',
+)
+
+APPLICATION_CHANGED = (
+    "(o.job_requisition_id, o.status, o.screening_status, o.screening_score, o.is_deleted)"
+    " IS DISTINCT FROM (n.job_requisition_id, n.status, n.screening_status, n.screening_score, n.is_deleted)"
+)
+SCHEDULE_CHANGED = (
+    "(o.job_application_id, o.status, o.is_deleted) IS DISTINCT FROM (n.job_application_id, n.status, n.is_deleted)"
+)
+
+CREATE_TRIGGERS = f"""
+CREATE OR REPLACE FUNCTION talent_engine_refresh_requisition_stats(requisition_ids varchar[]) RETURNS integer AS $$
+DECLARE
+    refreshed integer;
+BEGIN
+    IF requisition_ids IS NULL THEN
+        DELETE FROM talent_engine_job_requisition_stats stats WHERE NOT EXISTS (
+            SELECT 1 FROM talent_engine_job_requisition r WHERE r.id = stats.job_requisition_id
+        );
+    END IF;
+
+    -- Lock the rows before counting: concurrent writers to the same requisition
+    -- queue here, and the count below (a new statement, so a new snapshot under
+    -- READ COMMITTED) then sees whatever the previous writer committed.
+    INSERT INTO talent_engine_job_requisition_stats (job_requisition_id, {', '.join(STAT_COLUMNS)})
+    SELECT r.id, 0, 0, 0, 0, 0, 0, 0, NULL, NULL FROM talent_engine_job_requisition r
+    WHERE requisition_ids IS NULL OR r.id = ANY(requisition_ids)
+    ON CONFLICT (job_requisition_id) DO NOTHING;
+    PERFORM 1 FROM talent_engine_job_requisition_stats
+    WHERE requisition_ids IS NULL OR job_requisition_id = ANY(requisition_ids)
+    ORDER BY job_requisition_id FOR UPDATE;
+
+    UPDATE talent_engine_job_requisition_stats stats SET
+        {', '.join(f'{column} = counted.{column}' for column in STAT_COLUMNS)}
+    FROM (
+        SELECT r.id AS job_requisition_id,
+               COUNT(a.id) AS total_applications,
+               COUNT(a.id) FILTER (WHERE a.status = 'new') AS new_count,
+               COUNT(a.id) FILTER (WHERE a.status = 'shortlisted') AS shortlisted_count,
+               COUNT(a.id) FILTER (WHERE a.status = 'rejected') AS rejected_count,
+               COUNT(a.id) FILTER (WHERE a.status = 'hired') AS hired_count,
+               COUNT(a.id) FILTER (WHERE upcoming.scheduled) AS scheduled_count,
+               COUNT(a.id) FILTER (WHERE a.screening_status = 'processed') AS screened_count,
+               AVG(a.screening_score) FILTER (WHERE a.screening_status = 'processed') AS average_screening_score,
+               now() AS refreshed_at
+        FROM talent_engine_job_requisition r
+        LEFT JOIN job_applications_job_application a ON a.job_requisition_id = r.id AND a.is_deleted = false
+        LEFT JOIN LATERAL (
+            SELECT true AS scheduled FROM job_applications_schedule s
+            WHERE s.job_application_id = a.id AND s.is_deleted = false AND s.status = 'scheduled'
+            LIMIT 1
+        ) upcoming ON true
+        WHERE requisition_ids IS NULL OR r.id = ANY(requisition_ids)
+        GROUP BY r.id
+    ) counted
+    WHERE stats.job_requisition_id = counted.job_requisition_id;
+
+    GET DIAGNOSTICS refreshed = ROW_COUNT;
+    RETURN refreshed;
+END
+$$ LANGUAGE plpgsql;
+
+-- Per-requisition changes produced by one statement. The counts are signed
+-- deltas; rescore marks requisitions whose screened applications changed, so
+-- their average has to be recomputed.
+CREATE TYPE talent_engine_requisition_stats_delta AS (
+    job_requisition_id varchar, total_applications integer, new_count integer, shortlisted_count integer,
+    rejected_count integer, hired_count integer, scheduled_count integer, screened_count integer, rescore boolean
+);
+
+CREATE OR REPLACE FUNCTION talent_engine_apply_requisition_stats_deltas(
+    deltas talent_engine_requisition_stats_delta[]
+) RETURNS void AS $$
+DECLARE
+    missing varchar[];
+BEGIN
+    -- A requisition without a row yet is counted in full; the count already
+    -- includes this statement, so its delta is not added on top.
+    missing := ARRAY(
+        SELECT d.job_requisition_id FROM unnest(deltas) d
+        WHERE NOT EXISTS (
+            SELECT 1 FROM talent_engine_job_requisition_stats stats WHERE stats.job_requisition_id = d.job_requisition_id
+        )
+    );
+    IF cardinality(missing) > 0 THEN
+        PERFORM talent_engine_refresh_requisition_stats(missing);
+    END IF;
+
+    -- Deltas commute, so concurrent writers only queue on the row lock taken here.
+    UPDATE talent_engine_job_requisition_stats stats SET
+        {', '.join(f'{column} = stats.{column} + d.{column}' for column in STAT_COLUMNS[:-2])},
+        refreshed_at = now()
+    FROM unnest(deltas) d
+    WHERE stats.job_requisition_id = d.job_requisition_id AND NOT d.job_requisition_id = ANY(missing);
+
+    -- An average can't be adjusted by a delta. The rows are locked by the UPDATE
+    -- above, so this statement (a new snapshot under READ COMMITTED) sees every
+    -- committed change to their scores.
+    UPDATE talent_engine_job_requisition_stats stats SET
+        average_screening_score = (
+            SELECT AVG(a.screening_score) FROM job_applications_job_application a
+            WHERE a.job_requisition_id = stats.job_requisition_id AND a.is_deleted = false
+              AND a.screening_status = 'processed'
+        )
+    FROM unnest(deltas) d
+    WHERE stats.job_requisition_id = d.job_requisition_id AND d.rescore AND NOT d.job_requisition_id = ANY(missing);
+END
+$$ LANGUAGE plpgsql;
+
+-- Active applications leaving a requisition count -1, those entering it +1.
+CREATE OR REPLACE FUNCTION talent_engine_application_stats_deltas(
+    old_applications job_applications_job_application[], new_applications job_applications_job_application[]
+) RETURNS talent_engine_requisition_stats_delta[] AS $$
+    SELECT ARRAY(
+        SELECT ROW(
+            changed.job_requisition_id,
+            SUM(changed.sign),
+            SUM(changed.sign * (changed.status = 'new')::int),
+            SUM(changed.sign * (changed.status = 'shortlisted')::int),
+            SUM(changed.sign * (changed.status = 'rejected')::int),
+            SUM(changed.sign * (changed.status = 'hired')::int),
+            SUM(changed.sign * EXISTS (
+                SELECT 1 FROM job_applications_schedule s
+                WHERE s.job_application_id = changed.id AND s.is_deleted = false AND s.status = 'scheduled'
+            )::int),
+            SUM(changed.sign * (changed.screening_status = 'processed')::int),
+            bool_or(changed.screening_status = 'processed')
+        )::talent_engine_requisition_stats_delta
+        FROM (
+            SELECT -1 AS sign, a.id, a.job_requisition_id, a.status, a.screening_status
+            FROM unnest(old_applications) a WHERE a.is_deleted = false
+            UNION ALL
+            SELECT 1, a.id, a.job_requisition_id, a.status, a.screening_status
+            FROM unnest(new_applications) a WHERE a.is_deleted = false
+        ) changed
+        GROUP BY changed.job_requisition_id
+    )
+$$ LANGUAGE sql STABLE;
+
+-- scheduled_count counts applications with at least one upcoming interview, so a
+-- schedule write moves it only when it flips that for an active application.
+-- The schedules before the statement are the current ones it didn't write plus
+-- the old versions of those it did.
+CREATE OR REPLACE FUNCTION talent_engine_schedule_stats_deltas(
+    old_schedules job_applications_schedule[], new_schedules job_applications_schedule[]
+) RETURNS talent_engine_requisition_stats_delta[] AS $$
+    SELECT ARRAY(
+        SELECT ROW(
+            a.job_requisition_id, 0, 0, 0, 0, 0, SUM(flags.scheduled_after::int - flags.scheduled_before::int), 0, false
+        )::talent_engine_requisition_stats_delta
+        FROM (
+            SELECT touched.job_application_id,
+                   EXISTS (
+                       SELECT 1 FROM job_applications_schedule s
+                       WHERE s.job_application_id = touched.job_application_id AND s.is_deleted = false
+                         AND s.status = 'scheduled'
+                   ) AS scheduled_after,
+                   EXISTS (
+                       SELECT 1 FROM job_applications_schedule s
+                       WHERE s.job_application_id = touched.job_application_id AND s.is_deleted = false
+                         AND s.status = 'scheduled' AND s.id NOT IN (SELECT n.id FROM unnest(new_schedules) n)
+                   ) OR EXISTS (
+                       SELECT 1 FROM unnest(old_schedules) o
+                       WHERE o.job_application_id = touched.job_application_id AND o.is_deleted = false
+                         AND o.status = 'scheduled'
+                   ) AS scheduled_before
+            FROM (
+                SELECT job_application_id FROM unnest(old_schedules)
+                UNION
+                SELECT job_application_id FROM unnest(new_schedules)
+            ) touched
+        ) flags
+        JOIN job_applications_job_application a ON a.id = flags.job_application_id AND a.is_deleted = false
+        WHERE flags.scheduled_after <> flags.scheduled_before
+        GROUP BY a.job_requisition_id
+    )
+$$ LANGUAGE sql STABLE;
+
+-- Statement-level: the transition tables give one delta per requisition, however
+-- many rows the statement wrote. Updates only pass on the rows whose counted
+-- columns changed.
+CREATE OR REPLACE FUNCTION talent_engine_stats_application_change() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM talent_engine_apply_requisition_stats_deltas(talent_engine_application_stats_deltas(
+            '{{}}', ARRAY(SELECT n::job_applications_job_application FROM new_rows n)
+        ));
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM talent_engine_apply_requisition_stats_deltas(talent_engine_application_stats_deltas(
+            ARRAY(SELECT o::job_applications_job_application FROM old_rows o), '{{}}'
+        ));
+    ELSE
+        PERFORM talent_engine_apply_requisition_stats_deltas(talent_engine_application_stats_deltas(
+            ARRAY(SELECT o::job_applications_job_application FROM old_rows o JOIN new_rows n ON n.id = o.id
+                  WHERE {APPLICATION_CHANGED}),
+            ARRAY(SELECT n::job_applications_job_application FROM old_rows o JOIN new_rows n ON n.id = o.id
+                  WHERE {APPLICATION_CHANGED})
+        ));
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION talent_engine_stats_schedule_change() RETURNS trigger AS $$
+BEGIN
+    -- Whether an application has an upcoming interview is not a per-row delta:
+    -- two transactions adding its first schedule would both count it. Locking the
+    -- applications serializes them, and the next statement sees the winner's rows.
+    IF TG_OP = 'INSERT' THEN
+        PERFORM 1 FROM job_applications_job_application
+        WHERE id IN (SELECT job_application_id FROM new_rows) ORDER BY id FOR NO KEY UPDATE;
+        PERFORM talent_engine_apply_requisition_stats_deltas(talent_engine_schedule_stats_deltas(
+            '{{}}', ARRAY(SELECT n::job_applications_schedule FROM new_rows n)
+        ));
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM 1 FROM job_applications_job_application
+        WHERE id IN (SELECT job_application_id FROM old_rows) ORDER BY id FOR NO KEY UPDATE;
+        PERFORM talent_engine_apply_requisition_stats_deltas(talent_engine_schedule_stats_deltas(
+            ARRAY(SELECT o::job_applications_schedule FROM old_rows o), '{{}}'
+        ));
+    ELSE
+        PERFORM 1 FROM job_applications_job_application
+        WHERE id IN (
+            SELECT unnest(ARRAY[o.job_application_id, n.job_application_id])
+            FROM old_rows o JOIN new_rows n ON n.id = o.id WHERE {SCHEDULE_CHANGED}
+        ) ORDER BY id FOR NO KEY UPDATE;
+        PERFORM talent_engine_apply_requisition_stats_deltas(talent_engine_schedule_stats_deltas(
+            ARRAY(SELECT o::job_applications_schedule FROM old_rows o JOIN new_rows n ON n.id = o.id
+                  WHERE {SCHEDULE_CHANGED}),
+            ARRAY(SELECT n::job_applications_schedule FROM old_rows o JOIN new_rows n ON n.id = o.id
+                  WHERE {SCHEDULE_CHANGED})
+        ));
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION talent_engine_stats_requisition_delete() RETURNS trigger AS $$
+BEGIN
+    DELETE FROM talent_engine_job_requisition_stats WHERE job_requisition_id IN (SELECT id FROM old_rows);
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER talent_engine_stats_application_insert
+    AFTER INSERT ON job_applications_job_application REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE PROCEDURE talent_engine_stats_application_change();
+CREATE TRIGGER talent_engine_stats_application_update
+    AFTER UPDATE ON job_applications_job_application REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE PROCEDURE talent_engine_stats_application_change();
+CREATE TRIGGER talent_engine_stats_application_delete
+    AFTER DELETE ON job_applications_job_application REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE PROCEDURE talent_engine_stats_application_change();
+
+CREATE TRIGGER talent_engine_stats_schedule_insert
+    AFTER INSERT ON job_applications_schedule REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE PROCEDURE talent_engine_stats_schedule_change();
+CREATE TRIGGER talent_engine_stats_schedule_update
+    AFTER UPDATE ON job_applications_schedule REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE PROCEDURE talent_engine_stats_schedule_change();
+CREATE TRIGGER talent_engine_stats_schedule_delete
+    AFTER DELETE ON job_applications_schedule REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE PROCEDURE talent_engine_stats_schedule_change();
+
+CREATE TRIGGER talent_engine_stats_requisition_delete
+    AFTER DELETE ON talent_engine_job_requisition REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE PROCEDURE talent_engine_stats_requisition_delete();
+
+SELECT talent_engine_refresh_requisition_stats(NULL);
+"""
+
+DROP_TRIGGERS = """
+DROP TRIGGER IF EXISTS talent_engine_stats_application_insert ON job_applications_job_application;
+DROP TRIGGER IF EXISTS talent_engine_stats_application_update ON job_applications_job_application;
+DROP TRIGGER IF EXISTS talent_engine_stats_application_delete ON job_applications_job_application;
+DROP TRIGGER IF EXISTS talent_engine_stats_schedule_insert ON job_applications_schedule;
+DROP TRIGGER IF EXISTS talent_engine_stats_schedule_update ON job_applications_schedule;
+DROP TRIGGER IF EXISTS talent_engine_stats_schedule_delete ON job_applications_schedule;
+DROP TRIGGER IF EXISTS talent_engine_stats_requisition_delete ON talent_engine_job_requisition;
+DROP FUNCTION IF EXISTS talent_engine_stats_application_change();
+DROP FUNCTION IF EXISTS talent_engine_stats_schedule_change();
+DROP FUNCTION IF EXISTS talent_engine_stats_requisition_delete();
+DROP FUNCTION IF EXISTS talent_engine_application_stats_deltas(job_applications_job_application[], job_applications_job_application[]);
+DROP FUNCTION IF EXISTS talent_engine_schedule_stats_deltas(job_applications_schedule[], job_applications_schedule[]);
+DROP FUNCTION IF EXISTS talent_engine_apply_requisition_stats_deltas(talent_engine_requisition_stats_delta[]);
+DROP TYPE IF EXISTS talent_engine_requisition_stats_delta;
+DROP FUNCTION IF EXISTS talent_engine_refresh_requisition_stats(varchar[]);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('talent_engine', '0007_jobrequisition_trigram_indexes'),
+        ('job_application', '0007_normalize_compliance_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobRequisitionStats',
+            fields=[
+                ('job_requisition', models.OneToOneField(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='stats', serialize=False, to='talent_engine.jobrequisition')),
+                ('total_applications', models.IntegerField(default=0)),
+                ('new_count', models.IntegerField(default=0)),
+                ('shortlisted_count', models.IntegerField(default=0)),
+                ('rejected_count', models.IntegerField(default=0)),
+                ('hired_count', models.IntegerField(default=0)),
+                ('scheduled_count', models.IntegerField(default=0, help_text='Applications with an upcoming (scheduled) interview')),
+                ('screened_count', models.IntegerField(default=0, help_text='Applications whose resume screening succeeded')),
+                ('average_screening_score', models.FloatField(blank=True, null=True)),
+                ('refreshed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'talent_engine_job_requisition_stats',
+            },
+        ),
+        migrations.AlterField(
+            model_name='jobrequisition',
+            name='num_of_applications',
+            field=models.IntegerField(default=0, help_text='Number of active (not deleted) applications submitted'),
+        ),
+        migrations.RunSQL(CREATE_TRIGGERS, DROP_TRIGGERS),
+    ]
@@ -1,8 +1,11 @@
-from django.db import models
-from django.db.models import Max
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db import connection, models
+from django.db.models import Case, F, IntegerField, Max, Value, When
+from django.db.models.functions import Greatest, Upper
 from django.utils.text import slugify
 from users.models import CustomUser
 from core.models import Tenant, Branch
+from core.utils.cache_keys import PUBLIC_JOB_FEED, bump_tenant_cache
 from django.utils import timezone
 import uuid
 import logging
@@ -62,7 +65,7 @@ class JobRequisition(models.Model):
     compliance_checklist = models.JSONField(default=list, blank=True, validators=[validate_compliance_checklist])
     last_compliance_check = models.DateTimeField(null=True, blank=True)
     checked_by = models.CharField(max_length=255, null=True, blank=True)
-    num_of_applications = models.IntegerField(default=0, help_text="Number of successful (hired) applications")
+    num_of_applications = models.IntegerField(default=0, help_text="Number of active (not deleted) applications submitted")
     tenant = models.ForeignKey(Tenant, on_delete=models.CASCADE, related_name='talent_requisitions')
     branch = models.ForeignKey(Branch, on_delete=models.SET_NULL, null=True, blank=True)
     title = models.CharField(max_length=255)
@@ -99,6 +102,17 @@ class JobRequisition(models.Model):
 
     class Meta:
         db_table = 'talent_engine_job_requisition'
+        indexes = [
+            models.Index(fields=['tenant', 'is_deleted', '-created_at', '-id'], name='jobreq_tenant_del_created_idx'),
+            models.Index(fields=['branch', '-created_at', '-id'], condition=models.Q(is_deleted=False), name='jobreq_active_branch_idx'),
+            models.Index(fields=['tenant', 'publish_status', 'status'], condition=models.Q(is_deleted=False), name='jobreq_active_published_idx'),
+            models.Index(fields=['status', 'deadline_date'], condition=models.Q(is_deleted=False), name='jobreq_active_deadline_idx'),
+            # Trigram indexes on UPPER(col) serve both icontains (UPPER(col) LIKE ...) and typeahead similarity.
+            GinIndex(OpClass(Upper('title'), name='gin_trgm_ops'), name='jobreq_title_trgm_idx'),
+            GinIndex(OpClass(Upper('job_requisition_code'), name='gin_trgm_ops'), name='jobreq_req_code_trgm_idx'),
+            GinIndex(OpClass(Upper('job_application_code'), name='gin_trgm_ops'), name='jobreq_app_code_trgm_idx'),
+            GinIndex(OpClass(Upper('interview_location'), name='gin_trgm_ops'), name='jobreq_location_trgm_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} ({self.tenant.schema_name})"
@@ -136,6 +150,31 @@ class JobRequisition(models.Model):
 
         super().save(*args, **kwargs)
 
+    @classmethod
+    def adjust_application_counts(cls, deltas):
+        """
+        Apply per-requisition deltas to num_of_applications in a single UPDATE.
+        `deltas` maps requisition id -> signed delta; counters never drop below zero.
+        """
+        deltas = {pk: delta for pk, delta in deltas.items() if delta}
+        if not deltas:
+            return 0
+        if len(deltas) == 1:
+            [(pk, delta)] = deltas.items()
+            increment = Value(delta)
+        else:
+            increment = Case(
+                *[When(pk=pk, then=Value(delta)) for pk, delta in deltas.items()],
+                default=Value(0),
+                output_field=IntegerField(),
+            )
+        updated = cls.objects.filter(pk__in=list(deltas)).update(
+            num_of_applications=Greatest(F('num_of_applications') + increment, Value(0))
+        )
+        # The public job feed serializes num_of_applications.
+        bump_tenant_cache(PUBLIC_JOB_FEED, connection.schema_name)
+        return updated
+
     def soft_delete(self):
         self.is_deleted = True
         self.save()
@@ -146,50 +185,185 @@ class JobRequisition(models.Model):
         self.save()
         logger.info(f"JobRequisition {self.id} restored for tenant {self.tenant.schema_name}")
 
+    def compliance_editor(self):
+        return ComplianceChecklistEditor(self)
+
     def add_compliance_item(self, name, description='', required=True, status='pending', checked_by=None, checked_at=None):
-        new_item = {
-            'id': str(uuid.uuid4()),
-            'name': name,
-            'description': description,
-            'required': required,
-            'status': status,
-            'checked_by': checked_by,
-            'checked_at': checked_at
-        }
-        self.compliance_checklist.append(new_item)
-        self.last_compliance_check = checked_at or self.last_compliance_check
-        self.checked_by = checked_by or self.checked_by
-        self.save()
+        editor = self.compliance_editor()
+        new_item = editor.add(name, description, required, status, checked_by, checked_at)
+        editor.save()
         return new_item
 
     def update_compliance_item(self, item_id, **kwargs):
-        for item in self.compliance_checklist:
-            if item["id"] == item_id:
-                item.update(kwargs)
-                if 'status' in kwargs and kwargs['status'] in ['completed', 'failed']:
-                    item['checked_at'] = kwargs.get('checked_at', timezone.now().isoformat())
-                    item['checked_by'] = kwargs.get('checked_by', item.get('checked_by'))
-                    self.last_compliance_check = item['checked_at']
-                    self.checked_by = item['checked_by']
-                self.save()
-                logger.info(f"Updated compliance item {item_id} for requisition {self.id}")
-                return item
-        logger.warning(f"Compliance item {item_id} not found in requisition {self.id}")
-        raise ValueError("Compliance item not found")
+        editor = self.compliance_editor()
+        try:
+            item = editor.update(item_id, **kwargs)
+        except ValueError:
+            logger.warning(f"Compliance item {item_id} not found in requisition {self.id}")
+            raise
+        editor.save()
+        logger.info(f"Updated compliance item {item_id} for requisition {self.id}")
+        return item
 
     def remove_compliance_item(self, item_id):
-        original_length = len(self.compliance_checklist)
-        self.compliance_checklist = [item for item in self.compliance_checklist if item["id"] != item_id]
-        if len(self.compliance_checklist) < original_length:
-            self.save()
-            logger.info(f"Removed compliance item {item_id} from requisition {self.id}")
-        else:
+        editor = self.compliance_editor()
+        try:
+            editor.remove(item_id)
+        except ValueError:
             logger.warning(f"Compliance item {item_id} not found in requisition {self.id}")
+            raise
+        editor.save()
+        logger.info(f"Removed compliance item {item_id} from requisition {self.id}")
+
+
+class ComplianceChecklistEditor:
+    """
+    Applies add/update/remove/reorder edits to a requisition's compliance_checklist
+    in memory and writes them with a single save(update_fields=...). Items are found
+    through an id -> index map rather than by scanning the list.
+    """
+
+    def __init__(self, requisition):
+        self.requisition = requisition
+        self.items = list(requisition.compliance_checklist or [])
+        self.index = {str(item.get('id')): position for position, item in enumerate(self.items)}
+        self.changed_fields = set()
+
+    @staticmethod
+    def build_item(name, description='', required=True, status='pending', checked_by=None, checked_at=None, item_id=None):
+        return {
+            'id': str(item_id or uuid.uuid4()),
+            'name': name,
+            'description': description,
+            'required': required,
+            'status': status,
+            'checked_by': getattr(checked_by, 'pk', checked_by),
+            'checked_at': checked_at.isoformat() if hasattr(checked_at, 'isoformat') else checked_at
+        }
+
+    def _position(self, item_id):
+        try:
+            return self.index[str(item_id)]
+        except KeyError:
             raise ValueError("Compliance item not found")
-        
 
+    def _checked(self, checked_at, checked_by):
+        if checked_at:
+            self.requisition.last_compliance_check = checked_at
+            self.changed_fields.add('last_compliance_check')
+        if checked_by:
+            self.requisition.checked_by = checked_by
+            self.changed_fields.add('checked_by')
+
+    def get(self, item_id):
+        return self.items[self._position(item_id)]
+
+    def add(self, name, description='', required=True, status='pending', checked_by=None, checked_at=None, item_id=None):
+        item = self.build_item(name, description, required, status, checked_by, checked_at, item_id)
+        if item['id'] in self.index:
+            raise ValueError(f"Compliance item {item['id']} already exists")
+        self.index[item['id']] = len(self.items)
+        self.items.append(item)
+        self._checked(item['checked_at'], item['checked_by'])
+        self.changed_fields.add('compliance_checklist')
+        return item
+
+    def update(self, item_id, **changes):
+        item = self.get(item_id)
+        if 'checked_by' in changes:
+            changes['checked_by'] = getattr(changes['checked_by'], 'pk', changes['checked_by'])
+        if hasattr(changes.get('checked_at'), 'isoformat'):
+            changes['checked_at'] = changes['checked_at'].isoformat()
+        item.update(changes)
+        if changes.get('status') in ['completed', 'failed']:
+            item['checked_at'] = changes.get('checked_at') or timezone.now().isoformat()
+            item['checked_by'] = changes.get('checked_by', item.get('checked_by'))
+            self._checked(item['checked_at'], item['checked_by'])
+        self.changed_fields.add('compliance_checklist')
+        return item
+
+    def remove(self, item_id):
+        position = self._position(item_id)
+        del self.items[position]
+        del self.index[str(item_id)]
+        for moved in self.items[position:]:
+            self.index[str(moved.get('id'))] -= 1
+        self.changed_fields.add('compliance_checklist')
+
+    def reorder(self, item_ids):
+        """
+        Move the given items to the front in the given order; the rest keep their relative order.
+        """
+        positions = [self._position(item_id) for item_id in item_ids]
+        front = set(positions)
+        self.items = [self.items[position] for position in positions] + [
+            item for position, item in enumerate(self.items) if position not in front
+        ]
+        self.index = {str(item.get('id')): position for position, item in enumerate(self.items)}
+        self.changed_fields.add('compliance_checklist')
 
+    def replace(self, items):
+        """
+        Rebuild the checklist from `items` (dicts with name, description, required).
+        """
+        self.items, self.index = [], {}
+        for item in items:
+            self.add(item['name'], item.get('description', ''), item.get('required', True))
+        self.changed_fields.add('compliance_checklist')
+
+    def apply(self):
+        """
+        Copy the edited list onto the requisition without saving, for callers that save it themselves.
+        """
+        self.requisition.compliance_checklist = self.items
+        return self.requisition
+
+    def save(self):
+        if not self.changed_fields:
+            return
+        self.apply().save(update_fields=[*self.changed_fields, 'updated_at'])
+        self.changed_fields = set()
+
+
+class JobRequisitionStats(models.Model):
+    """
+    Pipeline counts over a requisition's active applications. Statement-level
+    triggers on applications and schedules (migration 0008) apply each statement's
+    changes as deltas, so ORM saves, queryset updates and raw SQL all keep them
+    current; the nightly reconcile_requisition_stats job recounts every row as a
+    safety net.
+    """
+    # No database FK: the application triggers may refresh a row while Django is
+    # cascading a requisition delete; a trigger on the requisition drops it instead.
+    job_requisition = models.OneToOneField(
+        JobRequisition, primary_key=True, on_delete=models.DO_NOTHING, db_constraint=False, related_name='stats'
+    )
+    total_applications = models.IntegerField(default=0)
+    new_count = models.IntegerField(default=0)
+    shortlisted_count = models.IntegerField(default=0)
+    rejected_count = models.IntegerField(default=0)
+    hired_count = models.IntegerField(default=0)
+    scheduled_count = models.IntegerField(default=0, help_text="Applications with an upcoming (scheduled) interview")
+    screened_count = models.IntegerField(default=0, help_text="Applications whose resume screening succeeded")
+    average_screening_score = models.FloatField(null=True, blank=True)
+    refreshed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'talent_engine_job_requisition_stats'
+
+    def __str__(self):
+        return f"Stats for {self.job_requisition_id}"
 
+    @classmethod
+    def refresh(cls, job_requisition_ids=None):
+        """
+        Recompute the rows for `job_requisition_ids`, or rebuild the whole table
+        (dropping rows of deleted requisitions) when None. Returns the rows written.
+        """
+        ids = None if job_requisition_ids is None else [str(pk) for pk in job_requisition_ids]
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT talent_engine_refresh_requisition_stats(%s::varchar[])", [ids])
+            return cursor.fetchone()[0]
 
 
 
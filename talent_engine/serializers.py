@@ -4,7 +4,7 @@ import logging
 import uuid
 import uuid
 from rest_framework import serializers
-from .models import  VideoSession, Participant, JobRequisition
+from .models import  VideoSession, Participant, JobRequisition, JobRequisitionStats, ComplianceChecklistEditor
 import logging
 import json
 import asyncio
@@ -20,13 +20,19 @@ logger = logging.getLogger('talent_engine')
 
 
 
+class CheckedByField(serializers.PrimaryKeyRelatedField):
+    # Checklist items store the reviewer's id rather than a user instance.
+    def to_representation(self, value):
+        return getattr(value, 'pk', value)
+
+
 class ComplianceItemSerializer(serializers.Serializer):
     id = serializers.UUIDField(required=False, default=uuid.uuid4)
     name = serializers.CharField(max_length=255)
     description = serializers.CharField(max_length=1000, allow_blank=True, default='')
     required = serializers.BooleanField(default=True)
     status = serializers.ChoiceField(choices=['pending', 'completed', 'failed'], default='pending')
-    checked_by = serializers.PrimaryKeyRelatedField(
+    checked_by = CheckedByField(
         queryset=CustomUser.objects.all(),
         allow_null=True,
         required=False
@@ -41,6 +47,42 @@ class ComplianceItemSerializer(serializers.Serializer):
         return data
 
 
+class ComplianceChecklistOperationSerializer(serializers.Serializer):
+    op = serializers.ChoiceField(choices=['add', 'update', 'remove', 'reorder'])
+    id = serializers.CharField(required=False)
+    item = serializers.DictField(required=False)
+    ids = serializers.ListField(child=serializers.CharField(), required=False, allow_empty=False)
+
+    def validate(self, data):
+        op = data['op']
+        if op in ['update', 'remove'] and not data.get('id'):
+            raise serializers.ValidationError(f"'id' is required for {op}.")
+        if op == 'reorder' and not data.get('ids'):
+            raise serializers.ValidationError("'ids' is required for reorder.")
+        if op in ['add', 'update']:
+            item_serializer = ComplianceItemSerializer(data=data.get('item') or {}, partial=op == 'update')
+            item_serializer.is_valid(raise_exception=True)
+            item = dict(item_serializer.validated_data)
+            if op == 'add':
+                item['item_id'] = item.pop('id')
+            else:
+                item.pop('id', None)
+            data['item'] = item
+        return data
+
+
+class ComplianceChecklistEditSerializer(serializers.Serializer):
+    operations = ComplianceChecklistOperationSerializer(many=True, allow_empty=False, max_length=500)
+
+
+class JobRequisitionStatsSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = JobRequisitionStats
+        fields = [
+            'total_applications', 'new_count', 'shortlisted_count', 'rejected_count', 'hired_count',
+            'scheduled_count', 'screened_count', 'average_screening_score', 'refreshed_at'
+        ]
+
 
 class JobRequisitionSerializer(serializers.ModelSerializer):
     requested_by = serializers.SerializerMethodField()
@@ -48,6 +90,18 @@ class JobRequisitionSerializer(serializers.ModelSerializer):
     tenant_domain = serializers.SerializerMethodField()
     compliance_checklist = serializers.SerializerMethodField()
     branch = serializers.SlugRelatedField(slug_field='name', read_only=True, allow_null=True)
+    pipeline_stats = serializers.SerializerMethodField()
+
+    # Relations read by the method fields, for lumina_care.eager_loading.
+    eager_select_related = {'requested_by': ('requested_by',), 'pipeline_stats': ('stats',)}
+    eager_prefetch_related = {'tenant_domain': ('tenant__domain_set',)}
+
+    # Fields returned for ?view=summary, see lumina_care.sparse_fields.
+    summary_fields = (
+        'id', 'title', 'unique_link', 'status', 'role', 'job_type', 'location_type', 'job_requisition_code',
+        'job_application_code', 'deadline_date', 'start_date', 'requested_date', 'publish_status',
+        'is_deleted', 'created_at', 'updated_at', 'num_of_applications', 'job_location', 'branch', 'pipeline_stats'
+    )
 
     class Meta:
         model = JobRequisition
@@ -57,7 +111,8 @@ class JobRequisitionSerializer(serializers.ModelSerializer):
             'qualification_requirement', 'experience_requirement', 'knowledge_requirement', 'reason',
             'job_requisition_code', 'job_application_code', 'deadline_date', 'start_date', 'responsibilities',
             'documents_required', 'compliance_checklist', 'advert_banner', 'requested_date', 'publish_status',
-            'is_deleted', 'created_at', 'updated_at', 'num_of_applications', 'job_location', 'branch', 'interview_location'
+            'is_deleted', 'created_at', 'updated_at', 'num_of_applications', 'job_location', 'branch', 'interview_location',
+            'pipeline_stats'
         ]
         read_only_fields = [
             'id', 'tenant', 'tenant_domain', 'unique_link', 'requested_date', 'is_deleted', 'created_at', 'updated_at', 'branch'
@@ -76,8 +131,25 @@ class JobRequisitionSerializer(serializers.ModelSerializer):
 
     @extend_schema_field(str)
     def get_tenant_domain(self, obj):
-        primary_domain = obj.tenant.domain_set.filter(is_primary=True).first()
-        return primary_domain.domain if primary_domain else None
+        # Lists share one context, so each tenant's primary domain is looked up once per response.
+        domains = self.context.setdefault('_primary_domains', {})
+        if obj.tenant_id not in domains:
+            primary_domain = next((domain for domain in obj.tenant.domain_set.all() if domain.is_primary), None)
+            domains[obj.tenant_id] = primary_domain.domain if primary_domain else None
+        return domains[obj.tenant_id]
+
+    @extend_schema_field(JobRequisitionStatsSerializer)
+    def get_pipeline_stats(self, obj):
+        # Internal numbers: only rendered for signed-in staff, not on public job pages.
+        request = self.context.get('request')
+        if request is None or not request.user.is_authenticated:
+            return None
+        try:
+            stats = obj.stats
+        except JobRequisitionStats.DoesNotExist:
+            # No application or schedule has been written for it yet.
+            stats = JobRequisitionStats(job_requisition=obj)
+        return JobRequisitionStatsSerializer(stats).data
 
     @extend_schema_field(list)
     def get_compliance_checklist(self, obj):
@@ -98,28 +170,24 @@ class JobRequisitionSerializer(serializers.ModelSerializer):
         return value
 
     def create(self, validated_data):
+        # The checklist goes into the INSERT itself rather than one save() per item.
         compliance_checklist = validated_data.pop('compliance_checklist', [])
-        instance = super().create(validated_data)
-        for item in compliance_checklist:
-            instance.add_compliance_item(
+        validated_data['compliance_checklist'] = [
+            ComplianceChecklistEditor.build_item(
                 name=item["name"],
                 description=item.get("description", ""),
                 required=item.get("required", True)
-            )
-        return instance
+            ) for item in compliance_checklist
+        ]
+        return super().create(validated_data)
 
     def update(self, instance, validated_data):
         compliance_checklist = validated_data.pop('compliance_checklist', None)
-        instance = super().update(instance, validated_data)
         if compliance_checklist is not None:
-            instance.compliance_checklist = []
-            for item in compliance_checklist:
-                instance.add_compliance_item(
-                    name=item["name"],
-                    description=item.get("description", ""),
-                    required=item.get("required", True)
-                )
-        return instance
+            editor = instance.compliance_editor()
+            editor.replace(compliance_checklist)
+            editor.apply()
+        return super().update(instance, validated_data)
     
 # Serializers
 
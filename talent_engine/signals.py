@@ -0,0 +1,12 @@
+# talent_engine/signals.py
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from core.utils.cache_keys import PUBLIC_JOB_FEED, bump_tenant_cache
+from .models import JobRequisition
+
+
+@receiver(post_save, sender=JobRequisition)
+def invalidate_public_job_feed(sender, instance, **kwargs):
+    # Publishing, editing and soft-deleting all go through save().
+    bump_tenant_cache(PUBLIC_JOB_FEED, instance.tenant.schema_name)
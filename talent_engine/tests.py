@@ -1,3 +1,260 @@
-from django.test import TestCase
+from datetime import timedelta
 
-# Create your tests here.
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.utils.testing import TenantTestCase
+from job_application.models import JobApplication, Schedule
+from users.models import CustomUser
+from .cron import close_expired_for_tenant
+from .models import JobRequisition, JobRequisitionStats
+from .views import (
+    ComplianceItemView, JobRequisitionDetailView, JobRequisitionListCreateView, JobRequisitionTypeaheadView,
+)
+
+
+class JobRequisitionTypeaheadTests(TenantTestCase):
+    """
+    Typeahead matches partial titles and codes through the trigram indexes.
+    """
+
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.name = 'Typeahead Test'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create(email='admin@typeahead-test.example.com', role='admin', tenant=cls.tenant)
+        for index, title in enumerate(['Senior Nurse', 'Nursery Assistant', 'Care Coordinator', 'Night Nurse'], start=1):
+            JobRequisition.objects.create(
+                id=f'TYP-{index:04d}', tenant=cls.tenant, title=title, unique_link=f'typeahead-test-{index}',
+                job_requisition_code=f'TYP-REQ-{index:04d}', job_application_code=f'TYP-JA-{index:04d}',
+            )
+
+    def typeahead(self, term):
+        request = APIRequestFactory().get('/api/talent-engine/requisitions/typeahead/', {'q': term})
+        request.tenant = self.tenant
+        force_authenticate(request, user=self.user)
+        response = JobRequisitionTypeaheadView.as_view()(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.data['timed_out'])
+        return [row['title'] for row in response.data['results']]
+
+    def test_matches_partial_title(self):
+        titles = self.typeahead('nurse')
+        self.assertEqual(set(titles[:2]), {'Senior Nurse', 'Night Nurse'})
+        self.assertNotIn('Care Coordinator', titles)
+
+    def test_matches_code(self):
+        self.assertEqual(self.typeahead('TYP-REQ-0003')[0], 'Care Coordinator')
+
+    def test_short_query_returns_nothing(self):
+        self.assertEqual(self.typeahead('n'), [])
+
+    def test_uses_trigram_index(self):
+        # Unscoped, so the planner can't fall back to a tenant index, which wins on cost with only a few rows.
+        view = JobRequisitionTypeaheadView()
+        queryset = view.search(JobRequisition.objects.all(), 'nurse', 10)
+        with connection.cursor() as cursor:
+            cursor.execute("SET enable_seqscan = off")
+        try:
+            plan = queryset.explain()
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute("RESET enable_seqscan")
+        for index in ('jobreq_title_trgm_idx', 'jobreq_req_code_trgm_idx', 'jobreq_app_code_trgm_idx'):
+            self.assertIn(index, plan)
+
+
+class ComplianceChecklistEditTests(TenantTestCase):
+    """
+    A batch of checklist operations is applied in memory and saved with one UPDATE.
+    """
+
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.name = 'Checklist Test'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create(email='admin@checklist-test.example.com', role='admin', tenant=cls.tenant)
+        cls.requisition = JobRequisition.objects.create(
+            id='CHK-0001', tenant=cls.tenant, title='Carer', unique_link='checklist-test-1',
+            compliance_checklist=[
+                {'id': 'dbs', 'name': 'DBS check', 'description': '', 'required': True},
+                {'id': 'rtw', 'name': 'Right to work', 'description': '', 'required': True},
+                {'id': 'ref', 'name': 'References', 'description': '', 'required': False},
+            ],
+        )
+
+    def test_operations_are_saved_once(self):
+        request = APIRequestFactory().patch('/api/talent-engine/requisitions/CHK-0001/compliance-items/', {'operations': [
+            {'op': 'add', 'item': {'name': 'Training certificate'}},
+            {'op': 'update', 'id': 'rtw', 'item': {'description': 'Passport or visa'}},
+            {'op': 'remove', 'id': 'dbs'},
+            {'op': 'reorder', 'ids': ['ref']},
+        ]}, format='json')
+        request.tenant = self.tenant
+        force_authenticate(request, user=self.user)
+        with CaptureQueriesContext(connection) as context:
+            response = ComplianceItemView.as_view()(request, job_requisition_id='CHK-0001')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(sum(query['sql'].startswith('UPDATE') for query in context.captured_queries), 1)
+
+        checklist = JobRequisition.objects.get(pk='CHK-0001').compliance_checklist
+        self.assertEqual([item['name'] for item in checklist], ['References', 'Right to work', 'Training certificate'])
+        self.assertEqual(checklist[1]['description'], 'Passport or visa')
+
+    def test_unknown_item_is_rejected(self):
+        request = APIRequestFactory().patch('/api/talent-engine/requisitions/CHK-0001/compliance-items/', {
+            'operations': [{'op': 'remove', 'id': 'missing'}],
+        }, format='json')
+        request.tenant = self.tenant
+        force_authenticate(request, user=self.user)
+        response = ComplianceItemView.as_view()(request, job_requisition_id='CHK-0001')
+        self.assertEqual(response.status_code, 400)
+
+
+class CloseExpiredRequisitionsTests(TenantTestCase):
+    """
+    Expired open/pending requisitions are closed by one UPDATE per schema.
+    """
+
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.name = 'Expiry Test'
+
+    @classmethod
+    def setUpTestData(cls):
+        today = timezone.now().date()
+        for index, (status, deadline, is_deleted) in enumerate([
+            ('open', today - timedelta(days=1), False),
+            ('pending', today - timedelta(days=3), False),
+            ('open', today, False),
+            ('rejected', today - timedelta(days=1), False),
+            ('open', today - timedelta(days=1), True),
+        ], start=1):
+            JobRequisition.objects.create(
+                id=f'EXP-{index:04d}', tenant=cls.tenant, title=f'Role {index}', unique_link=f'expiry-test-{index}',
+                status=status, deadline_date=deadline, is_deleted=is_deleted,
+            )
+
+    def test_closes_only_expired_active_requisitions(self):
+        with CaptureQueriesContext(connection) as context:
+            closed = close_expired_for_tenant(self.tenant, timezone.now().date())
+        self.assertEqual(sorted(closed), ['EXP-0001', 'EXP-0002'])
+        self.assertEqual(sum(query['sql'].lstrip().startswith('UPDATE') for query in context.captured_queries), 1)
+        statuses = dict(JobRequisition.objects.values_list('id', 'status'))
+        self.assertEqual(statuses['EXP-0003'], 'open')
+        self.assertEqual(statuses['EXP-0005'], 'open')
+
+
+class JobRequisitionStatsTests(TenantTestCase):
+    """
+    Pipeline stats follow application and schedule writes, including queryset updates.
+    """
+
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.name = 'Pipeline Test'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create(email='admin@pipeline-test.example.com', role='admin', tenant=cls.tenant)
+        cls.requisition = JobRequisition.objects.create(
+            id='PIP-0001', tenant=cls.tenant, title='Carer', unique_link='pipeline-test-1',
+        )
+        for index, (status, score) in enumerate([('new', None), ('shortlisted', 80.0), ('shortlisted', 60.0), ('rejected', 20.0)], start=1):
+            JobApplication.objects.create(
+                id=f'PIP-{index:05d}', tenant=cls.tenant, job_requisition=cls.requisition, full_name=f'Applicant {index}',
+                email=f'applicant{index}@example.com', phone='000', qualification='-', experience='-', status=status,
+                screening_status='processed' if score is not None else 'pending', screening_score=score,
+            )
+        Schedule.objects.create(
+            id='PIP-00001', tenant=cls.tenant, job_application_id='PIP-00002',
+            interview_start_date_time=timezone.now() + timedelta(days=1), meeting_mode='Virtual',
+        )
+
+    def stats(self):
+        return JobRequisitionStats.objects.get(job_requisition=self.requisition)
+
+    def test_counts_follow_writes(self):
+        stats = self.stats()
+        self.assertEqual(
+            (stats.total_applications, stats.new_count, stats.shortlisted_count, stats.rejected_count),
+            (4, 1, 2, 1),
+        )
+        self.assertEqual((stats.scheduled_count, stats.screened_count), (1, 3))
+        self.assertAlmostEqual(stats.average_screening_score, 160.0 / 3)
+
+        JobApplication.objects.filter(pk__in=['PIP-00002', 'PIP-00004']).update(is_deleted=True)
+        stats = self.stats()
+        self.assertEqual((stats.total_applications, stats.shortlisted_count, stats.scheduled_count), (2, 1, 0))
+        self.assertEqual(stats.average_screening_score, 60.0)
+
+    def test_reconcile_rebuilds_rows(self):
+        JobRequisitionStats.objects.all().delete()
+        self.assertEqual(JobRequisitionStats.refresh(), 1)
+        self.assertEqual(self.stats().total_applications, 4)
+
+    def test_deltas_match_recount(self):
+        other = JobRequisition.objects.create(id='PIP-0002', tenant=self.tenant, title='Nurse', unique_link='pipeline-test-2')
+        JobApplication.objects.filter(pk='PIP-00001').update(job_requisition=other, status='hired')
+        JobApplication.objects.filter(pk='PIP-00003').update(screening_score=90.0)
+        JobApplication.objects.filter(pk='PIP-00004').delete()
+        Schedule.objects.filter(pk='PIP-00001').update(status='completed')
+        Schedule.objects.bulk_create([
+            Schedule(
+                id=f'PIP-0001{index}', tenant=self.tenant, job_application_id='PIP-00003',
+                interview_start_date_time=timezone.now() + timedelta(days=index), meeting_mode='Virtual',
+                is_deleted=bool(index),
+            )
+            for index in range(2)
+        ])
+        JobApplication.objects.create(
+            id='PIP-00005', tenant=self.tenant, job_requisition=other, full_name='Applicant 5',
+            email='applicant5@example.com', phone='000', qualification='-', experience='-',
+        )
+
+        def rows():
+            return list(JobRequisitionStats.objects.order_by('pk').values(
+                'job_requisition_id', 'total_applications', 'new_count', 'shortlisted_count', 'rejected_count',
+                'hired_count', 'scheduled_count', 'screened_count', 'average_screening_score',
+            ))
+
+        maintained = rows()
+        self.assertEqual(JobRequisitionStats.refresh(), 2)
+        self.assertEqual(maintained, rows())
+        self.assertEqual(
+            [(row['total_applications'], row['scheduled_count'], row['average_screening_score']) for row in maintained],
+            [(2, 1, 85.0), (2, 0, None)],
+        )
+
+    def test_list_serializes_stats_without_extra_queries(self):
+        request = APIRequestFactory().get('/api/talent-engine/requisitions/', {'view': 'summary'})
+        request.tenant = self.tenant
+        force_authenticate(request, user=self.user)
+        with CaptureQueriesContext(connection) as context:
+            response = JobRequisitionListCreateView.as_view()(request)
+        self.assertEqual(response.status_code, 200)
+        [row] = response.data['results']
+        self.assertEqual(row['pipeline_stats']['shortlisted_count'], 2)
+        stats_queries = [query['sql'] for query in context.captured_queries if 'job_requisition_stats' in query['sql']]
+        self.assertEqual(len(stats_queries), 1)
+        self.assertIn('LEFT OUTER JOIN', stats_queries[0])
+
+    def test_detail_serializes_stats_without_extra_queries(self):
+        # Object permissions only let team managers (and branch recruiters) through.
+        manager = CustomUser.objects.create(email='manager@pipeline-test.example.com', role='team_manager', tenant=self.tenant)
+        request = APIRequestFactory().get('/api/talent-engine/requisitions/PIP-0001/')
+        request.tenant = self.tenant
+        force_authenticate(request, user=manager)
+        with CaptureQueriesContext(connection) as context:
+            response = JobRequisitionDetailView.as_view()(request, id='PIP-0001')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['pipeline_stats']['total_applications'], 4)
+        stats_queries = [query['sql'] for query in context.captured_queries if 'job_requisition_stats' in query['sql']]
+        self.assertEqual(len(stats_queries), 1)
+        self.assertIn('LEFT OUTER JOIN', stats_queries[0])
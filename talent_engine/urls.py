@@ -8,6 +8,7 @@ from .views import (
     RecoverSoftDeletedJobRequisitionsView,
     PermanentDeleteJobRequisitionsView,
     JobRequisitionByLinkView,
+    JobRequisitionTypeaheadView,
     ComplianceItemView,
     VideoSessionViewSet,
 )
@@ -23,6 +24,7 @@ router.register(r'video-sessions', VideoSessionViewSet, basename='video-session'
 urlpatterns = [
     path('', include(router.urls)),  # Include DRF router URLs for video-sessions
     path('requisitions/', JobRequisitionListCreateView.as_view(), name='requisition-list-create'),
+    path('requisitions/typeahead/', JobRequisitionTypeaheadView.as_view(), name='requisition-typeahead'),
     path('requisitions/<str:id>/', JobRequisitionDetailView.as_view(), name='requisition-detail'),
     path('requisitions/bulk/bulk-delete/', JobRequisitionBulkDeleteView.as_view(), name='requisition-bulk-delete'),
     path('requisitions/deleted/soft_deleted/', SoftDeletedJobRequisitionsView.as_view(), name='soft-deleted-requisitions'),
@@ -5,15 +5,23 @@ from django.db import connection, models, transaction
 from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
 from django_tenants.utils import tenant_context
+from auditlog.models import LogEntry
 from drf_spectacular.utils import extend_schema, OpenApiParameter, extend_schema_field
 from rest_framework import generics, serializers, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import APIException
 from rest_framework.filters import SearchFilter
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from core.models import Tenant, Branch
+from core.utils.bulk_ops import bulk_set_deleted, bulk_log_entries
+from core.utils.cache_keys import APPLICATION_FACETS, PUBLIC_JOB_FEED, bump_tenant_cache
+from lumina_care.eager_loading import EagerLoadingMixin
+from lumina_care.sparse_fields import SparseFieldsMixin
+from lumina_care.pagination import KeysetPagination
+from lumina_care.typeahead import TypeaheadView
 from job_application.permissions import BranchRestrictedPermission
 from lumina_care.supabase_client import supabase
 from users.models import CustomUser
@@ -24,7 +32,7 @@ from .models import (
     VideoSession,
     Participant,
 )
-from .serializers import JobRequisitionSerializer, ComplianceItemSerializer,VideoSessionSerializer, ParticipantSerializer
+from .serializers import JobRequisitionSerializer, ComplianceItemSerializer, ComplianceChecklistEditSerializer, VideoSessionSerializer, ParticipantSerializer
 
 logger = logging.getLogger('talent_engine')
 
@@ -47,23 +55,27 @@ class JobRequisitionBulkDeleteView(generics.GenericAPIView):
                 queryset = JobRequisition.active_objects.filter(tenant=tenant, id__in=ids)
                 if request.user.role == 'recruiter' and request.user.branch:
                     queryset = queryset.filter(branch=request.user.branch)
-                count = queryset.count()
-                if count == 0:
-                    logger.warning("No active requisitions found for provided IDs")
-                    return Response({"detail": "No requisitions found."}, status=status.HTTP_404_NOT_FOUND)
                 with transaction.atomic():
-                    for requisition in queryset:
-                        requisition.soft_delete()
+                    rows = bulk_set_deleted(queryset, ids, True)
+                    count = len(rows)
+                    if count == 0:
+                        logger.warning("No active requisitions found for provided IDs")
+                        return Response({"detail": "No requisitions found."}, status=status.HTTP_404_NOT_FOUND)
+                    bulk_log_entries(JobRequisition, [row['id'] for row in rows], LogEntry.Action.UPDATE,
+                                     changes={"is_deleted": ["False", "True"]}, request=request)
+                bump_tenant_cache(PUBLIC_JOB_FEED, tenant.schema_name)
+                logger.info(f"Soft-deleted {count} requisitions for tenant {tenant.schema_name}")
                 return Response({"detail": f"Soft-deleted {count} requisition(s)."}, status=status.HTTP_200_OK)
         except Exception as e:
             logger.error(f"Bulk soft delete failed: {str(e)}")
             return Response({"detail": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-class JobRequisitionListCreateView(generics.ListCreateAPIView):
+class JobRequisitionListCreateView(SparseFieldsMixin, EagerLoadingMixin, generics.ListCreateAPIView):
     serializer_class = JobRequisitionSerializer
     permission_classes = [IsAuthenticated, BranchRestrictedPermission]
     filter_backends = [DjangoFilterBackend, SearchFilter]
+    pagination_class = KeysetPagination
     filterset_fields = ['status', 'role', 'branch']
     search_fields = ['title', 'status', 'requested_by__email', 'role', 'interview_location']
 
@@ -126,7 +138,7 @@ class JobRequisitionListCreateView(generics.ListCreateAPIView):
     #     logger.info(f"Job requisition created: {serializer.validated_data['title']} for tenant {tenant.schema_name} by user {user.email}")
 
 
-class JobRequisitionDetailView(generics.RetrieveUpdateDestroyAPIView):
+class JobRequisitionDetailView(EagerLoadingMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = JobRequisitionSerializer
     permission_classes = [IsAuthenticated, BranchRestrictedPermission]
     lookup_field = 'id'
@@ -155,6 +167,23 @@ class JobRequisitionDetailView(generics.RetrieveUpdateDestroyAPIView):
             instance.soft_delete()
         logger.info(f"Job requisition soft-deleted: {instance.title} for tenant {tenant.schema_name}")
 
+class JobRequisitionTypeaheadView(TypeaheadView):
+    """
+    Top requisitions whose title or codes resemble `?q=`, for pickers and search boxes.
+    """
+    permission_classes = [IsAuthenticated, BranchRestrictedPermission]
+    typeahead_fields = ('title', 'job_requisition_code', 'job_application_code')
+    result_fields = ('id', 'title', 'job_requisition_code', 'job_application_code', 'status')
+
+    def get_queryset(self):
+        tenant = self.request.tenant
+        connection.set_schema(tenant.schema_name)
+        queryset = JobRequisition.active_objects.filter(tenant=tenant)
+        if self.request.user.branch:
+            queryset = queryset.filter(branch=self.request.user.branch)
+        return queryset
+
+
 class JobRequisitionByLinkView(generics.RetrieveAPIView):
     serializer_class = JobRequisitionSerializer
     lookup_field = 'unique_link'
@@ -196,9 +225,10 @@ class JobRequisitionByLinkView(generics.RetrieveAPIView):
             logger.error(f"Error retrieving job requisition: {str(e)}")
             return Response({"detail": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-class SoftDeletedJobRequisitionsView(generics.ListAPIView):
+class SoftDeletedJobRequisitionsView(SparseFieldsMixin, EagerLoadingMixin, generics.ListAPIView):
     serializer_class = JobRequisitionSerializer
     permission_classes = [IsAuthenticated, BranchRestrictedPermission]
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         tenant = self.request.tenant
@@ -214,13 +244,16 @@ class SoftDeletedJobRequisitionsView(generics.ListAPIView):
 
     def list(self, request, *args, **kwargs):
         try:
-            queryset = self.get_queryset()
-            serializer = self.get_serializer(queryset, many=True)
-            logger.info(f"Retrieved {queryset.count()} soft-deleted job requisitions for tenant {request.tenant.schema_name}")
+            page = self.paginate_queryset(self.filter_queryset(self.get_queryset()))
+            serializer = self.get_serializer(page, many=True)
+            logger.info(f"Retrieved {len(page)} soft-deleted job requisitions for tenant {request.tenant.schema_name}")
             return Response({
-                "detail": f"Retrieved {queryset.count()} soft-deleted requisition(s).",
+                "detail": f"Retrieved {len(page)} soft-deleted requisition(s).",
+                **self.paginator.get_pagination_data(),
                 "data": serializer.data
             }, status=status.HTTP_200_OK)
+        except APIException:
+            raise
         except Exception as e:
             logger.exception(f"Error listing soft-deleted job requisitions for tenant {request.tenant.schema_name}: {str(e)}")
             return Response({"detail": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -244,14 +277,15 @@ class RecoverSoftDeletedJobRequisitionsView(generics.GenericAPIView):
                 queryset = JobRequisition.objects.filter(id__in=ids, tenant=tenant, is_deleted=True)
                 if request.user.role == 'recruiter' and request.user.branch:
                     queryset = queryset.filter(branch=self.request.user.branch)
-                if not queryset.exists():
-                    logger.warning(f"No soft-deleted requisitions found for IDs {ids} in tenant {tenant.schema_name}")
-                    return Response({"detail": "No soft-deleted requisitions found."}, status=status.HTTP_404_NOT_FOUND)
-                recovered_count = 0
                 with transaction.atomic():
-                    for requisition in queryset:
-                        requisition.restore()
-                        recovered_count += 1
+                    rows = bulk_set_deleted(queryset, ids, False)
+                    recovered_count = len(rows)
+                    if recovered_count == 0:
+                        logger.warning(f"No soft-deleted requisitions found for IDs {ids} in tenant {tenant.schema_name}")
+                        return Response({"detail": "No soft-deleted requisitions found."}, status=status.HTTP_404_NOT_FOUND)
+                    bulk_log_entries(JobRequisition, [row['id'] for row in rows], LogEntry.Action.UPDATE,
+                                     changes={"is_deleted": ["True", "False"]}, request=request)
+                bump_tenant_cache(PUBLIC_JOB_FEED, tenant.schema_name)
                 logger.info(f"Successfully recovered {recovered_count} requisitions for tenant {tenant.schema_name}")
                 return Response({
                     "detail": f"Successfully recovered {recovered_count} requisition(s)."
@@ -283,6 +317,9 @@ class PermanentDeleteJobRequisitionsView(generics.GenericAPIView):
                     logger.warning(f"No soft-deleted requisitions found for IDs {ids} in tenant {tenant.schema_name}")
                     return Response({"detail": "No soft-deleted requisitions found."}, status=status.HTTP_404_NOT_FOUND)
                 deleted_count = queryset.delete()[0]
+                bump_tenant_cache(PUBLIC_JOB_FEED, tenant.schema_name)
+                # Applications of the deleted requisitions go with them.
+                bump_tenant_cache(APPLICATION_FACETS, tenant.schema_name)
                 logger.info(f"Successfully permanently deleted {deleted_count} requisitions for tenant {tenant.schema_name}")
                 return Response({
                     "detail": f"Successfully permanently deleted {deleted_count} requisition(s)."
@@ -329,6 +366,49 @@ class ComplianceItemView(APIView):
             logger.exception(f"Error adding compliance item to JobRequisition {job_requisition_id}: {str(e)}")
             return Response({"detail": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    def patch(self, request, job_requisition_id):
+        """
+        Apply a list of checklist operations in order and save the requisition once:
+        {"operations": [{"op": "add", "item": {...}}, {"op": "update", "id": ..., "item": {...}},
+        {"op": "remove", "id": ...}, {"op": "reorder", "ids": [...]}]}.
+        """
+        try:
+            tenant = request.tenant
+            with tenant_context(tenant):
+                try:
+                    job_requisition = JobRequisition.active_objects.get(id=job_requisition_id, tenant=tenant)
+                except JobRequisition.DoesNotExist:
+                    logger.error(f"JobRequisition {job_requisition_id} not found for tenant {tenant.schema_name}")
+                    return Response({"detail": "Job requisition not found."}, status=status.HTTP_404_NOT_FOUND)
+                if request.user.role == 'recruiter' and request.user.branch and job_requisition.branch != request.user.branch:
+                    logger.error(f"Unauthorized access to JobRequisition {job_requisition_id} by user {request.user.email}")
+                    return Response({"detail": "Not authorized to access this requisition."}, status=status.HTTP_403_FORBIDDEN)
+                serializer = ComplianceChecklistEditSerializer(data=request.data)
+                if not serializer.is_valid():
+                    logger.error(f"Invalid compliance checklist operations for tenant {tenant.schema_name}: {serializer.errors}")
+                    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+                editor = job_requisition.compliance_editor()
+                operations = serializer.validated_data['operations']
+                for operation in operations:
+                    if operation['op'] == 'add':
+                        editor.add(**operation['item'])
+                    elif operation['op'] == 'update':
+                        editor.update(operation['id'], **operation['item'])
+                    elif operation['op'] == 'remove':
+                        editor.remove(operation['id'])
+                    else:
+                        editor.reorder(operation['ids'])
+                editor.save()
+                logger.info(f"Applied {len(operations)} compliance checklist operations to JobRequisition {job_requisition_id} for tenant {tenant.schema_name}")
+                return Response([ComplianceItemSerializer(item).data for item in editor.items], status=status.HTTP_200_OK)
+        except ValueError as e:
+            logger.error(f"Compliance checklist edit failed for JobRequisition {job_requisition_id} for tenant {tenant.schema_name}: {str(e)}")
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            logger.exception(f"Error editing compliance checklist for JobRequisition {job_requisition_id}: {str(e)}")
+            return Response({"detail": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
     def put(self, request, job_requisition_id, item_id):
         try:
             tenant = request.tenant
@@ -1,3 +1,43 @@
-from django.test import TestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
 
-# Create your tests here.
+from core.models import Branch
+from core.utils.testing import TenantTestCase
+from .models import CustomUser
+from .views import BranchUsersListView, TenantUsersListView
+
+
+class UserListPaginationTests(TenantTestCase):
+    """
+    The keyset-paginated user lists reject a malformed cursor with a 404.
+    """
+
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.name = 'Users Test'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.branch = Branch.objects.create(tenant=cls.tenant, name='North')
+        cls.user = CustomUser.objects.create(
+            email='admin@users-test.example.com', role='admin', tenant=cls.tenant, branch=cls.branch,
+        )
+
+    def get(self, view, path, **kwargs):
+        request = APIRequestFactory().get(path)
+        request.tenant = self.tenant
+        force_authenticate(request, user=self.user)
+        return view.as_view()(request, **kwargs)
+
+    def test_tenant_users(self):
+        response = self.get(TenantUsersListView, '/api/user/tenant-users/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['email'] for row in response.data['data']], [self.user.email])
+        response = self.get(TenantUsersListView, '/api/user/tenant-users/?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, 404)
+
+    def test_branch_users(self):
+        path = f'/api/user/branch-users/{self.branch.id}/'
+        response = self.get(BranchUsersListView, path, branch_id=self.branch.id)
+        self.assertEqual(response.status_code, 200)
+        response = self.get(BranchUsersListView, f'{path}?cursor=not-a-cursor', branch_id=self.branch.id)
+        self.assertEqual(response.status_code, 404)
@@ -1,7 +1,8 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import (UserViewSet, PasswordResetRequestView, PasswordResetConfirmView,
-                     AdminUserCreateView, UserCreateView, UserBranchUpdateView, TenantUsersListView, BranchUsersListView)
+                     AdminUserCreateView, UserCreateView, UserBranchUpdateView, TenantUsersListView, BranchUsersListView,
+                     UserTypeaheadView)
 
 router = DefaultRouter()
 router.register(r'users', UserViewSet)
@@ -10,6 +11,7 @@ router.register(r'users', UserViewSet)
 
 
 urlpatterns = [
+    path('users/typeahead/', UserTypeaheadView.as_view(), name='user_typeahead'),
     path('', include(router.urls)),
     #path('social/callback/', SocialLoginCallbackView.as_view(), name='social_callback'),
     path('admin/create/', AdminUserCreateView.as_view(), name='admin_user_create'),
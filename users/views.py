@@ -4,6 +4,7 @@ from django.conf import settings
 from django.db import transaction
 from django_tenants.utils import tenant_context
 from rest_framework import viewsets, status, serializers, generics
+from rest_framework.exceptions import APIException, PermissionDenied
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
 from rest_framework.views import APIView
@@ -12,9 +13,13 @@ from .models import CustomUser
 from .serializers import (CustomUserSerializer, UserCreateSerializer,PasswordResetConfirmSerializer,
     AdminUserCreateSerializer, UserBranchUpdateSerializer, PasswordResetRequestSerializer)
 from core.models import Tenant, Branch, TenantConfig
+from core.utils.email_templates import CompiledTemplate, get_email_template
+from core.utils.outbox import enqueue_email
+from lumina_care.eager_loading import EagerLoadingMixin, apply_eager_loading
+from lumina_care.pagination import KeysetPagination
+from lumina_care.typeahead import TypeaheadView
 import uuid
 from datetime import timedelta
-from django.core.mail import EmailMessage
 from django.utils import timezone
 from rest_framework.permissions import AllowAny
 from .models import CustomUser, PasswordResetToken
@@ -23,23 +28,6 @@ logger = logging.getLogger('users')
 
 
 
-def configure_email_backend(tenant):
-    """
-    Configure email backend using tenant settings.
-    """
-    from django.core.mail.backends.smtp import EmailBackend
-    return EmailBackend(
-        host=tenant.email_host,
-        port=tenant.email_port,
-        username=tenant.email_host_user,
-        password=tenant.email_host_password,
-        use_ssl=tenant.email_use_ssl,
-        fail_silently=False
-    )
-
-
-
-
 class PasswordResetRequestView(generics.GenericAPIView):
     serializer_class = PasswordResetRequestSerializer
     permission_classes = [AllowAny]
@@ -103,19 +91,10 @@ class PasswordResetRequestView(generics.GenericAPIView):
                     # print("token")
                     # Get email template
                     try:
-                        config = TenantConfig.objects.get(tenant=tenant)
-                        email_template = config.email_templates.get('passwordReset', {})
-                        template_content = email_template.get('content', '')
-                        is_auto_sent = email_template.get('is_auto_sent', True)
-
-                        # print("template_content")
-                        # print(template_content)
-                        # print("template_content")
-
-
+                        email_template = get_email_template(tenant, 'passwordReset') or CompiledTemplate('')
                     except TenantConfig.DoesNotExist:
                         logger.warning(f"TenantConfig not found for tenant {tenant.schema_name}")
-                        template_content = (
+                        email_template = CompiledTemplate(
                             'Hello [User Name],\n\n'
                             'You have requested to reset your password for [Company]. '
                             'Please use the following link to reset your password:\n\n'
@@ -123,73 +102,36 @@ class PasswordResetRequestView(generics.GenericAPIView):
                             'This link will expire in 1 hour.\n\n'
                             'Best regards,\n[Your Name]'
                         )
-                        is_auto_sent = True
 
                     # Prepare email content
                     #reset_link = f"{settings.WEB_PAGE_URL}{reverse('password_reset_confirm')}?token={token}"
 
                     reset_link = f"{settings.WEB_PAGE_URL}{reverse('password_reset_confirm')}?token={token}&email={email}"
 
-                    placeholders = {
-                        '[User Name]': user.get_full_name() or user.username,
-                        '[Company]': tenant.name,
-                        '[Reset Link]': reset_link,
-                        '[Your Name]': tenant.name,
-                        '[your.email@proliance.com]': tenant.default_from_email,
-                    }
-
-                    # print(placeholders)
-
-                    email_body = template_content
-                    for placeholder, value in placeholders.items():
-                        email_body = email_body.replace(placeholder, str(value))
-
-                    # Send email
-                    if is_auto_sent or not is_auto_sent:
-                        try:
-                            email_connection = configure_email_backend(tenant)
-                            # print(tenant.email_host)
-                            # print(tenant.email_port)
-                            # print(tenant.email_use_ssl)
-                            # print(tenant.email_host_user)
-                            # print(tenant.email_host_password)
-                            # print(email_body)
-                            # logger.info(f"Email configuration for tenant {tenant.schema_name} user {email}: "
-                            #             f"host={tenant.email_host}, "
-                            #             f"port={tenant.email_port}, "
-                            #             f"use_ssl={tenant.email_use_ssl}, "
-                            #             f"host_user={tenant.email_host_user}, "
-                            #             f"host_password={'*' * len(tenant.email_host_password) if tenant.email_host_password else None}, "
-                            #             f"default_from_email={tenant.default_from_email}")
-
-                            email_subject = f"Password Reset Request for {email}"
-                            # print(f"Password reset email sent to {user.email} for tenant {tenant.schema_name}")
-                            # print(f"{token}")
-                            # print(email_connection)
-                            # print(email_body)
-                            # print(reset_link)
-                            email = EmailMessage(
-                                subject=email_subject,
-                                body=email_body,
-                                from_email=tenant.default_from_email,
-                                to=[user.email],
-                                connection=email_connection,
-                            )
-                            # email.content_subtype = 'html'
-                            email.send(fail_silently=False)
-                            #logger.info(f"Password reset email sent to {user.email} for tenant {tenant.schema_name}")
-                            # print(f"Password reset email sent to {user.email} for tenant {tenant.schema_name}")
-                        except Exception as email_error:
-                            logger.exception(f"Failed to send password reset email to {user.email}: {str(email_error)}")
-                            return Response({
-                                "detail": "Failed to send password reset email due to invalid email configuration.",
-                                "error": str(email_error),
-                                "suggestion": "Please check the email settings in the tenant configuration."
-                            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+                    email_body = email_template.render({
+                        'User Name': user.get_full_name() or user.username,
+                        'Company': tenant.name,
+                        'Reset Link': reset_link,
+                        'Your Name': tenant.name,
+                        'your.email@proliance.com': tenant.default_from_email,
+                    })
+
+                    # Queued with the token, so the email is sent only if the token is saved.
+                    reset_email = enqueue_email(
+                        tenant,
+                        subject=f"Password Reset Request for {email}",
+                        body=email_body,
+                        to=user.email,
+                        from_email=tenant.default_from_email,
+                        category='password_reset',
+                        reference=user.id,
+                    )
+                    logger.info(f"Password reset email {reset_email.id} queued for {user.email} in tenant {tenant.schema_name}")
 
             return Response({
-                "detail": "Password reset email sent successfully.",
-                "token": token
+                "detail": "Password reset email queued for delivery.",
+                "token": token,
+                "email_id": reset_email.id
             }, status=status.HTTP_200_OK)
 
         except Exception as e:
@@ -260,7 +202,7 @@ class PasswordResetConfirmView(generics.GenericAPIView):
 
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
     queryset = CustomUser.objects.all()
     serializer_class = CustomUserSerializer
     permission_classes = [IsAuthenticated]
@@ -481,6 +423,7 @@ class UserBranchUpdateView(APIView):
 # New view for listing all users in a tenant
 class TenantUsersListView(APIView):
     permission_classes = [IsAuthenticated]
+    keyset_ordering = ('-date_joined', '-id')
 
     def get_tenant_from_token(self, request):
         try:
@@ -531,17 +474,22 @@ class TenantUsersListView(APIView):
                 )
 
             try:
-                users = CustomUser.objects.filter(tenant=tenant)
-                serializer = CustomUserSerializer(users, many=True, context={'request': request})
-                logger.info(f"Retrieved {users.count()} users for tenant {tenant.schema_name}")
+                users = apply_eager_loading(CustomUser.objects.filter(tenant=tenant), CustomUserSerializer)
+                paginator = KeysetPagination()
+                page = paginator.paginate_queryset(users, request, view=self)
+                serializer = CustomUserSerializer(page, many=True, context={'request': request})
+                logger.info(f"Retrieved {len(page)} users for tenant {tenant.schema_name}")
                 return Response(
                     {
                         "status": "success",
-                        "message": f"Retrieved {users.count()} users for tenant {tenant.schema_name}",
+                        "message": f"Retrieved {len(page)} users for tenant {tenant.schema_name}",
+                        **paginator.get_pagination_data(),
                         "data": serializer.data
                     },
                     status=status.HTTP_200_OK
                 )
+            except APIException:
+                raise
             except Exception as e:
                 logger.error(f"Error listing users for tenant {tenant.schema_name}: {str(e)}")
                 return Response(
@@ -552,9 +500,32 @@ class TenantUsersListView(APIView):
 
 
 
+class UserTypeaheadView(TypeaheadView):
+    """
+    Top tenant users whose email or name resembles `?q=`. Admins and team managers
+    search the whole tenant, recruiters their own branch.
+    """
+    permission_classes = [IsAuthenticated]
+    typeahead_fields = ('email', 'first_name', 'last_name')
+    result_fields = ('id', 'email', 'first_name', 'last_name', 'role', 'branch_id')
+
+    def get_queryset(self):
+        user = self.request.user
+        queryset = CustomUser.objects.filter(tenant=user.tenant)
+        if user.is_superuser or user.role in ('admin', 'team_manager'):
+            return queryset
+        if user.role == 'recruiter' and user.branch:
+            return queryset.filter(branch=user.branch)
+        logger.warning(f"Unauthorized user typeahead attempt by user {user.email}")
+        raise PermissionDenied("Only admins, team managers or branch recruiters can search users")
+
+
+
+
 # New view for listing all users in a branch
 class BranchUsersListView(APIView):
     permission_classes = [IsAuthenticated]
+    keyset_ordering = ('-date_joined', '-id')
 
     def get_tenant_from_token(self, request):
         try:
@@ -617,17 +588,22 @@ class BranchUsersListView(APIView):
                 )
 
             try:
-                users = CustomUser.objects.filter(tenant=tenant, branch=branch)
-                serializer = CustomUserSerializer(users, many=True, context={'request': request})
-                logger.info(f"Retrieved {users.count()} users for branch {branch.name} in tenant {tenant.schema_name}")
+                users = apply_eager_loading(CustomUser.objects.filter(tenant=tenant, branch=branch), CustomUserSerializer)
+                paginator = KeysetPagination()
+                page = paginator.paginate_queryset(users, request, view=self)
+                serializer = CustomUserSerializer(page, many=True, context={'request': request})
+                logger.info(f"Retrieved {len(page)} users for branch {branch.name} in tenant {tenant.schema_name}")
                 return Response(
                     {
                         "status": "success",
-                        "message": f"Retrieved {users.count()} users for branch {branch.name}",
+                        "message": f"Retrieved {len(page)} users for branch {branch.name}",
+                        **paginator.get_pagination_data(),
                         "data": serializer.data
                     },
                     status=status.HTTP_200_OK
                 )
+            except APIException:
+                raise
             except Exception as e:
                 logger.error(f"Error listing users for branch {branch_id} in tenant {tenant.schema_name}: {str(e)}")
                 return Response(